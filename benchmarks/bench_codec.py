@@ -0,0 +1,65 @@
+"""Benchmark JSON codecs on a large select result.
+
+Compares the codecs available in iptvportal.transport.codec on a synthetic
+``media`` dump of the size returned by full-table selects, decoding from raw
+bytes exactly as HTTPTransport does.
+
+Usage:
+    python benchmarks/bench_codec.py [--rows 200000] [--repeat 5]
+"""
+import argparse
+import time
+
+from iptvportal.transport.codec import CODECS, StdlibCodec
+
+
+def make_response(rows: int) -> dict:
+    """Build a JSON-RPC select response with media-like rows."""
+    return {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "result": [
+            [i, f"Media title {i}", "movie", 1990 + i % 35, i * 1.5, True, None,
+             f"https://cdn.example.com/media/{i}/poster.jpg"]
+            for i in range(rows)
+        ],
+    }
+
+
+def best_of(repeat: int, func, *args) -> float:
+    """Return the fastest of repeat runs in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    response = make_response(args.rows)
+    payload = StdlibCodec().encode(response)
+    print(f"Response size: {len(payload) / 1_048_576:.1f} MiB, {args.rows} rows")
+
+    baseline = None
+    # Stdlib json first, so the other codecs can be compared against it
+    for name, factory in sorted(CODECS.items(), key=lambda item: item[0] != "json"):
+        try:
+            codec = factory()
+        except ImportError:
+            print(f"{name:>8}: not installed")
+            continue
+        decode = best_of(args.repeat, codec.decode, payload)
+        encode = best_of(args.repeat, codec.encode, response)
+        baseline = baseline or decode
+        speedup = f"  ({baseline / decode:.1f}x decode vs json)"
+        print(f"{name:>8}: decode {decode * 1000:8.1f} ms  encode {encode * 1000:8.1f} ms{speedup}")
+
+
+if __name__ == "__main__":
+    main()
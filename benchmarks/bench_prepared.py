@@ -0,0 +1,97 @@
+"""Benchmark prepared queries against building and encoding each request.
+
+Runs the same point lookup many times, once through client.query plus
+execute() and once through a prepared query, both against an in-process
+mock server so only client-side overhead is measured. The request body
+construction is also timed on its own.
+
+Usage:
+    python benchmarks/bench_prepared.py [--calls 20000] [--repeat 5]
+"""
+import argparse
+import time
+
+import httpx
+
+from iptvportal import IPTVPortalClient, IPTVPortalSettings, Q
+from iptvportal.query import Param
+from iptvportal.transport.codec import get_codec
+
+COLUMNS = ["id", "username", "password", "disabled", "balance", "created_at"]
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    """Answer every call with a fixed row."""
+    return httpx.Response(
+        200,
+        content=b'{"jsonrpc":"2.0","id":1,"result":{"sid":"sid-1","rows":[[1,"u","p",false,0,null]]}}',
+        headers={"content-type": "application/json"},
+    )
+
+
+def best_of(repeat: int, func) -> float:
+    """Return the fastest of repeat runs in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    settings = IPTVPortalSettings(domain="bench", username="bench", password="bench")
+    client = IPTVPortalClient(settings)
+    client.connect()
+    mock = httpx.Client(transport=httpx.MockTransport(handler))
+    client._transport.client = mock
+    client._auth.client = mock
+
+    codec = get_codec(settings.json_codec)
+    where = Q(id=Param("id")) & Q(disabled=False)
+    prepared = client.prepare(
+        client.query.select(data=COLUMNS, from_="subscriber", where=where, limit=1)
+    )
+
+    def plain_encode() -> None:
+        for i in range(args.calls):
+            codec.encode(client.query.select(
+                data=COLUMNS, from_="subscriber", where=Q(id=i) & Q(disabled=False), limit=1
+            ))
+
+    def prepared_encode() -> None:
+        for i in range(args.calls):
+            prepared.bind(id=i)
+
+    def plain_execute() -> None:
+        for i in range(args.calls):
+            client.execute(client.query.select(
+                data=COLUMNS, from_="subscriber", where=Q(id=i) & Q(disabled=False), limit=1
+            ))
+
+    def prepared_execute() -> None:
+        for i in range(args.calls):
+            client.execute_prepared(prepared, id=i)
+
+    print(f"codec={codec.name} calls={args.calls}")
+    for label, plain, fast in (
+        ("encode", plain_encode, prepared_encode),
+        ("execute", plain_execute, prepared_execute),
+    ):
+        baseline = best_of(args.repeat, plain)
+        timing = best_of(args.repeat, fast)
+        print(
+            f"{label:8} plain {baseline * 1e6 / args.calls:7.2f} us/call  "
+            f"prepared {timing * 1e6 / args.calls:7.2f} us/call  "
+            f"x{baseline / timing:.2f}"
+        )
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
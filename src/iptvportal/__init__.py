@@ -34,11 +34,17 @@ __license__ = "MIT"
 from .client import IPTVPortalClient
 from .asyncclient import AsyncIPTVPortalClient
 from .config import IPTVPortalSettings
+from .query import Q, QueryBuilder
+from .limiter import AdaptiveLimiter
+from .results import BatchResult, Outcome
+from .writebehind import WriteBehindBuffer
 from .exceptions import (
     IPTVPortalError,
     AuthenticationError,
     APIError,
+    CircuitOpenError,
     RetryExhaustedError,
+    SessionExpiredError,
     ValidationError,
 )
 
@@ -52,10 +58,22 @@ __all__ = [
     "AsyncIPTVPortalClient",
     # Configuration
     "IPTVPortalSettings",
+    # Query builder
+    "Q",
+    "QueryBuilder",
+    # Concurrency
+    "AdaptiveLimiter",
+    # Results
+    "BatchResult",
+    "Outcome",
+    # Buffering
+    "WriteBehindBuffer",
     # Exceptions
     "IPTVPortalError",
     "AuthenticationError",
     "APIError",
+    "CircuitOpenError",
     "RetryExhaustedError",
+    "SessionExpiredError",
     "ValidationError",
 ]
@@ -1,10 +1,60 @@
 """Asynchronous IPTVPortal API client."""
 import asyncio
-from typing import Any, Dict, List, Optional
+import time
+from contextlib import aclosing
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
 
 from .config import IPTVPortalSettings
 from .auth import AsyncAuthManager
+from .batching import iter_batches
+from .bulk import ChunkSizer, Row, insert_request, iter_chunks, returned_values
+from .cache import (
+    MISS,
+    READ_METHODS,
+    ResultCache,
+    canonical_query,
+    request_tables,
+    write_tables,
+)
+from .exceptions import APIError, SessionExpiredError, ValidationError
+from .limiter import AdaptiveLimiter
+from .pagination import (
+    and_where,
+    bounds_request,
+    key_bounds,
+    key_position,
+    keyset_request,
+    range_where,
+    row_key,
+    shard_ranges,
+)
+from .query import PreparedQuery, QueryFactory
+from .results import BatchResult, Outcome
+from .scheduler import bounded_map
+from .transport.codec import get_codec
+from .transport.endpoints import FAILOVER_ERRORS, Endpoint, is_read, never_sent
 from .transport.http import AsyncHTTPTransport
+from .transport.pool import PoolStats, prewarm_targets
+
+T = TypeVar("T")
 
 
 class AsyncIPTVPortalClient:
@@ -34,8 +84,14 @@ class AsyncIPTVPortalClient:
             settings: Configuration settings. If None, loads from environment.
         """
         self.settings = settings or IPTVPortalSettings()
+        self.query = QueryFactory()
+        self.cache = ResultCache.from_settings(
+            self.settings, get_codec(self.settings.json_codec).encode
+        )
         self._transport: Optional[AsyncHTTPTransport] = None
         self._auth: Optional[AsyncAuthManager] = None
+        self._auths: Dict[str, AsyncAuthManager] = {}
+        self._inflight: Dict[str, Tuple[FrozenSet[str], "asyncio.Future[Any]"]] = {}
     
     async def __aenter__(self):
         """Async context manager entry."""
@@ -50,11 +106,18 @@ class AsyncIPTVPortalClient:
         """Initialize transport and authentication.
         
         This is called automatically when using the context manager,
-        but can be called manually if not using async with statement.
+        but can be called manually if not using async with statement. With
+        ``settings.prewarm_connections`` set, pooled connections are opened
+        and the session is authorized before returning.
         """
         if self._transport is None:
             self._transport = AsyncHTTPTransport(self.settings)
             self._auth = AsyncAuthManager(self.settings, self._transport.client)
+            self._auths = {self.settings.domain: self._auth}
+            if self.settings.session_refresh:
+                self._auth.start_refresher()
+            if self.settings.prewarm_connections:
+                await self._prewarm()
     
     async def close(self):
         """Close transport connections.
@@ -63,13 +126,31 @@ class AsyncIPTVPortalClient:
         but can be called manually if not using async with statement.
         """
         if self._transport:
+            for auth in self._auths.values():
+                await auth.stop_refresher()
             await self._transport.close()
             self._transport = None
             self._auth = None
+            self._auths = {}
+    
+    def pool_stats(self) -> PoolStats:
+        """Return connection pool occupancy and wait times.
+        
+        Raises:
+            RuntimeError: If the client is not connected.
+        """
+        transport, _ = self._connection()
+        return transport.pool_stats()
     
     async def execute(self, request: Dict[str, Any]) -> Any:
         """Execute JSONRPC request asynchronously.
         
+        With ``settings.result_cache`` enabled, get and select results are
+        served from client.cache until they expire or this client writes to
+        one of the tables they read. With ``settings.coalesce_reads``
+        enabled, identical get and select requests issued while one is
+        already in flight share its HTTP call and result.
+        
         Args:
             request: JSONRPC request payload with jsonrpc, id, method, and params.
             
@@ -79,7 +160,8 @@ class AsyncIPTVPortalClient:
         Raises:
             RuntimeError: If client is not connected.
             AuthenticationError: If authentication fails.
-            APIError: If the API returns an error.
+            APIError: If the API returns an error. Requests rejected with an
+                expired session are re-authenticated and replayed once first.
             RetryExhaustedError: If all retry attempts fail.
             
         Example:
@@ -90,36 +172,661 @@ class AsyncIPTVPortalClient:
             ...     "params": {"from": "media", "limit": 10}
             ... })
         """
-        if not self._transport or not self._auth:
-            raise RuntimeError("Client not connected. Use context manager or call connect()")
+        cache = self.cache
+        key = cache.read_key(request) if cache is not None else None
+        if key is None:
+            try:
+                return await self._fetch(request)
+            finally:
+                self._invalidate_writes(request)
+        result = cache.get(key)
+        if result is MISS:
+            result = await self._fetch(request)
+            cache.put(key, result)
+        return result
+    
+    def prepare(self, request: Dict[str, Any]) -> PreparedQuery:
+        """Pre-serialize a request for repeated execution with different values.
+        
+        Mark the varying values with Param placeholders. The envelope and
+        constant parts of the query are encoded once; each execution only
+        encodes the bound values and a fresh request id.
+        
+        Args:
+            request: JSONRPC request payload containing Param placeholders.
+            
+        Returns:
+            Prepared query to pass to execute_prepared().
+            
+        Example:
+            >>> lookup = client.prepare(client.query.select(
+            ...     data=["id", "username"], from_="subscriber", where=Q(id=Param("id"))
+            ... ))
+            >>> for subscriber_id in ids:
+            ...     rows = await client.execute_prepared(lookup, id=subscriber_id)
+        """
+        return PreparedQuery(request, get_codec(self.settings.json_codec))
+    
+    async def execute_prepared(self, prepared: PreparedQuery, **params: Any) -> Any:
+        """Execute a prepared query with its parameters bound.
         
-        token = await self._auth.get_token()
-        return await self._transport.request(request, token)
+        Args:
+            prepared: Query returned by prepare().
+            **params: Values for every Param in the query.
+            
+        Returns:
+            API response result.
+            
+        Raises:
+            RuntimeError: If client is not connected.
+            ValidationError: If a parameter is missing or unknown.
+            AuthenticationError: If authentication fails.
+            APIError: If the API returns an error.
+            RetryExhaustedError: If all retry attempts fail.
+        """
+        try:
+            return await self._send(prepared.bind(**params), prepared.request)
+        finally:
+            self._invalidate_writes(prepared.request)
+    
+    @overload
+    async def execute_many(
+        self,
+        requests: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        concurrency: Union[int, AdaptiveLimiter, None] = None,
+        return_exceptions: Literal[False] = False,
+    ) -> List[Any]: ...
     
-    async def execute_many(self, requests: List[Dict[str, Any]]) -> List[Any]:
+    @overload
+    async def execute_many(
+        self,
+        requests: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        concurrency: Union[int, AdaptiveLimiter, None] = None,
+        *,
+        return_exceptions: Literal[True],
+    ) -> BatchResult: ...
+    
+    async def execute_many(
+        self,
+        requests: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        concurrency: Union[int, AdaptiveLimiter, None] = None,
+        return_exceptions: bool = False,
+    ) -> Union[List[Any], BatchResult]:
         """Execute multiple JSONRPC requests concurrently.
         
         This method enables batch operations with automatic concurrency
         management, significantly improving performance for multiple operations.
+        At most ``concurrency`` requests are in flight at any time and the
+        input is consumed lazily, so arbitrarily long (async) iterables can be
+        processed without creating a task per request up front.
         
         Args:
-            requests: List of JSONRPC request payloads.
+            requests: Iterable or async iterable of JSONRPC request payloads.
+            concurrency: Maximum in-flight requests, or an AdaptiveLimiter.
+                Defaults to settings.max_concurrency.
+            return_exceptions: Collect per-request failures instead of failing
+                fast on the first one.
             
         Returns:
-            List of API response results in the same order as requests.
+            List of API response results in the same order as requests, or a
+            BatchResult with per-request outcomes and summary counters when
+            return_exceptions is set.
             
         Raises:
             RuntimeError: If client is not connected.
             AuthenticationError: If authentication fails.
-            APIError: If any API request returns an error.
-            RetryExhaustedError: If any retry attempts fail.
+            APIError: If any API request returns an error and return_exceptions is not set.
+            RetryExhaustedError: If any retry attempts fail and return_exceptions is not set.
             
         Example:
             >>> requests = [
-            ...     {"jsonrpc": "2.0", "id": 1, "method": "get", "params": {"from": "media", "limit": 10}},
-            ...     {"jsonrpc": "2.0", "id": 2, "method": "get", "params": {"from": "subscriber", "limit": 10}}
+            ...     {"jsonrpc": "2.0", "id": 1, "method": "get",
+            ...      "params": {"from": "media", "limit": 10}},
+            ...     {"jsonrpc": "2.0", "id": 2, "method": "get",
+            ...      "params": {"from": "subscriber", "limit": 10}}
             ... ]
             >>> results = await client.execute_many(requests)
+            >>> batch = await client.execute_many(requests, return_exceptions=True)
+            >>> batch.succeeded, batch.failed
         """
-        tasks = [self.execute(req) for req in requests]
-        return await asyncio.gather(*tasks)
+        # Fail fast even with return_exceptions, which would collect the error per request
+        self._connection()
+        results: Dict[int, Any] = {}
+        async for index, result in bounded_map(
+            self.execute,
+            requests,
+            concurrency or self.settings.max_concurrency,
+            return_exceptions=return_exceptions,
+        ):
+            results[index] = result
+        
+        ordered = [results[index] for index in range(len(results))]
+        if not return_exceptions:
+            return ordered
+        return BatchResult([
+            Outcome(index, error=result)
+            if isinstance(result, Exception)
+            else Outcome(index, result)
+            for index, result in enumerate(ordered)
+        ])
+    
+    async def execute_stream(
+        self,
+        requests: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        concurrency: Union[int, AdaptiveLimiter, None] = None,
+    ) -> AsyncGenerator[Tuple[int, Any], None]:
+        """Execute JSONRPC requests concurrently, yielding results as they complete.
+        
+        Shares the bounded, lazily consumed scheduling of execute_many, but
+        hands each result to the caller as soon as it arrives instead of
+        waiting for the slowest request. A failing request does not stop the
+        stream: its exception is yielded in place of the result.
+        
+        Outstanding requests are cancelled when the generator is closed. Wrap
+        it in ``contextlib.aclosing`` to guarantee this happens immediately
+        when breaking out of the loop early.
+        
+        Args:
+            requests: Iterable or async iterable of JSONRPC request payloads.
+            concurrency: Maximum in-flight requests, or an AdaptiveLimiter.
+                Defaults to settings.max_concurrency.
+            
+        Yields:
+            Tuples of (request index, result or exception) in completion order.
+            
+        Raises:
+            RuntimeError: If client is not connected.
+            
+        Example:
+            >>> async with aclosing(client.execute_stream(requests)) as stream:
+            ...     async for index, result in stream:
+            ...         if isinstance(result, Exception):
+            ...             log_failure(index, result)
+            ...         else:
+            ...             write_rows(result)
+        """
+        self._connection()
+        async with aclosing(
+            bounded_map(
+                self.execute,
+                requests,
+                concurrency or self.settings.max_concurrency,
+                return_exceptions=True,
+            )
+        ) as stream:
+            async for item in stream:
+                yield item
+    
+    async def execute_batch(
+        self,
+        requests: Iterable[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        concurrency: Union[int, AdaptiveLimiter, None] = None,
+    ) -> List[Any]:
+        """Execute many JSONRPC requests packed into JSON-RPC 2.0 batch arrays.
+        
+        Unlike execute_many, which sends one HTTP request per call, requests
+        are grouped into batches bounded by ``batch_size`` and
+        ``settings.batch_max_bytes`` and several batches are sent
+        concurrently.
+        
+        Args:
+            requests: JSONRPC request payloads.
+            batch_size: Maximum requests per batch. Defaults to settings.batch_size.
+            concurrency: Maximum batches in flight, or an AdaptiveLimiter.
+                Defaults to settings.max_concurrency.
+            
+        Returns:
+            List of results in the same order as requests. Requests rejected
+            by the API are returned as APIError instances instead of raised.
+            
+        Raises:
+            RuntimeError: If client is not connected.
+            AuthenticationError: If authentication fails.
+            APIError: If the API rejects a whole batch.
+            RetryExhaustedError: If all retry attempts fail.
+            
+        Example:
+            >>> results = await client.execute_batch(
+            ...     {"jsonrpc": "2.0", "id": i, "method": "get",
+            ...      "params": {"from": "subscriber", "where": {"eq": ["id", i]}}}
+            ...     for i in range(1, 5001)
+            ... )
+        """
+        transport, _ = self._connection()
+        batches = iter_batches(
+            requests,
+            batch_size or self.settings.batch_size,
+            self.settings.batch_max_bytes,
+            transport.codec.encode,
+        )
+        chunks: Dict[int, List[Any]] = {}
+        async for index, chunk in bounded_map(
+            self._send_batch, batches, concurrency or self.settings.max_concurrency
+        ):
+            chunks[index] = chunk
+        return [result for index in range(len(chunks)) for result in chunks[index]]
+    
+    async def bulk_insert(
+        self,
+        table: str,
+        rows: Iterable[Row],
+        columns: Sequence[str] = (),
+        returning: Optional[str] = "id",
+        concurrency: Union[int, AdaptiveLimiter, None] = None,
+    ) -> List[Any]:
+        """Insert a large number of rows in concurrent multi-row chunks.
+        
+        Rows are pulled from the input lazily and packed into multi-row
+        insert requests, several of which run concurrently. The number of
+        rows per request starts at ``settings.bulk_chunk_size`` and adapts so
+        each request takes about ``settings.bulk_target_latency`` seconds and
+        stays under ``settings.batch_max_bytes``.
+        
+        Args:
+            table: Table to insert into.
+            rows: Rows as dicts or as sequences matching columns.
+            columns: Inserted columns. Defaults to the keys of the first row.
+            returning: Column returned for every inserted row, or None.
+            concurrency: Maximum chunks in flight, or an AdaptiveLimiter.
+                Defaults to settings.bulk_concurrency.
+            
+        Returns:
+            Returned column values in input order.
+            
+        Raises:
+            RuntimeError: If client is not connected.
+            ValidationError: If columns are missing for sequence rows, or a dict
+                row's keys differ from the columns.
+            ValueError: If concurrency is lower than 1.
+            APIError: If the API rejects a chunk. Chunks still in flight are
+                cancelled; chunks already committed stay inserted.
+            RetryExhaustedError: If all retry attempts fail.
+            
+        Example:
+            >>> ids = await client.bulk_insert(
+            ...     "subscriber", ({"username": u, "password": p} for u, p in accounts)
+            ... )
+        """
+        return await self._bulk(table, rows, columns, returning, concurrency)
+    
+    async def bulk_upsert(
+        self,
+        table: str,
+        rows: Iterable[Row],
+        conflict: Sequence[str],
+        columns: Sequence[str] = (),
+        update: Optional[Sequence[str]] = None,
+        returning: Optional[str] = "id",
+        concurrency: Union[int, AdaptiveLimiter, None] = None,
+    ) -> List[Any]:
+        """Insert or update a large number of rows in concurrent multi-row chunks.
+        
+        Works like bulk_insert(), with rows conflicting on the ``conflict``
+        columns updating the existing row instead.
+        
+        Args:
+            table: Table to upsert into.
+            rows: Rows as dicts or as sequences matching columns.
+            conflict: Columns of the unique constraint rows may conflict on.
+            columns: Inserted columns. Defaults to the keys of the first row.
+            update: Columns overwritten on conflict. Defaults to every
+                column outside the constraint.
+            returning: Column returned for every affected row, or None.
+            concurrency: Maximum chunks in flight, or an AdaptiveLimiter.
+                Defaults to settings.bulk_concurrency.
+            
+        Returns:
+            Returned column values in input order.
+            
+        Raises:
+            RuntimeError: If client is not connected.
+            ValidationError: If columns are missing for sequence rows, or a dict
+                row's keys differ from the columns.
+            ValueError: If concurrency is lower than 1.
+            APIError: If the API rejects a chunk.
+            RetryExhaustedError: If all retry attempts fail.
+        """
+        return await self._bulk(table, rows, columns, returning, concurrency, conflict, update)
+    
+    async def aiter_select(
+        self,
+        table: str,
+        data: List[str],
+        where: Optional[Dict[str, Any]] = None,
+        key: str = "id",
+        page_size: int = 1000,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Any]:
+        """Iterate over all rows matching a select, page by page.
+        
+        Pages are fetched by keyset (``where key > last_key order by key``)
+        rather than offset and rows are yielded lazily, holding at most two
+        pages in memory. With prefetch enabled, the next page is requested
+        as soon as the current one arrives, while its rows are consumed.
+        
+        Args:
+            table: Table to select from.
+            data: Columns to select. Must include key.
+            where: Additional JSONSQL where condition.
+            key: Unique, ordered column to paginate on.
+            page_size: Rows per request.
+            prefetch: Fetch the next page while the current one is consumed.
+            
+        Yields:
+            Rows as returned by the API.
+            
+        Raises:
+            RuntimeError: If client is not connected.
+            ValidationError: If key is not among the selected columns.
+            APIError: If the API returns an error.
+            RetryExhaustedError: If all retry attempts fail.
+            
+        Example:
+            >>> async for row in client.aiter_select("terminal", ["id", "mac_addr"]):
+            ...     print(row)
+        """
+        self._connection()
+        position = key_position(data, key)
+        
+        async def fetch(after: Any) -> List[Any]:
+            return await self.execute(keyset_request(table, data, key, page_size, where, after))
+        
+        pending: Optional["asyncio.Task[List[Any]]"] = asyncio.ensure_future(fetch(None))
+        try:
+            while pending is not None:
+                page = await pending
+                pending = None
+                more = len(page) == page_size
+                if more and prefetch:
+                    pending = asyncio.ensure_future(fetch(row_key(page[-1], key, position)))
+                for row in page:
+                    yield row
+                if more and not prefetch:
+                    pending = asyncio.ensure_future(fetch(row_key(page[-1], key, position)))
+        finally:
+            if pending is not None:
+                pending.cancel()
+    
+    async def scan(
+        self,
+        table: str,
+        data: List[str],
+        where: Optional[Dict[str, Any]] = None,
+        key: str = "id",
+        shards: Optional[int] = None,
+        page_size: int = 1000,
+        ordered: bool = False,
+    ) -> AsyncIterator[Any]:
+        """Scan a table by splitting its key range into shards read concurrently.
+        
+        A cheap ``min(key)``/``max(key)`` query sizes the key space, which is
+        then split into ``shards`` contiguous ranges, each paginated by
+        keyset in its own task. Rows from all shards are merged into one
+        stream. Each shard keeps one request in flight, so the scan never
+        exceeds the shard count, itself capped by settings.max_concurrency.
+        Per-shard buffers are bounded by page_size, so a slow consumer pauses
+        the shards instead of accumulating rows.
+        
+        Args:
+            table: Table to scan.
+            data: Columns to select. Must include key.
+            where: Additional JSONSQL where condition.
+            key: Integer, unique, ordered column to shard and paginate on.
+            shards: Number of key ranges to scan concurrently.
+                Defaults to settings.max_concurrency.
+            page_size: Rows per request.
+            ordered: Yield rows in key order. Shards are still read
+                concurrently, but later shards pause once their buffer is full.
+            
+        Yields:
+            Rows as returned by the API.
+            
+        Raises:
+            RuntimeError: If client is not connected.
+            ValidationError: If key is not selected or is not an integer column.
+            APIError: If the API returns an error or unusable key bounds.
+            RetryExhaustedError: If all retry attempts fail.
+            
+        Example:
+            >>> async for row in client.scan("terminal", ["id", "mac_addr"], shards=16):
+            ...     export(row)
+        """
+        self._connection()
+        key_position(data, key)
+        
+        low, high = key_bounds(await self.execute(bounds_request(table, key, where)))
+        if low is None or high is None:
+            return
+        if not isinstance(low, int) or not isinstance(high, int):
+            raise ValidationError(f"Sharded scans require an integer key, got {low!r}..{high!r}")
+        if low > high:
+            raise APIError(f"Key bounds out of order: min {low!r} > max {high!r}")
+        
+        limit = min(shards or self.settings.max_concurrency, self.settings.max_concurrency)
+        ranges = shard_ranges(low, high, limit)
+        queues: List["asyncio.Queue[Any]"] = (
+            [asyncio.Queue(maxsize=page_size) for _ in ranges]
+            if ordered
+            else [asyncio.Queue(maxsize=page_size)] * len(ranges)
+        )
+        done = object()
+        
+        async def read_shard(start: int, stop: int, queue: "asyncio.Queue[Any]") -> None:
+            try:
+                async for item in self.aiter_select(
+                    table,
+                    data,
+                    and_where(where, range_where(key, start, stop)),
+                    key=key,
+                    page_size=page_size,
+                    prefetch=False,
+                ):
+                    await queue.put(item)
+            except Exception as e:
+                # Decoded rows are never exceptions, so failures share the queue
+                await queue.put(e)
+            else:
+                await queue.put(done)
+        
+        tasks = [
+            asyncio.ensure_future(read_shard(start, stop, queue))
+            for (start, stop), queue in zip(ranges, queues)
+        ]
+        try:
+            # In ordered mode each queue belongs to one shard and is drained in
+            # key order; otherwise all shards share a single queue
+            remaining = len(tasks)
+            for queue in queues[: len(queues) if ordered else 1]:
+                while remaining:
+                    item = await queue.get()
+                    if isinstance(item, Exception):
+                        raise item
+                    if item is done:
+                        remaining -= 1
+                        if ordered:
+                            break
+                        continue
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _prewarm(self) -> None:
+        """Open pooled connections while authorizing, ignoring failures.
+        
+        See prewarm_targets() for how many connections each endpoint gets.
+        """
+        transport, auth = self._connection()
+        targets = prewarm_targets(self.settings, transport.endpoints)
+        # A failed authorize is raised again by the first request
+        await asyncio.gather(
+            auth.get_token(),
+            *(transport.warm(endpoint) for endpoint in targets),
+            return_exceptions=True,
+        )
+    
+    async def _send(
+        self, payload: Union[Dict[str, Any], bytes], source: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Send a request, re-authenticating and replaying once if the session was rejected.
+        
+        Args:
+            payload: Request, or a body already encoded with the transport codec.
+            source: Request an encoded payload was built from, for rate limiting.
+        """
+        transport, _ = self._connection()
+        
+        async def send(endpoint: Endpoint, auth: AsyncAuthManager) -> Any:
+            token = await auth.get_token()
+            try:
+                return await transport.request(payload, token, endpoint, source)
+            except SessionExpiredError:
+                # The server dropped the session before its local TTL: renew once and replay
+                auth.invalidate(token)
+                return await transport.request(payload, await auth.get_token(), endpoint, source)
+        
+        return await self._failover(send, is_read(payload if source is None else source))
+    
+    async def _failover(
+        self, send: Callable[[Endpoint, AsyncAuthManager], Awaitable[T]], read: bool
+    ) -> T:
+        """Call send on an endpoint, moving on to healthy ones while it fails.
+        
+        Reads are balanced over all endpoints and writes go to the primary. A
+        write only fails over when it never reached the server, so it is not
+        applied twice. Each endpoint has its own session, so send gets the
+        endpoint's auth manager.
+        """
+        transport, _ = self._connection()
+        tried: List[Endpoint] = []
+        endpoint = transport.endpoints.select() if read else transport.endpoints.primary
+        while True:
+            try:
+                return await send(endpoint, self._session(endpoint))
+            except FAILOVER_ERRORS as e:
+                if not read and not never_sent(e):
+                    raise
+                tried.append(endpoint)
+                fallback = transport.endpoints.failover(tried)
+                if fallback is None:
+                    raise
+                endpoint = fallback
+    
+    def _session(self, endpoint: Endpoint) -> AsyncAuthManager:
+        """Return the auth manager holding the session of an endpoint."""
+        auth = self._auths.get(endpoint.domain)
+        if auth is None:
+            transport, _ = self._connection()
+            auth = AsyncAuthManager(self.settings, transport.client, endpoint.domain)
+            self._auths[endpoint.domain] = auth
+            if self.settings.session_refresh:
+                auth.start_refresher()
+        return auth
+    
+    def _connection(self) -> Tuple[AsyncHTTPTransport, AsyncAuthManager]:
+        """Return transport and auth manager, failing if the client is not connected."""
+        if not self._transport or not self._auth:
+            raise RuntimeError("Client not connected. Use context manager or call connect()")
+        return self._transport, self._auth
+    
+    async def _fetch(self, request: Dict[str, Any]) -> Any:
+        """Send a request, sharing one call between identical reads in flight."""
+        if not self.settings.coalesce_reads or request.get("method") not in READ_METHODS:
+            return await self._send(request)
+        params = request.get("params")
+        key = canonical_query(request["method"], params)
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            tables = request_tables(params.get("from") if isinstance(params, dict) else None)
+            future = asyncio.ensure_future(self._send(request))
+            self._inflight[key] = (tables, future)
+            future.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            future = inflight[1]
+        # Shield the shared call so one cancelled caller does not fail the others
+        return await asyncio.shield(future)
+    
+    def _forget(self, key: str, future: "asyncio.Future[Any]") -> None:
+        """Drop a finished shared read from the in-flight table."""
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[1] is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # Mark the error retrieved when every caller was cancelled before it arrived
+            future.exception()
+    
+    async def _bulk(
+        self,
+        table: str,
+        rows: Iterable[Row],
+        columns: Sequence[str],
+        returning: Optional[str],
+        concurrency: Union[int, AdaptiveLimiter, None],
+        conflict: Sequence[str] = (),
+        update: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        """Run chunked inserts with at most concurrency chunks in flight."""
+        transport, _ = self._connection()
+        sizer = ChunkSizer.from_settings(self.settings)
+        
+        async def send(item: Tuple[List[str], List[Row]]) -> List[Any]:
+            names, chunk = item
+            request = insert_request(table, names, chunk, returning, conflict, update)
+            body = transport.codec.encode(request)
+            started = time.perf_counter()
+            try:
+                result = await self._send(body, request)
+            finally:
+                self._invalidate_writes(request)
+            sizer.observe(len(chunk), time.perf_counter() - started, len(body))
+            return returned_values(result)
+        
+        parts: Dict[int, List[Any]] = {}
+        async for index, part in bounded_map(
+            send, iter_chunks(rows, sizer, columns), concurrency or self.settings.bulk_concurrency
+        ):
+            parts[index] = part
+        return [value for index in range(len(parts)) for value in parts[index]]
+    
+    def _invalidate_writes(self, *requests: Dict[str, Any]) -> None:
+        """Drop cached and in-flight reads of the tables written by requests."""
+        tables = frozenset().union(*map(write_tables, requests))
+        if not tables:
+            return
+        if self.cache is not None:
+            self.cache.invalidate(tables)
+        # Reads issued after the write must not join a call that started before it
+        for key, (read_tables, _) in list(self._inflight.items()):
+            if read_tables & tables:
+                del self._inflight[key]
+    
+    async def _send_batch(self, batch: List[Dict[str, Any]]) -> List[Any]:
+        """Send one batch array, replaying items rejected with an expired session once."""
+        transport, _ = self._connection()
+        
+        async def send(endpoint: Endpoint, auth: AsyncAuthManager) -> List[Any]:
+            token = await auth.get_token()
+            try:
+                results = await transport.request_batch(batch, token, endpoint)
+            except SessionExpiredError:
+                auth.invalidate(token)
+                return await transport.request_batch(batch, await auth.get_token(), endpoint)
+            
+            expired = [
+                i for i, result in enumerate(results) if isinstance(result, SessionExpiredError)
+            ]
+            if expired:
+                auth.invalidate(token)
+                replayed = await transport.request_batch(
+                    [batch[i] for i in expired], await auth.get_token(), endpoint
+                )
+                for i, result in zip(expired, replayed):
+                    results[i] = result
+            return results
+        
+        try:
+            return await self._failover(send, is_read(batch))
+        finally:
+            self._invalidate_writes(*batch)
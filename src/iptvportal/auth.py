@@ -1,5 +1,6 @@
 """Authentication managers with session caching."""
 import asyncio
+import threading
 import time
 from typing import Optional
 
@@ -7,25 +8,53 @@ import httpx
 
 from .config import IPTVPortalSettings
 from .exceptions import AuthenticationError
+from .session_cache import SessionCache
+from .transport.pool import http_timeout
+
+# Seconds to wait before retrying a failed background refresh
+REFRESH_RETRY_DELAY = 5.0
+
+# Seconds between attempts to take the session cache lock from async code
+LOCK_POLL_INTERVAL = 0.05
+
+
+def _refresh_delay(settings: IPTVPortalSettings, expires: Optional[float], ttl: int) -> float:
+    """Seconds until the session reaches the configured refresh point of its TTL."""
+    if expires is None:
+        return 0.0
+    refresh_at = expires - ttl * (1 - settings.session_refresh_fraction)
+    return max(0.0, refresh_at - time.time())
 
 
 class AuthManager:
     """Synchronous authentication manager with session caching.
     
     Manages session tokens with TTL-based expiration to avoid
-    unnecessary re-authentication requests.
+    unnecessary re-authentication requests. Safe to share between threads:
+    when the session expires, only one thread re-authenticates while the
+    others wait for its token. With ``settings.session_cache`` enabled the
+    session is also shared with other processes through a SessionCache.
     
     Args:
         settings: Client configuration settings.
         client: HTTP client for making auth requests.
+        domain: Portal domain to authenticate against. Defaults to
+            ``settings.domain``; each endpoint has its own session.
     """
     
-    def __init__(self, settings: IPTVPortalSettings, client: httpx.Client):
+    def __init__(
+        self, settings: IPTVPortalSettings, client: httpx.Client, domain: Optional[str] = None
+    ):
         self.settings = settings
         self.client = client
+        self.domain = domain or settings.domain
         self._session_token: Optional[str] = None
         self._session_expires: Optional[float] = None
         self._ttl: int = 3600  # 1 hour default TTL
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self._refresher_stop = threading.Event()
+        self._cache = SessionCache.from_settings(settings, self.domain)
     
     def get_token(self) -> str:
         """Get valid session token, refreshing if needed.
@@ -36,13 +65,88 @@ class AuthManager:
         Raises:
             AuthenticationError: If authentication fails.
         """
+        token = self._cached_token()
+        if token:
+            return token
+        
+        with self._lock:
+            # Another thread may have refreshed the session while we waited
+            token = self._cached_token()
+            if token:
+                return token
+            return self._authenticate()
+    
+    def refresh(self) -> str:
+        """Re-authenticate now, even if the cached session is still valid.
+        
+        Callers holding the current token keep using it until the new one
+        is cached, so a refresh never blocks requests.
+        
+        Returns:
+            New session token.
+            
+        Raises:
+            AuthenticationError: If authentication fails.
+        """
+        with self._lock:
+            return self._authenticate()
+    
+    def start_refresher(self) -> None:
+        """Start a daemon thread renewing the session before it expires.
+        
+        The session is renewed once ``settings.session_refresh_fraction`` of
+        its TTL has elapsed, so requests never pay for authorize on the hot path.
+        """
+        if self._refresher and self._refresher.is_alive():
+            return
+        self._refresher_stop.clear()
+        self._refresher = threading.Thread(
+            target=self._refresh_loop, name="iptvportal-session-refresh", daemon=True
+        )
+        self._refresher.start()
+    
+    def stop_refresher(self) -> None:
+        """Stop the background refresh thread if it is running."""
+        self._refresher_stop.set()
+        if self._refresher:
+            self._refresher.join(timeout=self.settings.timeout)
+            self._refresher = None
+    
+    def _refresh_loop(self) -> None:
+        """Renew the session at the refresh point until stopped."""
+        delay = _refresh_delay(self.settings, self._session_expires, self._ttl)
+        while not self._refresher_stop.wait(delay):
+            try:
+                self.refresh()
+                delay = _refresh_delay(self.settings, self._session_expires, self._ttl)
+            except Exception:
+                # Keep the thread alive through outages; requests still re-auth on demand
+                delay = REFRESH_RETRY_DELAY
+    
+    def _cached_token(self) -> Optional[str]:
+        """Return the cached session token if it has not expired."""
         if self._session_token and self._session_expires:
             if time.time() < self._session_expires:
                 return self._session_token
-        
-        return self._authenticate()
+        return None
     
     def _authenticate(self) -> str:
+        """Authenticate, sharing the session with other processes if enabled."""
+        if self._cache is None:
+            return self._authorize()
+        
+        with self._cache.lock():
+            # Another process may have authorized while we waited for the lock
+            cached = self._cache.load()
+            if cached and cached[1] > (self._session_expires or 0):
+                self._session_token, self._session_expires = cached
+                return self._session_token
+            
+            token = self._authorize()
+            self._cache.store(token, self._session_expires or 0)
+            return token
+    
+    def _authorize(self) -> str:
         """Authenticate and cache session token."""
         payload = {
             "jsonrpc": "2.0",
@@ -56,9 +160,9 @@ class AuthManager:
         
         try:
             response = self.client.post(
-                f"https://{self.settings.domain}/api",
+                f"https://{self.domain}/api",
                 json=payload,
-                timeout=self.settings.timeout,
+                timeout=http_timeout(self.settings),
             )
             response.raise_for_status()
             data = response.json()
@@ -73,29 +177,48 @@ class AuthManager:
         except httpx.HTTPError as e:
             raise AuthenticationError(f"Authentication request failed: {e}")
     
-    def invalidate(self):
-        """Invalidate cached session."""
-        self._session_token = None
-        self._session_expires = None
+    def invalidate(self, token: Optional[str] = None):
+        """Invalidate cached session.
+        
+        Args:
+            token: Only invalidate if this is still the cached token, so a
+                session another thread already renewed is kept.
+        """
+        with self._lock:
+            if token is None or token == self._session_token:
+                self._session_token = None
+                self._session_expires = None
+            if self._cache:
+                self._cache.clear(token)
 
 
 class AsyncAuthManager:
     """Asynchronous authentication manager with session caching.
     
     Manages session tokens with TTL-based expiration to avoid
-    unnecessary re-authentication requests.
+    unnecessary re-authentication requests. Concurrent callers that find
+    the session expired share a single in-flight authorize request, and with
+    ``settings.session_cache`` enabled the session is shared across processes.
     
     Args:
         settings: Client configuration settings.
         client: Async HTTP client for making auth requests.
+        domain: Portal domain to authenticate against. Defaults to
+            ``settings.domain``; each endpoint has its own session.
     """
     
-    def __init__(self, settings: IPTVPortalSettings, client: httpx.AsyncClient):
+    def __init__(
+        self, settings: IPTVPortalSettings, client: httpx.AsyncClient, domain: Optional[str] = None
+    ):
         self.settings = settings
         self.client = client
+        self.domain = domain or settings.domain
         self._session_token: Optional[str] = None
         self._session_expires: Optional[float] = None
         self._ttl: int = 3600
+        self._refresh: Optional["asyncio.Task[str]"] = None
+        self._refresher: Optional["asyncio.Task[None]"] = None
+        self._cache = SessionCache.from_settings(settings, self.domain)
     
     async def get_token(self) -> str:
         """Get valid session token, refreshing if needed.
@@ -110,9 +233,81 @@ class AsyncAuthManager:
             if time.time() < self._session_expires:
                 return self._session_token
         
-        return await self._authenticate()
+        return await self.refresh()
+    
+    async def refresh(self) -> str:
+        """Re-authenticate now, even if the cached session is still valid.
+        
+        Concurrent callers share a single in-flight authorize request.
+        
+        Returns:
+            New session token.
+            
+        Raises:
+            AuthenticationError: If authentication fails.
+        """
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.ensure_future(self._authenticate())
+        # Shield the shared refresh so one cancelled caller does not fail the others
+        return await asyncio.shield(self._refresh)
+    
+    def start_refresher(self) -> None:
+        """Start a task renewing the session before it expires.
+        
+        The session is renewed once ``settings.session_refresh_fraction`` of
+        its TTL has elapsed, so requests never pay for authorize on the hot path.
+        Must be called from within a running event loop.
+        """
+        if self._refresher and not self._refresher.done():
+            return
+        self._refresher = asyncio.create_task(self._refresh_loop())
+    
+    async def stop_refresher(self) -> None:
+        """Cancel the background refresh task if it is running."""
+        if self._refresher:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+    
+    async def _refresh_loop(self) -> None:
+        """Renew the session at the refresh point until cancelled."""
+        while True:
+            await asyncio.sleep(_refresh_delay(self.settings, self._session_expires, self._ttl))
+            try:
+                await self.refresh()
+            except Exception:
+                # Keep the task alive through outages; requests still re-auth on demand
+                await asyncio.sleep(REFRESH_RETRY_DELAY)
     
     async def _authenticate(self) -> str:
+        """Authenticate, sharing the session with other processes if enabled."""
+        if self._cache is None:
+            return await self._authorize()
+        
+        # Poll the lock instead of blocking the event loop, proceeding
+        # unlocked if another process holds it for longer than a request could
+        handle = self._cache.acquire(blocking=False)
+        deadline = time.monotonic() + self.settings.timeout
+        while handle is None and time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            handle = self._cache.acquire(blocking=False)
+        try:
+            cached = self._cache.load()
+            if cached and cached[1] > (self._session_expires or 0):
+                self._session_token, self._session_expires = cached
+                return self._session_token
+            
+            token = await self._authorize()
+            self._cache.store(token, self._session_expires or 0)
+            return token
+        finally:
+            if handle is not None:
+                self._cache.release(handle)
+    
+    async def _authorize(self) -> str:
         """Authenticate and cache session token."""
         payload = {
             "jsonrpc": "2.0",
@@ -126,9 +321,9 @@ class AsyncAuthManager:
         
         try:
             response = await self.client.post(
-                f"https://{self.settings.domain}/api",
+                f"https://{self.domain}/api",
                 json=payload,
-                timeout=self.settings.timeout,
+                timeout=http_timeout(self.settings),
             )
             response.raise_for_status()
             data = response.json()
@@ -143,7 +338,15 @@ class AsyncAuthManager:
         except httpx.HTTPError as e:
             raise AuthenticationError(f"Authentication request failed: {e}")
     
-    def invalidate(self):
-        """Invalidate cached session."""
-        self._session_token = None
-        self._session_expires = None
+    def invalidate(self, token: Optional[str] = None):
+        """Invalidate cached session.
+        
+        Args:
+            token: Only invalidate if this is still the cached token, so a
+                session another task already renewed is kept.
+        """
+        if token is None or token == self._session_token:
+            self._session_token = None
+            self._session_expires = None
+        if self._cache:
+            self._cache.clear(token)
@@ -0,0 +1,38 @@
+"""Helpers for packing JSONRPC requests into JSON-RPC 2.0 batch arrays."""
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+
+def iter_batches(
+    requests: Iterable[Dict[str, Any]],
+    max_items: int,
+    max_bytes: int,
+    encode: Callable[[Any], bytes] = lambda obj: json.dumps(obj, separators=(",", ":")).encode(),
+) -> Iterator[List[Dict[str, Any]]]:
+    """Group requests into batches bounded by item count and encoded size.
+    
+    A single request larger than max_bytes still forms a batch of its own,
+    so no request is ever dropped.
+    
+    Args:
+        requests: JSONRPC request payloads.
+        max_items: Maximum number of requests per batch.
+        max_bytes: Approximate upper bound for the encoded batch body.
+        encode: Encoder used to measure requests, normally the transport codec.
+        
+    Yields:
+        Lists of requests, preserving input order.
+    """
+    batch: List[Dict[str, Any]] = []
+    size = 0
+    for request in requests:
+        request_size = len(encode(request)) + 1
+        if batch and (len(batch) >= max_items or size + request_size > max_bytes):
+            yield batch
+            batch = []
+            size = 0
+        batch.append(request)
+        size += request_size
+    
+    if batch:
+        yield batch
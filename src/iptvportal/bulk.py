@@ -0,0 +1,129 @@
+"""Chunking helpers for bulk inserts and upserts."""
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .config import IPTVPortalSettings
+from .exceptions import ValidationError
+from .query import InsertQuery
+from .query.builder import check_row_keys
+
+Row = Union[Sequence[Any], Dict[str, Any]]
+
+
+class ChunkSizer:
+    """Adapts the number of rows per insert to observed latency and payload size.
+    
+    After every chunk the size is recomputed so that the next one is
+    expected to take ``target_latency`` seconds and stay under
+    ``max_bytes``. Shrinking takes effect immediately, growth is limited
+    to doubling per chunk so one fast response does not overshoot.
+    Thread-safe, so chunks running concurrently can report back.
+    
+    Args:
+        initial: Rows in the first chunk.
+        target_latency: Desired duration of one insert request in seconds.
+        max_bytes: Upper bound for the encoded size of one request.
+        minimum: Smallest chunk size.
+        maximum: Largest chunk size.
+    """
+    
+    def __init__(
+        self,
+        initial: int,
+        target_latency: float,
+        max_bytes: int,
+        minimum: int = 1,
+        maximum: int = 10_000,
+    ):
+        self.target_latency = target_latency
+        self.max_bytes = max_bytes
+        self.minimum = minimum
+        self.maximum = maximum
+        self._size = max(minimum, min(initial, maximum))
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_settings(cls, settings: IPTVPortalSettings) -> "ChunkSizer":
+        """Build a sizer from the bulk settings."""
+        return cls(
+            settings.bulk_chunk_size,
+            settings.bulk_target_latency,
+            settings.batch_max_bytes,
+            maximum=settings.bulk_max_chunk_size,
+        )
+    
+    @property
+    def size(self) -> int:
+        """Rows to put in the next chunk."""
+        return self._size
+    
+    def observe(self, rows: int, seconds: float, size: int) -> None:
+        """Record the latency and encoded size of a chunk of rows."""
+        limit = float(self.maximum)
+        if seconds > 0:
+            limit = min(limit, rows * self.target_latency / seconds)
+        if size > 0:
+            limit = min(limit, rows * self.max_bytes / size)
+        with self._lock:
+            self._size = int(max(self.minimum, min(limit, self._size * 2)))
+
+
+def iter_chunks(
+    rows: Iterable[Row],
+    sizer: ChunkSizer,
+    columns: Sequence[str] = (),
+) -> Iterator[Tuple[List[str], List[Row]]]:
+    """Lazily group rows into chunks sized by sizer at the time each is cut.
+    
+    Args:
+        rows: Rows as dicts or as sequences matching columns.
+        sizer: Chunk sizer consulted before each chunk.
+        columns: Inserted columns. Defaults to the keys of the first row.
+        
+    Yields:
+        (columns, rows) pairs, preserving input order.
+        
+    Raises:
+        ValidationError: If columns are missing for sequence rows, or a dict
+            row's keys differ from the columns. Raised when the row is
+            reached, before its chunk is sent.
+    """
+    chunk: List[Row] = []
+    names = list(columns)
+    for row in rows:
+        if not names:
+            if not isinstance(row, dict):
+                raise ValidationError("bulk insert of sequence rows requires columns")
+            names = list(row)
+        if isinstance(row, dict):
+            check_row_keys(row, names)
+        chunk.append(row)
+        if len(chunk) >= sizer.size:
+            yield names, chunk
+            chunk = []
+    if chunk:
+        yield names, chunk
+
+
+def insert_request(
+    table: str,
+    columns: Sequence[str],
+    rows: Sequence[Row],
+    returning: Optional[str] = None,
+    conflict: Sequence[str] = (),
+    update: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    """Build a multi-row insert request, an upsert when conflict columns are given."""
+    query = InsertQuery(table, columns).values(*rows)
+    if conflict:
+        query.on_conflict(*conflict, update=update)
+    if returning:
+        query.returning(returning)
+    return query.to_request()
+
+
+def returned_values(result: Any) -> List[Any]:
+    """Flatten the rows returned by an insert to one value per row."""
+    if not isinstance(result, list):
+        return []
+    return [row[0] if isinstance(row, (list, tuple)) and len(row) == 1 else row for row in result]
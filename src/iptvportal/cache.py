@@ -0,0 +1,204 @@
+"""In-memory TTL and LRU cache for read-only query results."""
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, NamedTuple, Optional, Tuple
+
+from .config import IPTVPortalSettings
+
+READ_METHODS = frozenset({"get", "select"})
+
+# Parameter naming the target table of each write method
+WRITE_TABLE_PARAMS = {"insert": "into", "update": "table", "delete": "from"}
+
+MISS = object()
+
+
+@dataclass
+class CacheStats:
+    """Result cache counters."""
+    
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    size: int = 0
+    
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CacheKey(NamedTuple):
+    """Canonical query text with the tables it reads and their generations."""
+    
+    query: str
+    tables: FrozenSet[str]
+    generations: Tuple[int, ...]
+
+
+def request_tables(value: Any) -> FrozenSet[str]:
+    """Collect table names from a JSONSQL ``from`` clause, including joins."""
+    if isinstance(value, str):
+        return frozenset((value,))
+    if isinstance(value, dict):
+        names = [value.get("table"), value.get("join")]
+        return frozenset(name for name in names if isinstance(name, str))
+    if isinstance(value, (list, tuple)):
+        return frozenset().union(*(request_tables(item) for item in value))
+    return frozenset()
+
+
+def write_tables(request: Dict[str, Any]) -> FrozenSet[str]:
+    """Return the tables modified by a write request, empty for anything else."""
+    param = WRITE_TABLE_PARAMS.get(request.get("method"))  # type: ignore[arg-type]
+    params = request.get("params")
+    if param is None or not isinstance(params, dict):
+        return frozenset()
+    return request_tables(params.get(param))
+
+
+def canonical_query(method: str, params: Any) -> str:
+    """Serialize a query so that equivalent requests share one key.
+    
+    The request id is left out and dict keys are sorted, so requests built
+    in different orders or by different callers hit the same entry.
+    """
+    return json.dumps([method, params], sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ResultCache:
+    """Thread-safe result cache with per-table TTLs and a byte budget.
+    
+    Only ``get`` and ``select`` requests are cached. Entries expire after
+    the TTL of the shortest-lived table they read, and the least recently
+    used entries are evicted once the encoded size of all results exceeds
+    the budget. Inserts, updates and deletes sent through the same client
+    drop every entry reading the written table; a read that was in flight
+    while the table was written is not stored.
+    
+    Cached results are shared between callers and must not be mutated.
+    
+    Args:
+        max_bytes: Budget for the encoded size of all cached results.
+        ttl: Default time to live in seconds.
+        table_ttls: Per-table TTL overrides. A TTL of 0 disables caching.
+        sizeof: Returns the size of a result in bytes.
+    """
+    
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl: float,
+        table_ttls: Optional[Dict[str, float]] = None,
+        sizeof: Callable[[Any], int] = lambda result: len(canonical_query("", result)),
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.table_ttls = dict(table_ttls or {})
+        self._sizeof = sizeof
+        self._entries: "OrderedDict[str, Tuple[Any, float, int, FrozenSet[str]]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_settings(
+        cls, settings: IPTVPortalSettings, encode: Callable[[Any], bytes]
+    ) -> Optional["ResultCache"]:
+        """Build the cache configured in settings, or None if it is disabled."""
+        if not settings.result_cache:
+            return None
+        return cls(
+            settings.result_cache_max_bytes,
+            settings.result_cache_ttl,
+            settings.result_cache_ttls,
+            lambda result: len(encode(result)),
+        )
+    
+    def read_key(self, request: Dict[str, Any]) -> Optional[CacheKey]:
+        """Return the cache key of a cacheable read, or None for anything else."""
+        method = request.get("method")
+        params = request.get("params")
+        if method not in READ_METHODS or not isinstance(params, dict):
+            return None
+        tables = request_tables(params.get("from"))
+        if not tables or self._ttl(tables) <= 0:
+            return None
+        with self._lock:
+            generations = tuple(self._generations.get(table, 0) for table in sorted(tables))
+        return CacheKey(canonical_query(method, params), tables, generations)
+    
+    def get(self, key: CacheKey) -> Any:
+        """Return the cached result, or MISS if absent or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key.query)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key.query)
+                self._stats.hits += 1
+                return entry[0]
+            if entry is not None:
+                self._remove(key.query)
+            self._stats.misses += 1
+            return MISS
+    
+    def put(self, key: CacheKey, result: Any) -> None:
+        """Store a result fetched for key, unless its tables were written meanwhile."""
+        size = self._sizeof(result)
+        if size > self.max_bytes:
+            return
+        expires = time.monotonic() + self._ttl(key.tables)
+        with self._lock:
+            current = tuple(self._generations.get(table, 0) for table in sorted(key.tables))
+            if current != key.generations:
+                return
+            if key.query in self._entries:
+                self._remove(key.query)
+            self._entries[key.query] = (result, expires, size, key.tables)
+            self._stats.size += size
+            while self._stats.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+    
+    def invalidate(self, tables: FrozenSet[str]) -> None:
+        """Drop every entry reading any of tables."""
+        if not tables:
+            return
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [query for query, entry in self._entries.items() if entry[3] & tables]
+            for query in stale:
+                self._remove(query)
+            self._stats.invalidations += len(stale)
+    
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._stats.size = 0
+    
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                invalidations=self._stats.invalidations,
+                entries=len(self._entries),
+                size=self._stats.size,
+            )
+    
+    def _ttl(self, tables: FrozenSet[str]) -> float:
+        return min(self.table_ttls.get(table, self.ttl) for table in tables)
+    
+    def _remove(self, query: str) -> None:
+        _, _, size, _ = self._entries.pop(query)
+        self._stats.size -= size
@@ -185,7 +185,9 @@ class CLIAuthManager:
 
                 # Test session validity with simple query
                 try:
-                    client.query.select(data=["id"], from_="subscriber", limit=1)
+                    client.execute(
+                        client.query.select(data=["id"], from_="subscriber", limit=1)
+                    )
                     console.print(
                         "[green]✓[/green] Session is valid, reusing token"
                     )
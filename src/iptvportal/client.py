@@ -1,9 +1,37 @@
 """Synchronous IPTVPortal API client."""
-from typing import Any, Dict, Optional
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from .config import IPTVPortalSettings
 from .auth import AuthManager
+from .batching import iter_batches
+from .bulk import ChunkSizer, Row, insert_request, iter_chunks, returned_values
+from .cache import MISS, ResultCache, write_tables
+from .exceptions import SessionExpiredError
+from .limiter import AdaptiveLimiter
+from .pagination import key_position, keyset_request, row_key
+from .query import PreparedQuery, QueryFactory
+from .transport.codec import get_codec
+from .transport.endpoints import FAILOVER_ERRORS, Endpoint, is_read, never_sent
 from .transport.http import HTTPTransport
+from .transport.pool import PoolStats, prewarm_targets
+
+T = TypeVar("T")
 
 
 class IPTVPortalClient:
@@ -32,8 +60,13 @@ class IPTVPortalClient:
             settings: Configuration settings. If None, loads from environment.
         """
         self.settings = settings or IPTVPortalSettings()
+        self.query = QueryFactory()
+        self.cache = ResultCache.from_settings(
+            self.settings, get_codec(self.settings.json_codec).encode
+        )
         self._transport: Optional[HTTPTransport] = None
         self._auth: Optional[AuthManager] = None
+        self._auths: Dict[str, AuthManager] = {}
     
     def __enter__(self):
         """Context manager entry."""
@@ -48,11 +81,18 @@ class IPTVPortalClient:
         """Initialize transport and authentication.
         
         This is called automatically when using the context manager,
-        but can be called manually if not using with statement.
+        but can be called manually if not using with statement. With
+        ``settings.prewarm_connections`` set, pooled connections are opened
+        and the session is authorized before returning.
         """
         if self._transport is None:
             self._transport = HTTPTransport(self.settings)
             self._auth = AuthManager(self.settings, self._transport.client)
+            self._auths = {self.settings.domain: self._auth}
+            if self.settings.session_refresh:
+                self._auth.start_refresher()
+            if self.settings.prewarm_connections:
+                self._prewarm()
     
     def close(self):
         """Close transport connections.
@@ -61,13 +101,29 @@ class IPTVPortalClient:
         but can be called manually if not using with statement.
         """
         if self._transport:
+            for auth in self._auths.values():
+                auth.stop_refresher()
             self._transport.close()
             self._transport = None
             self._auth = None
+            self._auths = {}
+    
+    def pool_stats(self) -> PoolStats:
+        """Return connection pool occupancy and wait times.
+        
+        Raises:
+            RuntimeError: If the client is not connected.
+        """
+        transport, _ = self._connection()
+        return transport.pool_stats()
     
     def execute(self, request: Dict[str, Any]) -> Any:
         """Execute JSONRPC request.
         
+        With ``settings.result_cache`` enabled, get and select results are
+        served from client.cache until they expire or this client writes to
+        one of the tables they read.
+        
         Args:
             request: JSONRPC request payload with jsonrpc, id, method, and params.
             
@@ -77,7 +133,8 @@ class IPTVPortalClient:
         Raises:
             RuntimeError: If client is not connected.
             AuthenticationError: If authentication fails.
-            APIError: If the API returns an error.
+            APIError: If the API returns an error. Requests rejected with an
+                expired session are re-authenticated and replayed once first.
             RetryExhaustedError: If all retry attempts fail.
             
         Example:
@@ -88,8 +145,460 @@ class IPTVPortalClient:
             ...     "params": {"from": "media", "limit": 10}
             ... })
         """
+        cache = self.cache
+        if cache is None:
+            return self._send(request)
+        key = cache.read_key(request)
+        if key is None:
+            try:
+                return self._send(request)
+            finally:
+                self._invalidate_writes(request)
+        result = cache.get(key)
+        if result is MISS:
+            result = self._send(request)
+            cache.put(key, result)
+        return result
+    
+    def prepare(self, request: Dict[str, Any]) -> PreparedQuery:
+        """Pre-serialize a request for repeated execution with different values.
+        
+        Mark the varying values with Param placeholders. The envelope and
+        constant parts of the query are encoded once; each execution only
+        encodes the bound values and a fresh request id.
+        
+        Args:
+            request: JSONRPC request payload containing Param placeholders.
+            
+        Returns:
+            Prepared query to pass to execute_prepared().
+            
+        Example:
+            >>> lookup = client.prepare(client.query.select(
+            ...     data=["id", "username"], from_="subscriber", where=Q(id=Param("id"))
+            ... ))
+            >>> for subscriber_id in ids:
+            ...     rows = client.execute_prepared(lookup, id=subscriber_id)
+        """
+        return PreparedQuery(request, get_codec(self.settings.json_codec))
+    
+    def execute_prepared(self, prepared: PreparedQuery, **params: Any) -> Any:
+        """Execute a prepared query with its parameters bound.
+        
+        Args:
+            prepared: Query returned by prepare().
+            **params: Values for every Param in the query.
+            
+        Returns:
+            API response result.
+            
+        Raises:
+            RuntimeError: If client is not connected.
+            ValidationError: If a parameter is missing or unknown.
+            AuthenticationError: If authentication fails.
+            APIError: If the API returns an error.
+            RetryExhaustedError: If all retry attempts fail.
+        """
+        try:
+            return self._send(prepared.bind(**params), prepared.request)
+        finally:
+            self._invalidate_writes(prepared.request)
+    
+    def execute_batch(
+        self,
+        requests: Iterable[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        concurrency: Union[int, AdaptiveLimiter, None] = None,
+    ) -> List[Any]:
+        """Execute many JSONRPC requests packed into JSON-RPC 2.0 batch arrays.
+        
+        Requests are grouped into batches bounded by ``batch_size`` and
+        ``settings.batch_max_bytes``, so thousands of calls cost only a
+        handful of HTTP round trips.
+        
+        Args:
+            requests: JSONRPC request payloads.
+            batch_size: Maximum requests per batch. Defaults to settings.batch_size.
+            concurrency: Maximum batches in flight, or an AdaptiveLimiter.
+                Defaults to sending one batch at a time.
+            
+        Returns:
+            List of results in the same order as requests. Requests rejected
+            by the API are returned as APIError instances instead of raised.
+            
+        Raises:
+            RuntimeError: If client is not connected.
+            AuthenticationError: If authentication fails.
+            APIError: If the API rejects a whole batch.
+            RetryExhaustedError: If all retry attempts fail.
+            
+        Example:
+            >>> results = client.execute_batch(
+            ...     {"jsonrpc": "2.0", "id": i, "method": "get",
+            ...      "params": {"from": "subscriber", "where": {"eq": ["id", i]}}}
+            ...     for i in range(1, 5001)
+            ... )
+        """
+        transport, _ = self._connection()
+        batches = iter_batches(
+            requests,
+            batch_size or self.settings.batch_size,
+            self.settings.batch_max_bytes,
+            transport.codec.encode,
+        )
+        results: List[Any] = []
+        for batch_results in self._ordered_map(
+            self._send_batch, batches, concurrency or 1, "batch"
+        ):
+            results.extend(batch_results)
+        return results
+    
+    def bulk_insert(
+        self,
+        table: str,
+        rows: Iterable[Row],
+        columns: Sequence[str] = (),
+        returning: Optional[str] = "id",
+        concurrency: Union[int, AdaptiveLimiter, None] = None,
+    ) -> List[Any]:
+        """Insert a large number of rows in concurrent multi-row chunks.
+        
+        Rows are pulled from the input lazily and packed into multi-row
+        insert requests, several of which run concurrently. The number of
+        rows per request starts at ``settings.bulk_chunk_size`` and adapts so
+        each request takes about ``settings.bulk_target_latency`` seconds and
+        stays under ``settings.batch_max_bytes``.
+        
+        Args:
+            table: Table to insert into.
+            rows: Rows as dicts or as sequences matching columns.
+            columns: Inserted columns. Defaults to the keys of the first row.
+            returning: Column returned for every inserted row, or None.
+            concurrency: Maximum chunks in flight, or an AdaptiveLimiter.
+                Defaults to settings.bulk_concurrency.
+            
+        Returns:
+            Returned column values in input order.
+            
+        Raises:
+            RuntimeError: If client is not connected.
+            ValidationError: If columns are missing for sequence rows, or a dict
+                row's keys differ from the columns.
+            ValueError: If concurrency is lower than 1.
+            APIError: If the API rejects a chunk. Chunks still in flight are
+                cancelled; chunks already committed stay inserted.
+            RetryExhaustedError: If all retry attempts fail.
+            
+        Example:
+            >>> ids = client.bulk_insert(
+            ...     "subscriber", ({"username": u, "password": p} for u, p in accounts)
+            ... )
+        """
+        return self._bulk(table, rows, columns, returning, concurrency)
+    
+    def bulk_upsert(
+        self,
+        table: str,
+        rows: Iterable[Row],
+        conflict: Sequence[str],
+        columns: Sequence[str] = (),
+        update: Optional[Sequence[str]] = None,
+        returning: Optional[str] = "id",
+        concurrency: Union[int, AdaptiveLimiter, None] = None,
+    ) -> List[Any]:
+        """Insert or update a large number of rows in concurrent multi-row chunks.
+        
+        Works like bulk_insert(), with rows conflicting on the ``conflict``
+        columns updating the existing row instead.
+        
+        Args:
+            table: Table to upsert into.
+            rows: Rows as dicts or as sequences matching columns.
+            conflict: Columns of the unique constraint rows may conflict on.
+            columns: Inserted columns. Defaults to the keys of the first row.
+            update: Columns overwritten on conflict. Defaults to every
+                column outside the constraint.
+            returning: Column returned for every affected row, or None.
+            concurrency: Maximum chunks in flight, or an AdaptiveLimiter.
+                Defaults to settings.bulk_concurrency.
+            
+        Returns:
+            Returned column values in input order.
+            
+        Raises:
+            RuntimeError: If client is not connected.
+            ValidationError: If columns are missing for sequence rows, or a dict
+                row's keys differ from the columns.
+            ValueError: If concurrency is lower than 1.
+            APIError: If the API rejects a chunk.
+            RetryExhaustedError: If all retry attempts fail.
+        """
+        return self._bulk(table, rows, columns, returning, concurrency, conflict, update)
+    
+    def iter_select(
+        self,
+        table: str,
+        data: List[str],
+        where: Optional[Dict[str, Any]] = None,
+        key: str = "id",
+        page_size: int = 1000,
+        prefetch: bool = True,
+    ) -> Iterator[Any]:
+        """Iterate over all rows matching a select, page by page.
+        
+        Pages are fetched by keyset (``where key > last_key order by key``)
+        rather than offset, so late pages cost the server as little as the
+        first. Rows are yielded lazily and at most two pages are held in
+        memory, which keeps full-table scans at constant memory. With
+        prefetch enabled, the next page is requested in a background thread
+        while the current one is being consumed.
+        
+        Args:
+            table: Table to select from.
+            data: Columns to select. Must include key.
+            where: Additional JSONSQL where condition.
+            key: Unique, ordered column to paginate on.
+            page_size: Rows per request.
+            prefetch: Fetch the next page while the current one is consumed.
+            
+        Yields:
+            Rows as returned by the API.
+            
+        Raises:
+            RuntimeError: If client is not connected.
+            ValidationError: If key is not among the selected columns.
+            APIError: If the API returns an error.
+            RetryExhaustedError: If all retry attempts fail.
+            
+        Example:
+            >>> for row in client.iter_select("subscriber", ["id", "username"]):
+            ...     print(row)
+        """
+        self._connection()
+        position = key_position(data, key)
+        
+        def fetch(after: Any) -> List[Any]:
+            return self.execute(keyset_request(table, data, key, page_size, where, after))
+        
+        if not prefetch:
+            after = None
+            while True:
+                page = fetch(after)
+                yield from page
+                if len(page) < page_size:
+                    return
+                after = row_key(page[-1], key, position)
+        
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="iptvportal-prefetch")
+        try:
+            pending: Optional[Future[List[Any]]] = pool.submit(fetch, None)
+            while pending is not None:
+                page = pending.result()
+                pending = None
+                if len(page) == page_size:
+                    pending = pool.submit(fetch, row_key(page[-1], key, position))
+                yield from page
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _prewarm(self) -> None:
+        """Open pooled connections while authorizing, ignoring failures.
+        
+        See prewarm_targets() for how many connections each endpoint gets.
+        """
+        transport, auth = self._connection()
+        targets = prewarm_targets(self.settings, transport.endpoints)
+        with ThreadPoolExecutor(
+            max_workers=len(targets) + 1, thread_name_prefix="iptvportal-prewarm"
+        ) as pool:
+            # A failed authorize is raised again by the first request
+            pool.submit(auth.get_token)
+            for endpoint in targets:
+                pool.submit(transport.warm, endpoint)
+    
+    def _send(
+        self, payload: Union[Dict[str, Any], bytes], source: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Send a request, re-authenticating and replaying once if the session was rejected.
+        
+        Args:
+            payload: Request, or a body already encoded with the transport codec.
+            source: Request an encoded payload was built from, for rate limiting.
+        """
+        transport, _ = self._connection()
+        
+        def send(endpoint: Endpoint, auth: AuthManager) -> Any:
+            token = auth.get_token()
+            try:
+                return transport.request(payload, token, endpoint, source)
+            except SessionExpiredError:
+                # The server dropped the session before its local TTL: renew once and replay
+                auth.invalidate(token)
+                return transport.request(payload, auth.get_token(), endpoint, source)
+        
+        return self._failover(send, is_read(payload if source is None else source))
+    
+    def _failover(self, send: Callable[[Endpoint, AuthManager], T], read: bool) -> T:
+        """Call send on an endpoint, moving on to healthy ones while it fails.
+        
+        Reads are balanced over all endpoints and writes go to the primary. A
+        write only fails over when it never reached the server, so it is not
+        applied twice. Each endpoint has its own session, so send gets the
+        endpoint's auth manager.
+        """
+        transport, _ = self._connection()
+        tried: List[Endpoint] = []
+        endpoint = transport.endpoints.select() if read else transport.endpoints.primary
+        while True:
+            try:
+                return send(endpoint, self._session(endpoint))
+            except FAILOVER_ERRORS as e:
+                if not read and not never_sent(e):
+                    raise
+                tried.append(endpoint)
+                fallback = transport.endpoints.failover(tried)
+                if fallback is None:
+                    raise
+                endpoint = fallback
+    
+    def _session(self, endpoint: Endpoint) -> AuthManager:
+        """Return the auth manager holding the session of an endpoint."""
+        auth = self._auths.get(endpoint.domain)
+        if auth is None:
+            transport, _ = self._connection()
+            auth = self._auths.setdefault(
+                endpoint.domain, AuthManager(self.settings, transport.client, endpoint.domain)
+            )
+            if self.settings.session_refresh:
+                auth.start_refresher()
+        return auth
+    
+    def _connection(self) -> Tuple[HTTPTransport, AuthManager]:
+        """Return transport and auth manager, failing if the client is not connected."""
         if not self._transport or not self._auth:
             raise RuntimeError("Client not connected. Use context manager or call connect()")
+        return self._transport, self._auth
+    
+    def _bulk(
+        self,
+        table: str,
+        rows: Iterable[Row],
+        columns: Sequence[str],
+        returning: Optional[str],
+        concurrency: Union[int, AdaptiveLimiter, None],
+        conflict: Sequence[str] = (),
+        update: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
+        """Run chunked inserts with at most concurrency chunks in flight."""
+        transport, _ = self._connection()
+        sizer = ChunkSizer.from_settings(self.settings)
+        concurrency = concurrency or self.settings.bulk_concurrency
+        
+        def send(chunk: Tuple[List[str], List[Row]]) -> List[Any]:
+            names, chunk_rows = chunk
+            request = insert_request(table, names, chunk_rows, returning, conflict, update)
+            body = transport.codec.encode(request)
+            started = time.monotonic()
+            try:
+                result = self._send(body, request)
+            finally:
+                self._invalidate_writes(request)
+            sizer.observe(len(chunk_rows), time.monotonic() - started, len(body))
+            return returned_values(result)
+        
+        values: List[Any] = []
+        for returned in self._ordered_map(
+            send, iter_chunks(rows, sizer, columns), concurrency, "bulk"
+        ):
+            values.extend(returned)
+        return values
+    
+    def _ordered_map(
+        self,
+        func: Callable[[Any], T],
+        items: Iterable[Any],
+        concurrency: Union[int, AdaptiveLimiter],
+        name: str,
+    ) -> Iterator[T]:
+        """Yield func(item) for every item in input order, calling it on a thread pool.
+        
+        At most concurrency calls run at once. With an AdaptiveLimiter a
+        permit is taken before every call is submitted and released with
+        its outcome when the call returns. Calls still queued when the
+        caller stops iterating or a call fails are cancelled.
+        
+        Raises:
+            ValueError: If concurrency is lower than 1.
+        """
+        limiter: Optional[AdaptiveLimiter] = None
+        if isinstance(concurrency, AdaptiveLimiter):
+            limiter, workers = concurrency, concurrency.maximum
+        else:
+            workers = concurrency
+        if workers < 1:
+            raise ValueError("Concurrency limit must be at least 1")
+        
+        def run(item: Any) -> T:
+            started = time.monotonic()
+            error: Optional[BaseException] = None
+            try:
+                return func(item)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                if limiter is not None:
+                    limiter.release(started, error)
+        
+        pending: Deque[Future[T]] = deque()
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"iptvportal-{name}")
+        try:
+            for item in items:
+                # Collect the oldest calls first, so results come back in input order
+                while len(pending) >= workers:
+                    yield pending.popleft().result()
+                if limiter is not None:
+                    limiter.acquire()
+                pending.append(pool.submit(run, item))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            pool.shutdown(cancel_futures=True)
+            if limiter is not None:
+                for future in pending:
+                    if future.cancelled():
+                        limiter.release()
+    
+    def _invalidate_writes(self, *requests: Dict[str, Any]) -> None:
+        """Drop cached results reading the tables written by requests."""
+        if self.cache is not None:
+            self.cache.invalidate(frozenset().union(*map(write_tables, requests)))
+    
+    def _send_batch(self, batch: List[Dict[str, Any]]) -> List[Any]:
+        """Send one batch array, replaying items rejected with an expired session once."""
+        transport, _ = self._connection()
+        
+        def send(endpoint: Endpoint, auth: AuthManager) -> List[Any]:
+            token = auth.get_token()
+            try:
+                results = transport.request_batch(batch, token, endpoint)
+            except SessionExpiredError:
+                auth.invalidate(token)
+                return transport.request_batch(batch, auth.get_token(), endpoint)
+            
+            expired = [
+                i for i, result in enumerate(results) if isinstance(result, SessionExpiredError)
+            ]
+            if expired:
+                auth.invalidate(token)
+                replayed = transport.request_batch(
+                    [batch[i] for i in expired], auth.get_token(), endpoint
+                )
+                for i, result in zip(expired, replayed):
+                    results[i] = result
+            return results
         
-        token = self._auth.get_token()
-        return self._transport.request(request, token)
+        try:
+            return self._failover(send, is_read(batch))
+        finally:
+            self._invalidate_writes(*batch)
@@ -1,5 +1,8 @@
 """Configuration for IPTVPortal API client."""
-from pydantic import SecretStr
+from pathlib import Path
+from typing import Dict, List, Literal, Optional
+
+from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -23,10 +26,56 @@ class IPTVPortalSettings(BaseSettings):
     )
     
     domain: str
+    endpoints: List[str] = []
+    endpoint_balancing: Literal["least_outstanding", "ewma"] = "least_outstanding"
+    endpoint_cooldown: float = 30.0
     username: str
     password: SecretStr
     timeout: float = 30.0
+    connect_timeout: Optional[float] = None
+    read_timeout: Optional[float] = None
+    write_timeout: Optional[float] = None
+    pool_timeout: Optional[float] = None
+    pool_max_connections: int = 100
+    pool_max_keepalive: int = 20
+    pool_keepalive_expiry: float = 5.0
+    prewarm_connections: int = Field(0, ge=0)
     max_retries: int = 3
     retry_backoff_factor: float = 1.0
+    retry_max_backoff: float = 30.0
+    retry_jitter: Literal["none", "full", "decorrelated"] = "full"
+    retry_deadline: Optional[float] = Field(None, gt=0)
+    circuit_breaker: bool = False
+    circuit_failure_threshold: int = 5
+    circuit_error_rate: float = Field(0.5, gt=0, le=1)
+    circuit_window: int = 20
+    circuit_reset_timeout: float = 30.0
+    circuit_half_open_requests: int = 1
+    hedge_reads: bool = False
+    hedge_percentile: float = Field(0.95, gt=0, lt=1)
+    hedge_budget: float = Field(0.05, gt=0, le=1)
+    hedge_min_delay: float = 0.0
     verify_ssl: bool = True
     http2: bool = True
+    json_codec: Literal["auto", "orjson", "msgspec", "json"] = "auto"
+    batch_size: int = 100
+    batch_max_bytes: int = 1_048_576
+    max_concurrency: int = Field(50, ge=1)
+    session_refresh: bool = False
+    session_refresh_fraction: float = Field(0.8, gt=0, lt=1)
+    session_error_codes: List[int] = []
+    session_cache: bool = False
+    session_cache_dir: Optional[Path] = None
+    result_cache: bool = False
+    result_cache_ttl: float = 60.0
+    result_cache_ttls: Dict[str, float] = {}
+    result_cache_max_bytes: int = 64 * 1_048_576
+    coalesce_reads: bool = False
+    bulk_chunk_size: int = 500
+    bulk_max_chunk_size: int = 10_000
+    bulk_target_latency: float = 1.0
+    bulk_concurrency: int = Field(4, ge=1)
+    rate_limit: Optional[float] = Field(None, gt=0)
+    rate_limit_burst: Optional[int] = Field(None, ge=1)
+    rate_limit_methods: Dict[str, float] = {}
+    rate_limit_tables: Dict[str, float] = {}
@@ -23,11 +23,36 @@ class APIError(IPTVPortalError):
         self.status_code = status_code
 
 
-class RetryExhaustedError(IPTVPortalError):
-    """All retry attempts failed."""
+class SessionExpiredError(APIError):
+    """Server rejected the session token as expired or invalid."""
     pass
 
 
+class RetryExhaustedError(IPTVPortalError):
+    """All retry attempts failed.
+    
+    Attributes:
+        sent: Whether any attempt may have reached the server. False when
+            every attempt failed before sending, so resending is safe.
+    """
+    
+    def __init__(self, message: str, sent: bool = True):
+        super().__init__(message)
+        self.sent = sent
+
+
+class CircuitOpenError(IPTVPortalError):
+    """Request rejected without being sent because the circuit breaker is open.
+    
+    Attributes:
+        retry_after: Seconds until the breaker lets a trial request through.
+    """
+    
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class ValidationError(IPTVPortalError):
     """Request validation failed."""
     pass
@@ -0,0 +1,218 @@
+"""Adaptive concurrency limiting for request fan-out."""
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional, Tuple
+
+import httpx
+
+from .exceptions import APIError, RequestTimeoutError, RetryExhaustedError
+
+
+def is_overload(error: Optional[BaseException]) -> bool:
+    """Whether an error signals that the portal is overloaded."""
+    if isinstance(error, (RetryExhaustedError, RequestTimeoutError, httpx.TimeoutException)):
+        return True
+    if isinstance(error, APIError):
+        return error.status_code is not None and error.status_code >= 500
+    return False
+
+
+@dataclass
+class LimiterStats:
+    """Adaptive limiter state."""
+    
+    limit: int
+    in_flight: int
+    latency: float
+    baseline: float
+    increases: int
+    decreases: int
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit driven by request latency and overload errors.
+    
+    The limit grows by ``increase`` per window of completed requests while
+    latency stays within ``tolerance`` times the baseline, and is multiplied
+    by ``backoff`` when a request times out, fails with a 5xx or exhausts
+    its retries, or when latency climbs above the tolerance. Only requests
+    started after the last cut can cut again, so one burst of failures
+    costs a single decrease.
+    
+    The limit is enforced with permits: every request acquires one before it
+    starts and releases it when done. Permits are counted across threads
+    and event loops, so one limiter governs concurrent work across the sync
+    and async clients.
+    
+    Pass it as ``concurrency`` to execute_many(), execute_stream(),
+    execute_batch(), bulk_insert() or bulk_upsert().
+    
+    Example:
+        >>> limiter = AdaptiveLimiter(initial=10, maximum=200)
+        >>> await client.execute_many(requests, concurrency=limiter)
+        >>> print(limiter.limit)
+        
+    Args:
+        initial: Starting limit.
+        minimum: Lowest limit.
+        maximum: Highest limit.
+        increase: Permits added per window of successful requests.
+        backoff: Factor applied to the limit on overload.
+        tolerance: Latency over baseline ratio treated as congestion.
+        smoothing: Weight of the newest sample in the latency average.
+    """
+    
+    def __init__(
+        self,
+        initial: int = 10,
+        minimum: int = 1,
+        maximum: int = 100,
+        increase: float = 1.0,
+        backoff: float = 0.5,
+        tolerance: float = 2.0,
+        smoothing: float = 0.2,
+    ):
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("Limits must satisfy 1 <= minimum <= initial <= maximum")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self._limit = float(initial)
+        self._latency = 0.0
+        self._baseline = math.inf
+        self._last_decrease = -math.inf
+        self._increases = 0
+        self._decreases = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = deque()
+    
+    @property
+    def limit(self) -> int:
+        """Current number of permitted in-flight requests."""
+        return int(self._limit)
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of permits currently held."""
+        return self._in_flight
+    
+    def try_acquire(self) -> bool:
+        """Take a permit if one is free, without waiting."""
+        with self._lock:
+            if self._in_flight >= self.limit:
+                return False
+            self._in_flight += 1
+            return True
+    
+    def acquire(self) -> None:
+        """Take a permit, blocking the thread until one is free."""
+        with self._available:
+            self._available.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+    
+    async def acquire_async(self) -> None:
+        """Take a permit, waiting without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._in_flight < self.limit:
+                    self._in_flight += 1
+                    return
+                waiter: "asyncio.Future[None]" = loop.create_future()
+                self._waiters.append((loop, waiter))
+            try:
+                await waiter
+            finally:
+                with self._lock:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+    
+    def release(
+        self, started: Optional[float] = None, error: Optional[BaseException] = None
+    ) -> None:
+        """Return a permit, recording the outcome of its request.
+        
+        Args:
+            started: time.monotonic() when the request was started, or None
+                if no request was sent with the permit.
+            error: Exception the request failed with, if any.
+        """
+        if started is not None:
+            self.record(started, error)
+        with self._lock:
+            self._in_flight -= 1
+            self._wake()
+    
+    def record(self, started: float, error: Optional[BaseException] = None) -> None:
+        """Adjust the limit after a request finished.
+        
+        Args:
+            started: time.monotonic() when the request was started.
+            error: Exception the request failed with, if any.
+        """
+        latency = time.monotonic() - started
+        with self._lock:
+            if is_overload(error):
+                self._decrease(started)
+                return
+            if error is not None:
+                return
+            
+            if self._latency:
+                self._latency += self.smoothing * (latency - self._latency)
+            else:
+                self._latency = latency
+            # Track the uncongested latency, letting it drift up slowly so a
+            # permanently slower portal is not mistaken for congestion
+            self._baseline = min(latency, self._baseline * 1.01)
+            if self._latency > self._baseline * self.tolerance:
+                self._decrease(started)
+            elif self._limit < self.maximum:
+                self._limit = min(self.maximum, self._limit + self.increase / self._limit)
+                self._increases += 1
+                self._wake()
+    
+    def stats(self) -> LimiterStats:
+        """Return a snapshot of the limiter state."""
+        with self._lock:
+            return LimiterStats(
+                limit=self.limit,
+                in_flight=self._in_flight,
+                latency=self._latency,
+                baseline=0.0 if math.isinf(self._baseline) else self._baseline,
+                increases=self._increases,
+                decreases=self._decreases,
+            )
+    
+    def _wake(self) -> None:
+        """Let waiters retry taking a permit. Called with the lock held."""
+        if self._in_flight >= self.limit:
+            return
+        self._available.notify_all()
+        while self._waiters:
+            loop, waiter = self._waiters.popleft()
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_resolve, waiter)
+    
+    def _decrease(self, started: float) -> None:
+        if started < self._last_decrease:
+            return
+        self._limit = max(float(self.minimum), self._limit * self.backoff)
+        self._last_decrease = time.monotonic()
+        self._decreases += 1
+
+
+def _resolve(waiter: "asyncio.Future[None]") -> None:
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,130 @@
+"""Keyset pagination helpers for JSONSQL select queries."""
+from typing import Any, Dict, List, Optional, Tuple
+
+from .exceptions import APIError, ValidationError
+
+
+def and_where(*conditions: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Combine JSONSQL where conditions with AND, skipping empty ones."""
+    present = [condition for condition in conditions if condition]
+    if not present:
+        return None
+    if len(present) == 1:
+        return present[0]
+    return {"and": present}
+
+
+def key_position(data: List[Any], key: str) -> int:
+    """Return the position of the pagination key among the selected columns.
+    
+    Raises:
+        ValidationError: If the key column is not selected.
+    """
+    try:
+        return data.index(key)
+    except ValueError:
+        raise ValidationError(f"Keyset pagination requires '{key}' in the selected columns")
+
+
+def row_key(row: Any, key: str, position: int) -> Any:
+    """Extract the pagination key from a row returned as a list or a dict."""
+    if isinstance(row, dict):
+        return row[key]
+    return row[position]
+
+
+def keyset_request(
+    table: str,
+    data: List[Any],
+    key: str,
+    page_size: int,
+    where: Optional[Dict[str, Any]] = None,
+    after: Any = None,
+) -> Dict[str, Any]:
+    """Build a select request for the page of rows following ``after``.
+    
+    Rows are ordered by key and restricted to ``key > after``, so each page
+    is an index range scan on the server regardless of how deep into the
+    table it is, unlike offset paging.
+    
+    Args:
+        table: Table to select from.
+        data: Selected columns, including key.
+        key: Unique, ordered column to paginate on.
+        page_size: Maximum rows per page.
+        where: Additional JSONSQL where condition.
+        after: Key of the last row already seen, or None for the first page.
+        
+    Returns:
+        JSONRPC select request.
+    """
+    params: Dict[str, Any] = {
+        "data": data,
+        "from": table,
+        "order_by": key,
+        "limit": page_size,
+    }
+    condition = and_where(where, {"gt": [key, after]} if after is not None else None)
+    if condition:
+        params["where"] = condition
+    return {"jsonrpc": "2.0", "id": 1, "method": "select", "params": params}
+
+
+def bounds_request(
+    table: str, key: str, where: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Build a select request returning the minimum and maximum key."""
+    params: Dict[str, Any] = {
+        "data": [{"min": key}, {"max": key}],
+        "from": table,
+    }
+    if where:
+        params["where"] = where
+    return {"jsonrpc": "2.0", "id": 1, "method": "select", "params": params}
+
+
+def key_bounds(result: Any) -> Tuple[Any, Any]:
+    """Read the minimum and maximum key from the result of bounds_request().
+    
+    Rows returned as dicts are read by their ``min`` and ``max`` keys rather
+    than by position, as the server decides the key order.
+    
+    Returns:
+        (min, max), both None if the table or the filtered set is empty.
+        
+    Raises:
+        APIError: If a dict row lacks the min or max key.
+    """
+    row = result[0] if result else None
+    if not row:
+        return None, None
+    if isinstance(row, dict):
+        if "min" not in row or "max" not in row:
+            raise APIError(f"Unexpected key bounds row: {row!r}")
+        low, high = row["min"], row["max"]
+    else:
+        low, high = row
+    return low, high
+
+
+def shard_ranges(low: int, high: int, shards: int) -> List[Tuple[int, int]]:
+    """Split the inclusive key range [low, high] into contiguous half-open ranges.
+    
+    Args:
+        low: Smallest key.
+        high: Largest key.
+        shards: Desired number of ranges.
+        
+    Returns:
+        Ascending (start, stop) pairs covering the range, never more than
+        there are keys in it.
+    """
+    span = high - low + 1
+    shards = max(1, min(shards, span))
+    edges = [low + span * i // shards for i in range(shards)] + [high + 1]
+    return list(zip(edges, edges[1:]))
+
+
+def range_where(key: str, start: int, stop: int) -> Dict[str, Any]:
+    """Build the where condition for ``start <= key < stop``."""
+    return {"and": [{"gte": [key, start]}, {"lt": [key, stop]}]}
@@ -0,0 +1,39 @@
+"""JSONSQL query builder with Django-style Q objects.
+
+Example:
+    >>> from iptvportal.query import Q, QueryBuilder
+    >>> params = (
+    ...     QueryBuilder("subscriber")
+    ...     .select("id", "username")
+    ...     .where(Q(disabled=False) & Q(username__startswith="test"))
+    ...     .limit(50)
+    ...     .build()
+    ... )
+"""
+
+from .builder import (
+    DeleteQuery,
+    InsertQuery,
+    QueryBuilder,
+    QueryFactory,
+    SelectQuery,
+    Statement,
+    UpdateQuery,
+)
+from .compiler import compile_where
+from .prepared import Param, PreparedQuery
+from .q import Q
+
+__all__ = [
+    "Q",
+    "Param",
+    "PreparedQuery",
+    "QueryBuilder",
+    "QueryFactory",
+    "Statement",
+    "SelectQuery",
+    "InsertQuery",
+    "UpdateQuery",
+    "DeleteQuery",
+    "compile_where",
+]
@@ -0,0 +1,374 @@
+"""Fluent JSONSQL statement builders."""
+import itertools
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from ..exceptions import ValidationError
+from .compiler import compile_where
+from .q import Q
+
+Condition = Union[Q, Dict[str, Any]]
+
+
+def _columns(columns: Sequence[Any]) -> Union[Any, List[Any]]:
+    """Collapse a single column to a scalar, as JSONSQL accepts both forms."""
+    return columns[0] if len(columns) == 1 else list(columns)
+
+
+def _order(fields: Sequence[str]) -> Union[Any, List[Any]]:
+    """Compile ``field``/``-field`` ordering to JSONSQL."""
+    return _columns([{"desc": f[1:]} if f.startswith("-") else f for f in fields])
+
+
+def check_row_keys(row: Dict[str, Any], columns: Sequence[str]) -> None:
+    """Reject a dict row that does not have exactly the inserted columns."""
+    if row.keys() != set(columns):
+        raise ValidationError(
+            f"Row keys {sorted(row)} do not match the inserted columns {list(columns)}"
+        )
+
+
+class Statement(ABC):
+    """Base class for JSONSQL statements.
+    
+    Args:
+        table: Table the statement operates on.
+    """
+    
+    method = ""
+    
+    def __init__(self, table: Optional[str] = None):
+        self.table = table
+        self._where: List[Condition] = []
+        self._returning: List[str] = []
+    
+    def where(self, *conditions: Condition, **lookups: Any) -> "Statement":
+        """Add conditions, combined with AND. Lookups are passed to Q."""
+        self._where.extend(conditions)
+        if lookups:
+            self._where.append(Q(**lookups))
+        return self
+    
+    def returning(self, *columns: str) -> "Statement":
+        """Set the columns returned for affected rows."""
+        self._returning = list(columns)
+        return self
+    
+    @abstractmethod
+    def build(self) -> Dict[str, Any]:
+        """Compile the statement to JSONSQL params."""
+    
+    def to_request(self, request_id: int = 1) -> Dict[str, Any]:
+        """Wrap the compiled statement in a JSONRPC request payload."""
+        return {"jsonrpc": "2.0", "id": request_id, "method": self.method, "params": self.build()}
+    
+    def _compiled_where(self) -> Optional[Dict[str, Any]]:
+        parts = [part for part in map(compile_where, self._where) if part]
+        if not parts:
+            return None
+        return parts[0] if len(parts) == 1 else {"and": parts}
+    
+    def _require_table(self) -> str:
+        if not self.table:
+            raise ValidationError(f"{self.method} statement requires a table")
+        return self.table
+
+
+class SelectQuery(Statement):
+    """JSONSQL select statement.
+    
+    Example:
+        >>> SelectQuery("subscriber").select("id", "username").where(
+        ...     Q(disabled=False) & Q(id__gt=100)
+        ... ).order_by("-id").limit(50).build()
+    """
+    
+    method = "select"
+    
+    def __init__(self, table: Optional[str] = None, data: Sequence[Any] = ()):
+        super().__init__(table)
+        self._data: List[Any] = list(data)
+        self._order_by: List[str] = []
+        self._limit: Optional[int] = None
+        self._offset: Optional[int] = None
+    
+    def select(self, *columns: Any) -> "SelectQuery":
+        """Set the selected columns."""
+        self._data = list(columns)
+        return self
+    
+    def from_(self, table: str) -> "SelectQuery":
+        """Set the table to select from."""
+        self.table = table
+        return self
+    
+    def order_by(self, *fields: str) -> "SelectQuery":
+        """Order by fields, prefixed with ``-`` for descending order."""
+        self._order_by = list(fields)
+        return self
+    
+    def limit(self, limit: int) -> "SelectQuery":
+        """Limit the number of rows."""
+        self._limit = limit
+        return self
+    
+    def offset(self, offset: int) -> "SelectQuery":
+        """Skip a number of rows."""
+        self._offset = offset
+        return self
+    
+    def build(self) -> Dict[str, Any]:
+        if not self._data:
+            raise ValidationError("select statement requires at least one column")
+        params: Dict[str, Any] = {"data": self._data, "from": self._require_table()}
+        where = self._compiled_where()
+        if where:
+            params["where"] = where
+        if self._order_by:
+            params["order_by"] = _order(self._order_by)
+        if self._limit is not None:
+            params["limit"] = self._limit
+        if self._offset is not None:
+            params["offset"] = self._offset
+        return params
+
+
+class InsertQuery(Statement):
+    """JSONSQL insert statement.
+    
+    Rows can be given as sequences matching the columns, or as dicts, in
+    which case columns default to the keys of the first row and every dict
+    must have exactly those keys.
+    
+    Example:
+        >>> InsertQuery("subscriber").values(
+        ...     {"username": "u1", "password": "p1"},
+        ...     {"username": "u2", "password": "p2"},
+        ... ).returning("id").build()
+    """
+    
+    method = "insert"
+    
+    def __init__(self, table: Optional[str] = None, columns: Sequence[str] = ()):
+        super().__init__(table)
+        self._columns: List[str] = list(columns)
+        self._values: List[List[Any]] = []
+        self._conflict: List[str] = []
+        self._conflict_update: Optional[List[str]] = None
+    
+    def columns(self, *columns: str) -> "InsertQuery":
+        """Set the inserted columns."""
+        self._columns = list(columns)
+        return self
+    
+    def values(self, *rows: Union[Sequence[Any], Dict[str, Any]]) -> "InsertQuery":
+        """Append rows to insert.
+        
+        Raises:
+            ValidationError: If a dict row's keys differ from the columns.
+        """
+        for row in rows:
+            if isinstance(row, dict):
+                if not self._columns:
+                    self._columns = list(row)
+                check_row_keys(row, self._columns)
+                self._values.append([row[column] for column in self._columns])
+            else:
+                self._values.append(list(row))
+        return self
+    
+    def on_conflict(
+        self, *columns: str, update: Optional[Sequence[str]] = None
+    ) -> "InsertQuery":
+        """Turn the insert into an upsert on the given unique columns.
+        
+        Args:
+            *columns: Columns of the unique constraint rows may conflict on.
+            update: Columns overwritten on conflict. Defaults to every
+                inserted column outside the constraint; empty keeps
+                existing rows unchanged.
+        """
+        self._conflict = list(columns)
+        self._conflict_update = None if update is None else list(update)
+        return self
+    
+    def build(self) -> Dict[str, Any]:
+        if not self._columns or not self._values:
+            raise ValidationError("insert statement requires columns and values")
+        params: Dict[str, Any] = {
+            "into": self._require_table(),
+            "columns": self._columns,
+            "values": self._values,
+        }
+        if self._conflict:
+            update = self._conflict_update
+            if update is None:
+                update = [column for column in self._columns if column not in self._conflict]
+            params["on_conflict"] = {"columns": self._conflict, "update": update}
+        if self._returning:
+            params["returning"] = _columns(self._returning)
+        return params
+
+
+class UpdateQuery(Statement):
+    """JSONSQL update statement.
+    
+    Example:
+        >>> UpdateQuery("subscriber").set(disabled=True).where(id=42).build()
+    """
+    
+    method = "update"
+    
+    def __init__(self, table: Optional[str] = None):
+        super().__init__(table)
+        self._set: Dict[str, Any] = {}
+    
+    def set(self, values: Optional[Dict[str, Any]] = None, **columns: Any) -> "UpdateQuery":
+        """Set column values, from a dict and/or keyword arguments."""
+        self._set.update(values or {}, **columns)
+        return self
+    
+    def build(self) -> Dict[str, Any]:
+        if not self._set:
+            raise ValidationError("update statement requires values to set")
+        params: Dict[str, Any] = {"table": self._require_table(), "set": self._set}
+        where = self._compiled_where()
+        if where:
+            params["where"] = where
+        if self._returning:
+            params["returning"] = _columns(self._returning)
+        return params
+
+
+class DeleteQuery(Statement):
+    """JSONSQL delete statement.
+    
+    Example:
+        >>> DeleteQuery("terminal").where(Q(id__in=[1, 2, 3])).build()
+    """
+    
+    method = "delete"
+    
+    def build(self) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"from": self._require_table()}
+        where = self._compiled_where()
+        if where:
+            params["where"] = where
+        if self._returning:
+            params["returning"] = _columns(self._returning)
+        return params
+
+
+class QueryBuilder:
+    """Entry point for building statements against one table.
+    
+    Example:
+        >>> query = (
+        ...     QueryBuilder("subscriber")
+        ...     .select("id", "username")
+        ...     .where(Q(disabled=False) & Q(balance__gte=100))
+        ...     .order_by("-id")
+        ...     .limit(50)
+        ...     .build()
+        ... )
+    
+    Args:
+        table: Table the statements operate on.
+    """
+    
+    def __init__(self, table: str):
+        self.table = table
+    
+    def select(self, *columns: Any) -> SelectQuery:
+        """Start a select statement."""
+        return SelectQuery(self.table, columns)
+    
+    def insert(self, *columns: str) -> InsertQuery:
+        """Start an insert statement."""
+        return InsertQuery(self.table, columns)
+    
+    def update(self, values: Optional[Dict[str, Any]] = None, **columns: Any) -> UpdateQuery:
+        """Start an update statement."""
+        return UpdateQuery(self.table).set(values, **columns)
+    
+    def delete(self) -> DeleteQuery:
+        """Start a delete statement."""
+        return DeleteQuery(self.table)
+
+
+class QueryFactory:
+    """Builds complete JSONRPC requests, exposed as ``client.query``.
+    
+    Every request gets a fresh id, so the results can be passed straight
+    to ``execute()``, ``execute_many()`` or ``execute_batch()``.
+    
+    Example:
+        >>> query = client.query.select(data=["id", "title"], from_="media", limit=10)
+        >>> rows = client.execute(query)
+    """
+    
+    def __init__(self) -> None:
+        self._ids = itertools.count(1)
+    
+    def select(
+        self,
+        data: Sequence[Any],
+        from_: str,
+        where: Optional[Condition] = None,
+        order_by: Union[str, Sequence[str], None] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Build a select request."""
+        query = SelectQuery(from_, data)
+        if where is not None:
+            query.where(where)
+        if order_by:
+            query.order_by(*([order_by] if isinstance(order_by, str) else order_by))
+        if limit is not None:
+            query.limit(limit)
+        if offset is not None:
+            query.offset(offset)
+        return query.to_request(next(self._ids))
+    
+    def insert(
+        self,
+        into: str,
+        values: Sequence[Union[Sequence[Any], Dict[str, Any]]],
+        columns: Sequence[str] = (),
+        returning: Union[str, Sequence[str], None] = None,
+    ) -> Dict[str, Any]:
+        """Build an insert request."""
+        query = InsertQuery(into, columns).values(*values)
+        if returning:
+            query.returning(*([returning] if isinstance(returning, str) else returning))
+        return query.to_request(next(self._ids))
+    
+    def update(
+        self,
+        table: str,
+        set_: Dict[str, Any],
+        where: Optional[Condition] = None,
+        returning: Union[str, Sequence[str], None] = None,
+    ) -> Dict[str, Any]:
+        """Build an update request."""
+        query = UpdateQuery(table).set(set_)
+        if where is not None:
+            query.where(where)
+        if returning:
+            query.returning(*([returning] if isinstance(returning, str) else returning))
+        return query.to_request(next(self._ids))
+    
+    def delete(
+        self,
+        from_: str,
+        where: Optional[Condition] = None,
+        returning: Union[str, Sequence[str], None] = None,
+    ) -> Dict[str, Any]:
+        """Build a delete request."""
+        query = DeleteQuery(from_)
+        if where is not None:
+            query.where(where)
+        if returning:
+            query.returning(*([returning] if isinstance(returning, str) else returning))
+        return query.to_request(next(self._ids))
@@ -0,0 +1,90 @@
+"""Compilation of Q objects to JSONSQL."""
+from typing import Any, Dict, Optional, Union
+
+from ..exceptions import ValidationError
+from .prepared import Param
+from .q import Q, Leaf
+
+# Django-style lookup -> JSONSQL operator
+OPERATORS = {
+    "exact": "eq",
+    "ne": "neq",
+    "gt": "gt",
+    "gte": "gte",
+    "lt": "lt",
+    "lte": "lte",
+    "in": "in",
+    "like": "like",
+    "ilike": "ilike",
+    "contains": "like",
+    "icontains": "ilike",
+    "startswith": "like",
+    "istartswith": "ilike",
+    "endswith": "like",
+    "iendswith": "ilike",
+}
+
+# Lookups matching a substring are compiled to LIKE patterns, with the
+# value's own wildcards escaped
+PATTERNS = {
+    "contains": "%{}%",
+    "icontains": "%{}%",
+    "startswith": "{}%",
+    "istartswith": "{}%",
+    "endswith": "%{}",
+    "iendswith": "%{}",
+}
+
+
+def _escape_like(value: Any) -> str:
+    """Escape LIKE wildcards so the value matches literally."""
+    return str(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _compile(node: Union[Leaf, Q]) -> Optional[Dict[str, Any]]:
+    """Compile a Q node or a single lookup, returning None for empty nodes."""
+    if isinstance(node, Q):
+        parts = [part for part in (_compile(child) for child in node.children) if part]
+        if not parts:
+            return None
+        condition = parts[0] if len(parts) == 1 else {node.connector: parts}
+        return {"not": condition} if node.negated else condition
+    
+    field, lookup, value = node
+    if lookup == "isnull":
+        return {"is" if value else "is_not": [field, None]}
+    if lookup == "between":
+        if not isinstance(value, (list, tuple)) or len(value) != 2:
+            raise ValidationError(
+                f"Lookup 'between' on field '{field}' requires a (low, high) pair"
+            )
+        low, high = value
+        return {"and": [{"gte": [field, low]}, {"lte": [field, high]}]}
+    if lookup not in OPERATORS:
+        raise ValidationError(f"Unsupported lookup '{lookup}' on field '{field}'")
+    operator = OPERATORS[lookup]
+    pattern = PATTERNS.get(lookup)
+    if pattern:
+        if isinstance(value, Param):
+            raise ValidationError(
+                f"Lookup '{lookup}' cannot take a Param, use 'like' with the full pattern"
+            )
+        return {operator: [field, pattern.format(_escape_like(value))]}
+    return {operator: [field, value]}
+
+
+def compile_where(condition: Union[Q, Dict[str, Any], None]) -> Optional[Dict[str, Any]]:
+    """Compile a where condition to JSONSQL.
+    
+    Args:
+        condition: Q object, raw JSONSQL condition dict, or None.
+        
+    Returns:
+        JSONSQL condition, or None when there is nothing to filter on.
+        
+    Raises:
+        ValidationError: If a lookup is not supported or gets an invalid value.
+    """
+    if condition is None or isinstance(condition, dict):
+        return condition
+    return _compile(condition)
@@ -0,0 +1,95 @@
+"""Prepared queries with a pre-serialized JSONRPC envelope."""
+import itertools
+import re
+import uuid
+from typing import Any, Dict, List
+
+from ..exceptions import ValidationError
+from ..transport.codec import JSONCodec
+
+
+class Param:
+    """Placeholder for a value bound when a prepared query is executed.
+    
+    Example:
+        >>> query = client.query.select(
+        ...     data=["id", "username"], from_="subscriber", where=Q(id=Param("id"))
+        ... )
+        >>> lookup = client.prepare(query)
+        >>> client.execute_prepared(lookup, id=42)
+    
+    Args:
+        name: Name of the keyword argument supplying the value.
+    """
+    
+    __slots__ = ("name",)
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def __repr__(self) -> str:
+        return f"Param({self.name!r})"
+
+
+class PreparedQuery:
+    """JSONRPC request serialized once, with parameters spliced in per call.
+    
+    The request is encoded with placeholder strings standing in for the
+    request id and every Param, then split into constant byte segments.
+    Binding only encodes the parameter values and joins the segments, so
+    the envelope and the constant parts of the query are never walked or
+    serialized again.
+    
+    Args:
+        request: JSONRPC request payload, with Param placeholders for values.
+        codec: Codec used by the transport that will send the request.
+    """
+    
+    def __init__(self, request: Dict[str, Any], codec: JSONCodec):
+        self.request = request
+        self.codec = codec
+        self._ids = itertools.count(1)
+        
+        marker = uuid.uuid4().hex
+        template = self._substitute({**request, "id": Param("")}, marker)
+        parts = re.split(
+            b'"' + marker.encode() + b":([^\"]*)\"", codec.encode(template)
+        )
+        self._segments: List[bytes] = parts[0::2]
+        self._slots: List[str] = [name.decode() for name in parts[1::2]]
+        self.params = frozenset(name for name in self._slots if name)
+    
+    def _substitute(self, node: Any, marker: str) -> Any:
+        """Replace Param placeholders with marker strings."""
+        if isinstance(node, Param):
+            return f"{marker}:{node.name}"
+        if isinstance(node, dict):
+            return {key: self._substitute(value, marker) for key, value in node.items()}
+        if isinstance(node, (list, tuple)):
+            return [self._substitute(value, marker) for value in node]
+        return node
+    
+    def bind(self, **params: Any) -> bytes:
+        """Encode the request with params bound and a fresh request id.
+        
+        Args:
+            **params: Values for every Param in the query.
+            
+        Returns:
+            Encoded JSONRPC request body.
+            
+        Raises:
+            ValidationError: If a parameter is missing or unknown.
+        """
+        if params.keys() != self.params:
+            missing = sorted(self.params - params.keys())
+            unknown = sorted(params.keys() - self.params)
+            raise ValidationError(f"Parameter mismatch: missing {missing}, unknown {unknown}")
+        
+        request_id = str(next(self._ids)).encode()
+        encode = self.codec.encode
+        body = [self._segments[0]]
+        for name, segment in zip(self._slots, self._segments[1:]):
+            body.append(encode(params[name]) if name else request_id)
+            body.append(segment)
+        return b"".join(body)
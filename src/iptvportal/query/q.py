@@ -0,0 +1,52 @@
+"""Django-style Q objects for JSONSQL where conditions."""
+from typing import Any, List, Tuple, Union
+
+AND = "and"
+OR = "or"
+
+# A leaf condition: (field, lookup, value)
+Leaf = Tuple[str, str, Any]
+
+
+class Q:
+    """Composable filter condition.
+    
+    Keyword arguments use Django-style lookups, ``field__lookup=value``,
+    defaulting to equality. Conditions combine with ``&``, ``|`` and ``~``.
+    
+    Example:
+        >>> Q(status="active") & Q(balance__gte=100)
+        >>> Q(username__like="test%") | ~Q(id__in=[1, 2, 3])
+        >>> Q(created__between=("2025-01-01", "2025-12-31"))
+    """
+    
+    __slots__ = ("children", "connector", "negated")
+    
+    def __init__(self, *children: "Q", **lookups: Any):
+        self.children: List[Union[Leaf, "Q"]] = list(children)
+        for name, value in sorted(lookups.items()):
+            field, _, lookup = name.partition("__")
+            self.children.append((field, lookup or "exact", value))
+        self.connector = AND
+        self.negated = False
+    
+    @classmethod
+    def _combine(cls, connector: str, *children: "Q") -> "Q":
+        combined = cls(*children)
+        combined.connector = connector
+        return combined
+    
+    def __and__(self, other: "Q") -> "Q":
+        return self._combine(AND, self, other)
+    
+    def __or__(self, other: "Q") -> "Q":
+        return self._combine(OR, self, other)
+    
+    def __invert__(self) -> "Q":
+        negated = self._combine(AND, self)
+        negated.negated = True
+        return negated
+    
+    def __repr__(self) -> str:
+        inner = f" {self.connector.upper()} ".join(repr(child) for child in self.children)
+        return f"{'NOT ' if self.negated else ''}Q({inner})"
@@ -0,0 +1,79 @@
+"""Structured outcomes for multi-request operations."""
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass
+class Outcome:
+    """Outcome of a single request within a multi-request operation.
+    
+    Attributes:
+        index: Position of the request in the input.
+        result: API response result, or None if the request failed.
+        error: Exception raised for the request, or None on success.
+    """
+    
+    index: int
+    result: Any = None
+    error: Optional[Exception] = None
+    
+    @property
+    def ok(self) -> bool:
+        """Whether the request succeeded."""
+        return self.error is None
+
+
+@dataclass
+class BatchResult:
+    """Per-item outcomes of a multi-request operation with summary counters.
+    
+    Outcomes are kept in input order, so successful results can be used
+    directly and only the failed requests need to be retried.
+    
+    Example:
+        >>> batch = await client.execute_many(requests, return_exceptions=True)
+        >>> print(f"{batch.succeeded}/{batch.total} ok", batch.error_counts)
+        >>> retry = [requests[outcome.index] for outcome in batch.failures]
+    """
+    
+    outcomes: List[Outcome] = field(default_factory=list)
+    
+    def __iter__(self) -> Iterator[Outcome]:
+        return iter(self.outcomes)
+    
+    def __len__(self) -> int:
+        return len(self.outcomes)
+    
+    @property
+    def results(self) -> List[Any]:
+        """Results in input order, with None for failed requests."""
+        return [outcome.result for outcome in self.outcomes]
+    
+    @property
+    def failures(self) -> List[Outcome]:
+        """Outcomes of the failed requests."""
+        return [outcome for outcome in self.outcomes if not outcome.ok]
+    
+    @property
+    def total(self) -> int:
+        """Number of requests."""
+        return len(self.outcomes)
+    
+    @property
+    def succeeded(self) -> int:
+        """Number of successful requests."""
+        return sum(1 for outcome in self.outcomes if outcome.ok)
+    
+    @property
+    def failed(self) -> int:
+        """Number of failed requests."""
+        return self.total - self.succeeded
+    
+    @property
+    def error_counts(self) -> Dict[str, int]:
+        """Number of failures per exception type name."""
+        counts: Dict[str, int] = {}
+        for outcome in self.failures:
+            name = type(outcome.error).__name__
+            counts[name] = counts.get(name, 0) + 1
+        return counts
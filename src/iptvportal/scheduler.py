@@ -0,0 +1,142 @@
+"""Bounded-concurrency scheduling for async request fan-out."""
+import asyncio
+import functools
+import time
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Literal,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
+
+from .limiter import AdaptiveLimiter
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def _iterate(items: Union[Iterable[T], AsyncIterable[T]]) -> AsyncGenerator[T, None]:
+    """Adapt a sync or async iterable to an async generator."""
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+@overload
+def bounded_map(
+    func: Callable[[T], Awaitable[R]],
+    items: Union[Iterable[T], AsyncIterable[T]],
+    limit: Union[int, AdaptiveLimiter],
+    return_exceptions: Literal[False] = False,
+) -> AsyncGenerator[Tuple[int, R], None]: ...
+
+
+@overload
+def bounded_map(
+    func: Callable[[T], Awaitable[R]],
+    items: Union[Iterable[T], AsyncIterable[T]],
+    limit: Union[int, AdaptiveLimiter],
+    return_exceptions: bool,
+) -> AsyncGenerator[Tuple[int, Union[R, Exception]], None]: ...
+
+
+async def bounded_map(
+    func: Callable[[T], Awaitable[R]],
+    items: Union[Iterable[T], AsyncIterable[T]],
+    limit: Union[int, AdaptiveLimiter],
+    return_exceptions: bool = False,
+) -> AsyncGenerator[Tuple[int, Union[R, Exception]], None]:
+    """Run func over items with at most ``limit`` calls in flight.
+    
+    Items are pulled from the input lazily, only when a slot frees up, so
+    neither the input nor the set of pending tasks is ever materialized in
+    full. A slow consumer applies backpressure: no new work is started
+    while results are waiting to be consumed.
+    
+    Args:
+        func: Coroutine function applied to every item.
+        items: Sync or async iterable of inputs.
+        limit: Maximum number of concurrent calls, or an adaptive limiter
+            whose permits are taken before each call is started and
+            released with the latency and outcome of the call. The permits
+            are shared with everything else using the limiter.
+        return_exceptions: Yield exceptions raised by func as results instead
+            of propagating them.
+        
+    Yields:
+        Tuples of (input index, result or exception) in completion order.
+        
+    Raises:
+        ValueError: If limit is lower than 1.
+        Exception: The first exception raised by func, unless return_exceptions
+            is set. Outstanding calls are cancelled before it propagates, and
+            likewise when the consumer closes the generator early.
+    """
+    limiter: Optional[AdaptiveLimiter] = None
+    if isinstance(limit, AdaptiveLimiter):
+        limiter, fixed = limit, 0
+    else:
+        fixed = limit
+        if fixed < 1:
+            raise ValueError("Concurrency limit must be at least 1")
+    
+    source = _iterate(items)
+    pending: Dict["asyncio.Future[R]", int] = {}
+    index = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and (limiter is not None or len(pending) < fixed):
+                if limiter is not None and not limiter.try_acquire():
+                    if pending:
+                        # Collect our own calls first; they release permits as they finish
+                        break
+                    await limiter.acquire_async()
+                try:
+                    item = await anext(source)
+                except StopAsyncIteration:
+                    exhausted = True
+                    if limiter is not None:
+                        limiter.release()
+                    break
+                task: "asyncio.Future[R]" = asyncio.ensure_future(func(item))
+                if limiter is not None:
+                    task.add_done_callback(functools.partial(_release, limiter, time.monotonic()))
+                pending[task] = index
+                index += 1
+            
+            if not pending:
+                return
+            
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                position = pending.pop(task)
+                error = task.exception()
+                if return_exceptions and isinstance(error, Exception):
+                    yield position, error
+                else:
+                    yield position, task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        await source.aclose()
+
+
+def _release(limiter: AdaptiveLimiter, started: float, task: "asyncio.Future[Any]") -> None:
+    """Return the permit of a finished or cancelled call to its limiter."""
+    error = asyncio.CancelledError() if task.cancelled() else task.exception()
+    limiter.release(started, error)
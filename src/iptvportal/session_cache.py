@@ -0,0 +1,139 @@
+"""Persistent session cache shared between processes."""
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - advisory locks are POSIX only
+    fcntl = None  # type: ignore[assignment]
+
+from .config import IPTVPortalSettings
+
+USER_CACHE_DIR = Path("~/.cache/iptvportal")
+SYSTEM_CACHE_DIR = Path("/var/lib/iptvportal")
+
+
+def default_cache_dir() -> Path:
+    """Return the user cache directory, or the system one for users without a writable home."""
+    if not os.access(Path.home(), os.W_OK) and os.access(SYSTEM_CACHE_DIR, os.W_OK):
+        return SYSTEM_CACHE_DIR
+    return USER_CACHE_DIR.expanduser()
+
+
+class SessionCache:
+    """On-disk session token store guarded by an advisory file lock.
+    
+    Entries are keyed by domain and username, so every process using the
+    same credentials shares one session. Holding the lock while
+    authenticating guarantees that concurrently starting processes issue a
+    single authorize call between them. All I/O is best-effort: an
+    unreadable or read-only cache only costs an extra authorize call.
+    
+    Args:
+        directory: Directory holding session and lock files.
+        domain: Portal domain the session belongs to.
+        username: User the session belongs to.
+    """
+    
+    def __init__(self, directory: Path, domain: str, username: str):
+        key = hashlib.sha256(f"{domain}\0{username}".encode()).hexdigest()[:32]
+        self.directory = directory
+        self.path = directory / f"session-{key}.json"
+        self.lock_path = directory / f"session-{key}.lock"
+    
+    @classmethod
+    def from_settings(
+        cls, settings: IPTVPortalSettings, domain: Optional[str] = None
+    ) -> Optional["SessionCache"]:
+        """Build the cache configured in settings, or None if it is disabled.
+        
+        Args:
+            settings: Client configuration settings.
+            domain: Portal domain of the session. Defaults to ``settings.domain``.
+        """
+        if not settings.session_cache:
+            return None
+        directory = settings.session_cache_dir or default_cache_dir()
+        return cls(Path(directory).expanduser(), domain or settings.domain, settings.username)
+    
+    def load(self) -> Optional[Tuple[str, float]]:
+        """Return the cached (token, expiry timestamp) if present and unexpired."""
+        try:
+            data = json.loads(self.path.read_text())
+            token, expires = str(data["sid"]), float(data["expires"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if not token or expires <= time.time():
+            return None
+        return token, expires
+    
+    def store(self, token: str, expires: float) -> None:
+        """Atomically write the session to disk, readable by the owner only."""
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump({"sid": token, "expires": expires}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+    
+    def clear(self, token: Optional[str] = None) -> None:
+        """Remove the cached session, only if it still holds token when given."""
+        cached = self.load()
+        if token is not None and (cached is None or cached[0] != token):
+            return
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError:
+            pass
+    
+    def acquire(self, blocking: bool = True) -> Optional[int]:
+        """Take the exclusive lock.
+        
+        Args:
+            blocking: Wait for the lock instead of giving up when it is held.
+            
+        Returns:
+            Lock handle to pass to release(), or None if the lock is held
+            elsewhere (non-blocking only). A handle of -1 means locking is
+            unavailable and callers proceed unlocked.
+        """
+        if fcntl is None:
+            return -1
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError:
+            return -1
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        return fd
+    
+    def release(self, handle: int) -> None:
+        """Release a lock handle returned by acquire()."""
+        if handle < 0 or fcntl is None:
+            return
+        try:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+        finally:
+            os.close(handle)
+    
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold the exclusive lock for the duration of the block."""
+        handle = self.acquire()
+        try:
+            yield
+        finally:
+            if handle is not None:
+                self.release(handle)
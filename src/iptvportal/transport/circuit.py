@@ -0,0 +1,218 @@
+"""Circuit breaker failing requests fast while the portal is down."""
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterator, Literal, Optional, Tuple
+
+import httpx
+
+from ..config import IPTVPortalSettings
+from ..exceptions import CircuitOpenError
+
+State = Literal["closed", "open", "half_open"]
+
+# Breakers by domain and configuration, shared by every client in the process
+_SHARED: "weakref.WeakValueDictionary[Tuple[Any, ...], CircuitBreaker]" = (
+    weakref.WeakValueDictionary()
+)
+_SHARED_LOCK = threading.Lock()
+
+
+def is_outage(error: Optional[BaseException]) -> bool:
+    """Whether an attempt failure means the portal is unreachable or failing."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.RequestError)
+
+
+@dataclass
+class CircuitSnapshot:
+    """Circuit breaker state for monitoring."""
+    
+    domain: str
+    state: State
+    consecutive_failures: int
+    error_rate: float
+    opened: int
+    retry_after: float
+
+
+class CircuitBreaker:
+    """Closed, open and half-open circuit breaker for one portal domain.
+    
+    While closed, every HTTP attempt is recorded. The breaker opens after
+    ``failure_threshold`` consecutive connection errors or 5xx responses,
+    or once ``error_rate`` of the last ``window`` attempts failed. While
+    open, requests fail immediately with CircuitOpenError instead of
+    spending their retry budget. After ``reset_timeout`` seconds the
+    breaker turns half-open and lets ``half_open_requests`` trial requests
+    through: a success closes it, a failure opens it again. Responses such
+    as 4xx and 429 prove the portal is up and count as successes.
+    
+    Args:
+        domain: Portal domain, used in errors and snapshots.
+        failure_threshold: Consecutive failures that open the breaker.
+        error_rate: Failure ratio over the window that opens the breaker.
+        window: Number of recent attempts the error rate is computed over.
+        reset_timeout: Seconds to stay open before trial requests.
+        half_open_requests: Concurrent trial requests while half-open.
+    """
+    
+    def __init__(
+        self,
+        domain: str,
+        failure_threshold: int = 5,
+        error_rate: float = 0.5,
+        window: int = 20,
+        reset_timeout: float = 30.0,
+        half_open_requests: int = 1,
+    ):
+        self.domain = domain
+        self.failure_threshold = failure_threshold
+        self.error_rate = error_rate
+        self.reset_timeout = reset_timeout
+        self.half_open_requests = half_open_requests
+        self._state: State = "closed"
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._consecutive = 0
+        self._opened_at = 0.0
+        self._opened = 0
+        self._trials = 0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_settings(
+        cls, settings: IPTVPortalSettings, domain: Optional[str] = None
+    ) -> Optional["CircuitBreaker"]:
+        """Return the breaker shared by all clients of a domain.
+        
+        Args:
+            settings: Client configuration settings.
+            domain: Portal domain. Defaults to ``settings.domain``.
+            
+        Returns:
+            Breaker, or None if the circuit breaker is disabled.
+        """
+        if not settings.circuit_breaker:
+            return None
+        domain = domain or settings.domain
+        options = (
+            settings.circuit_failure_threshold,
+            settings.circuit_error_rate,
+            settings.circuit_window,
+            settings.circuit_reset_timeout,
+            settings.circuit_half_open_requests,
+        )
+        with _SHARED_LOCK:
+            breaker = _SHARED.get((domain, *options))
+            if breaker is None:
+                breaker = cls(domain, *options)
+                _SHARED[(domain, *options)] = breaker
+            return breaker
+    
+    @property
+    def state(self) -> State:
+        """Current state, turning half-open once the reset timeout has passed."""
+        with self._lock:
+            return self._current_state()
+    
+    @contextmanager
+    def attempt(self) -> Iterator[None]:
+        """Guard one HTTP attempt, recording its outcome.
+        
+        Raises:
+            CircuitOpenError: If the breaker is open or out of trial requests.
+        """
+        self._acquire()
+        try:
+            yield
+        except Exception as e:
+            self._record(is_outage(e))
+            raise
+        except BaseException:
+            # Cancelled attempts tell nothing about the portal
+            self._release()
+            raise
+        else:
+            self._record(False)
+    
+    def snapshot(self) -> CircuitSnapshot:
+        """Return the breaker state for monitoring."""
+        with self._lock:
+            state = self._current_state()
+            failures = self._outcomes.count(True)
+            return CircuitSnapshot(
+                domain=self.domain,
+                state=state,
+                consecutive_failures=self._consecutive,
+                error_rate=failures / len(self._outcomes) if self._outcomes else 0.0,
+                opened=self._opened,
+                retry_after=self._retry_after() if state == "open" else 0.0,
+            )
+    
+    def _current_state(self) -> State:
+        if self._state == "open" and self._retry_after() == 0:
+            self._state = "half_open"
+            self._trials = 0
+        return self._state
+    
+    def _retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+    
+    def _acquire(self) -> None:
+        with self._lock:
+            state = self._current_state()
+            if state == "closed":
+                return
+            if state == "half_open" and self._trials < self.half_open_requests:
+                self._trials += 1
+                return
+            retry_after = self._retry_after()
+        raise CircuitOpenError(
+            f"Circuit open for {self.domain}, retry in {retry_after:.1f}s", retry_after
+        )
+    
+    def _release(self) -> None:
+        with self._lock:
+            if self._state == "half_open":
+                self._trials = max(0, self._trials - 1)
+    
+    def _record(self, failed: bool) -> None:
+        with self._lock:
+            if self._state == "half_open":
+                self._trials = max(0, self._trials - 1)
+                if failed:
+                    self._open()
+                else:
+                    self._close()
+                return
+            if self._state == "open":
+                return
+            
+            self._outcomes.append(failed)
+            self._consecutive = self._consecutive + 1 if failed else 0
+            window_full = len(self._outcomes) == self._outcomes.maxlen
+            if self._consecutive >= self.failure_threshold or (
+                window_full and self._outcomes.count(True) / len(self._outcomes) >= self.error_rate
+            ):
+                self._open()
+    
+    def _open(self) -> None:
+        self._state = "open"
+        self._opened_at = time.monotonic()
+        self._opened += 1
+    
+    def _close(self) -> None:
+        self._state = "closed"
+        self._outcomes.clear()
+        self._consecutive = 0
+
+
+def circuit_states() -> Dict[str, CircuitSnapshot]:
+    """Return snapshots of every live circuit breaker, keyed by domain."""
+    with _SHARED_LOCK:
+        breakers = list(_SHARED.values())
+    return {breaker.domain: breaker.snapshot() for breaker in breakers}
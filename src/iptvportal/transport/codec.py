@@ -0,0 +1,101 @@
+"""Pluggable JSON codecs for request encoding and response decoding."""
+import json
+from typing import Any, Callable, Dict, Protocol
+
+
+class JSONCodec(Protocol):
+    """Encodes request bodies to bytes and decodes raw response bytes."""
+    
+    name: str
+    
+    def encode(self, obj: Any) -> bytes:
+        """Serialize obj to compact JSON bytes."""
+        ...
+    
+    def decode(self, data: bytes) -> Any:
+        """Parse JSON bytes."""
+        ...
+
+
+class StdlibCodec:
+    """Codec backed by the standard library json module."""
+    
+    name = "json"
+    
+    def encode(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+    
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """Codec backed by orjson."""
+    
+    name = "orjson"
+    
+    def __init__(self) -> None:
+        import orjson
+        
+        self._orjson = orjson
+        # Integer dict keys are accepted by the stdlib encoder, keep parity
+        self._options = orjson.OPT_NON_STR_KEYS
+    
+    def encode(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, option=self._options)
+    
+    def decode(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec:
+    """Codec backed by msgspec."""
+    
+    name = "msgspec"
+    
+    def __init__(self) -> None:
+        import msgspec
+        
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+    
+    def encode(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+    
+    def decode(self, data: bytes) -> Any:
+        return self._decoder.decode(data)
+
+
+CODECS: Dict[str, Callable[[], JSONCodec]] = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": StdlibCodec,
+}
+
+
+def get_codec(name: str = "auto") -> JSONCodec:
+    """Return the codec registered under name.
+    
+    With ``"auto"`` the fastest installed codec is used, in the order
+    orjson, msgspec, stdlib json. Install the ``speedups`` extra to get orjson.
+    
+    Args:
+        name: Codec name: auto, orjson, msgspec or json.
+        
+    Returns:
+        Codec instance.
+        
+    Raises:
+        ValueError: If the codec name is unknown.
+        ImportError: If the requested codec is not installed.
+    """
+    if name == "auto":
+        for factory in (OrjsonCodec, MsgspecCodec):
+            try:
+                return factory()
+            except ImportError:
+                continue
+        return StdlibCodec()
+    if name not in CODECS:
+        raise ValueError(f"Unknown JSON codec: {name}")
+    return CODECS[name]()
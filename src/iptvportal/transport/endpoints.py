@@ -0,0 +1,231 @@
+"""Load balancing and failover across portal endpoints."""
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Literal, Optional, Sequence, Tuple
+
+import httpx
+
+from ..cache import READ_METHODS
+from ..config import IPTVPortalSettings
+from ..exceptions import AuthenticationError, CircuitOpenError, RetryExhaustedError
+from .circuit import CircuitBreaker, is_outage
+from .ratelimit import RateLimiter
+
+Balancing = Literal["least_outstanding", "ewma"]
+
+# Errors after which clients retry a request on another healthy endpoint
+FAILOVER_ERRORS = (RetryExhaustedError, CircuitOpenError, AuthenticationError)
+
+# Attempt failures raised before the request left the client
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def is_read(request: Any) -> bool:
+    """Whether a request, or every request of a batch array, only reads data.
+    
+    Reads may go to any endpoint and be resent elsewhere. Anything else,
+    including an already encoded body, is treated as a write.
+    """
+    if isinstance(request, list):
+        return bool(request) and all(is_read(item) for item in request)
+    return isinstance(request, dict) and request.get("method") in READ_METHODS
+
+
+def never_sent(error: BaseException) -> bool:
+    """Whether a failed request certainly did not reach the portal, so resending it is safe."""
+    if isinstance(error, RetryExhaustedError):
+        return not error.sent
+    # Rejected by the breaker, or by authorize before the request itself was sent
+    return isinstance(error, (CircuitOpenError, AuthenticationError))
+
+
+# Weight of the newest sample in the latency moving average
+EWMA_WEIGHT = 0.3
+
+
+@dataclass
+class EndpointStats:
+    """Endpoint load and health for monitoring."""
+    
+    domain: str
+    healthy: bool
+    outstanding: int
+    latency: float
+    failures: int
+
+
+class Endpoint:
+    """One portal domain with its in-flight requests, latency and health.
+    
+    Args:
+        domain: Portal domain.
+        breaker: Circuit breaker guarding requests to the domain, if enabled.
+        rate_limiter: Rate limits of the domain, if configured.
+    """
+    
+    def __init__(
+        self,
+        domain: str,
+        breaker: Optional[CircuitBreaker] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        self.domain = domain
+        self.url = f"https://{domain}/api"
+        self.breaker = breaker
+        self.rate_limiter = rate_limiter
+        self.outstanding = 0
+        self.latency = 0.0
+        self.failures = 0
+        self.down_until = 0.0
+    
+    def __repr__(self) -> str:
+        return f"Endpoint({self.domain!r})"
+    
+    def healthy(self, now: float) -> bool:
+        """Whether the endpoint is neither cooling down nor behind an open circuit."""
+        if self.down_until > now:
+            return False
+        return self.breaker is None or self.breaker.state != "open"
+
+
+class EndpointPool:
+    """Balances reads over the primary domain and its replicas.
+    
+    Writes always go to the primary. Each read goes to a healthy endpoint,
+    chosen by ``balancing``:
+    
+    - ``least_outstanding``: fewest requests in flight, then lowest latency.
+    - ``ewma``: lowest moving-average latency weighted by requests in flight.
+    
+    Ties go to the endpoint listed first, so an idle client talks to the
+    primary. An attempt failing with a connection error or 5xx response
+    marks its endpoint down for ``cooldown`` seconds; the next successful
+    response marks it healthy again. When every endpoint is down, requests
+    go to the one that will recover first.
+    
+    Args:
+        endpoints: Endpoints, the primary first.
+        balancing: Balancing strategy.
+        cooldown: Seconds a failed endpoint is avoided.
+    """
+    
+    def __init__(
+        self,
+        endpoints: Sequence[Endpoint],
+        balancing: Balancing = "least_outstanding",
+        cooldown: float = 30.0,
+    ):
+        if not endpoints:
+            raise ValueError("At least one endpoint is required")
+        self.endpoints = list(endpoints)
+        self.balancing = balancing
+        self.cooldown = cooldown
+        self._by_domain: Dict[str, Endpoint] = {endpoint.domain: endpoint for endpoint in endpoints}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_settings(cls, settings: IPTVPortalSettings) -> "EndpointPool":
+        """Build the pool of ``settings.domain`` and ``settings.endpoints``."""
+        domains = dict.fromkeys([settings.domain, *settings.endpoints])
+        return cls(
+            [
+                Endpoint(
+                    domain,
+                    CircuitBreaker.from_settings(settings, domain),
+                    RateLimiter.from_settings(settings, domain),
+                )
+                for domain in domains
+            ],
+            settings.endpoint_balancing,
+            settings.endpoint_cooldown,
+        )
+    
+    @property
+    def primary(self) -> Endpoint:
+        """The endpoint configured as ``settings.domain``."""
+        return self.endpoints[0]
+    
+    def get(self, domain: str) -> Endpoint:
+        """Return the endpoint of a domain."""
+        return self._by_domain[domain]
+    
+    def select(self) -> Endpoint:
+        """Return the endpoint the next read should go to."""
+        now = time.monotonic()
+        with self._lock:
+            healthy = [endpoint for endpoint in self.endpoints if endpoint.healthy(now)]
+            if not healthy:
+                return min(self.endpoints, key=lambda endpoint: endpoint.down_until)
+            return min(healthy, key=self._load)
+    
+    def failover(self, tried: Sequence[Endpoint]) -> Optional[Endpoint]:
+        """Return the healthy endpoint to retry on after tried failed, if any."""
+        now = time.monotonic()
+        with self._lock:
+            healthy = [
+                endpoint
+                for endpoint in self.endpoints
+                if endpoint not in tried and endpoint.healthy(now)
+            ]
+            return min(healthy, key=self._load) if healthy else None
+    
+    def can_fail_over(self, endpoint: Endpoint) -> bool:
+        """Whether another endpoint is healthy, so retrying on endpoint is not needed."""
+        return self.failover([endpoint]) is not None
+    
+    @contextmanager
+    def track(self, endpoint: Endpoint) -> Iterator[None]:
+        """Count one HTTP attempt as in flight and record its latency and outcome."""
+        with self._lock:
+            endpoint.outstanding += 1
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self._record(endpoint, started, e)
+            raise
+        except BaseException:
+            # Cancelled attempts tell nothing about the endpoint
+            with self._lock:
+                endpoint.outstanding -= 1
+            raise
+        else:
+            self._record(endpoint, started, None)
+    
+    def stats(self) -> List[EndpointStats]:
+        """Return load and health of every endpoint."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                EndpointStats(
+                    domain=endpoint.domain,
+                    healthy=endpoint.healthy(now),
+                    outstanding=endpoint.outstanding,
+                    latency=endpoint.latency,
+                    failures=endpoint.failures,
+                )
+                for endpoint in self.endpoints
+            ]
+    
+    def _load(self, endpoint: Endpoint) -> Tuple[float, ...]:
+        if self.balancing == "ewma":
+            return (endpoint.latency * (endpoint.outstanding + 1),)
+        return (endpoint.outstanding, endpoint.latency)
+    
+    def _record(self, endpoint: Endpoint, started: float, error: Optional[Exception]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            endpoint.outstanding -= 1
+            if is_outage(error):
+                endpoint.failures += 1
+                endpoint.down_until = now + self.cooldown
+                return
+            endpoint.failures = 0
+            endpoint.down_until = 0.0
+            elapsed = now - started
+            if endpoint.latency:
+                endpoint.latency += EWMA_WEIGHT * (elapsed - endpoint.latency)
+            else:
+                endpoint.latency = elapsed
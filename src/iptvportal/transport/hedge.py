@@ -0,0 +1,74 @@
+"""Latency tracking and budgeting for hedged reads."""
+import math
+import threading
+from collections import deque
+from typing import Deque, Optional
+
+from ..config import IPTVPortalSettings
+
+# Latency samples kept to estimate the hedge delay
+LATENCY_WINDOW = 256
+
+# Samples required before any request is hedged
+MIN_SAMPLES = 20
+
+# Hedges that can be saved up while traffic is calm
+MAX_HEDGE_TOKENS = 10.0
+
+
+class Hedger:
+    """Decides when a slow read gets a duplicate request.
+    
+    The hedge delay is the ``percentile`` of recent read latencies, so only
+    the slowest requests are duplicated. Every read earns ``budget`` hedge
+    tokens and every hedge spends one, which caps duplicates at that
+    fraction of traffic even when the portal slows down as a whole.
+    
+    Transports send hedges over a separate connection, using HTTP/1.1
+    even when ``settings.http2`` is enabled.
+    
+    Args:
+        percentile: Latency percentile after which a read is hedged, in (0, 1).
+        budget: Maximum ratio of hedged to total reads.
+        min_delay: Lower bound for the hedge delay in seconds.
+    """
+    
+    def __init__(self, percentile: float = 0.95, budget: float = 0.05, min_delay: float = 0.0):
+        self.percentile = percentile
+        self.budget = budget
+        self.min_delay = min_delay
+        self.hedged = 0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_settings(cls, settings: IPTVPortalSettings) -> Optional["Hedger"]:
+        """Build the hedger configured in settings, or None if hedging is disabled."""
+        if not settings.hedge_reads:
+            return None
+        return cls(settings.hedge_percentile, settings.hedge_budget, settings.hedge_min_delay)
+    
+    def delay(self) -> Optional[float]:
+        """Return how long to wait before hedging a read, or None to not hedge."""
+        with self._lock:
+            self._tokens = min(MAX_HEDGE_TOKENS, self._tokens + self.budget)
+            if len(self._latencies) < MIN_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)
+        return max(self.min_delay, ordered[index])
+    
+    def try_hedge(self) -> bool:
+        """Spend a hedge token, returning False if the budget is exhausted."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.hedged += 1
+            return True
+    
+    def record(self, latency: float) -> None:
+        """Record the latency of an answered read."""
+        with self._lock:
+            self._latencies.append(latency)
@@ -1,87 +1,242 @@
 """HTTP transport with retry and exponential backoff."""
 import asyncio
 import time
-from typing import Any, Dict
+from contextlib import nullcontext
+from typing import Any, ContextManager, Dict, List
 
 import httpx
 
+from ..cache import READ_METHODS
 from ..config import IPTVPortalSettings
-from ..exceptions import APIError, RetryExhaustedError
+from ..exceptions import APIError, RetryExhaustedError, SessionExpiredError
+from .circuit import is_outage
+from .codec import get_codec
+from .endpoints import UNSENT_ERRORS, Endpoint, EndpointPool, is_read
+from .hedge import Hedger
+from .pool import PoolMonitor, PoolStats, http_timeout, pool_limits
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+
+# Phrases in JSON-RPC error messages that mean the sid has expired or is unknown.
+# Permission errors ("not authorized" to touch a table) must not trigger a re-auth.
+SESSION_ERROR_HINTS = ("session expired", "session invalid", "invalid session")
+
+
+def _api_error(error: Any, settings: IPTVPortalSettings) -> APIError:
+    """Build the exception for a JSON-RPC error object."""
+    message = f"API error: {error}"
+    if isinstance(error, dict):
+        code = error.get("code")
+        text = str(error.get("message", "")).lower()
+        if code in settings.session_error_codes or any(
+            hint in text for hint in SESSION_ERROR_HINTS
+        ):
+            return SessionExpiredError(message)
+    return APIError(message)
+
+
+def _status_error(error: httpx.HTTPStatusError) -> APIError:
+    """Build the exception for a non-retryable HTTP status."""
+    if error.response.status_code in (401, 403):
+        return SessionExpiredError(str(error), error.response.status_code)
+    return APIError(str(error), error.response.status_code)
+
+
+def _unpack_batch(data: Any, size: int, settings: IPTVPortalSettings) -> List[Any]:
+    """Match a JSON-RPC batch response back to positional request ids."""
+    if isinstance(data, dict):
+        # The server answers a batch it cannot process with a single error object
+        raise _api_error(data.get("error", data), settings)
+    
+    results: List[Any] = [
+        APIError("API error: no response for batched request") for _ in range(size)
+    ]
+    for item in data:
+        index = item.get("id")
+        if not isinstance(index, int) or not 0 <= index < size:
+            continue
+        if "error" in item:
+            results[index] = _api_error(item["error"], settings)
+        else:
+            results[index] = item.get("result")
+    return results
 
 
 class HTTPTransport:
-    """HTTP transport with retry and exponential backoff.
+    """HTTP transport with retry and jittered exponential backoff.
     
     Provides synchronous HTTP communication with automatic retry logic,
-    exponential backoff, and intelligent error handling.
+    exponential backoff, and intelligent error handling. Bodies are encoded
+    and decoded with the codec selected by ``settings.json_codec``. Requests
+    wait for the rate limits configured in settings before being sent, and
+    fail fast with CircuitOpenError while the circuit breaker is open.
+    Requests go to the endpoint whose session token they carry; the
+    EndpointPool in ``self.endpoints`` tracks the health of each endpoint.
     
     Args:
         settings: Client configuration settings.
+        retry_policy: Retry policy. Defaults to the one configured in settings.
     """
     
-    def __init__(self, settings: IPTVPortalSettings):
+    def __init__(self, settings: IPTVPortalSettings, retry_policy: RetryPolicy | None = None):
         self.settings = settings
+        self.timeout = http_timeout(settings)
         self.client = httpx.Client(
-            timeout=settings.timeout,
+            timeout=self.timeout,
             verify=settings.verify_ssl,
             http2=settings.http2,
-            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            limits=pool_limits(settings),
         )
+        self.pool = PoolMonitor()
+        self.codec = get_codec(settings.json_codec)
+        self.retry_policy = retry_policy or RetryPolicy.from_settings(settings)
+        self.endpoints = EndpointPool.from_settings(settings)
     
-    def request(self, payload: Dict[str, Any], session_token: str | None = None) -> Dict[str, Any]:
+    def request(
+        self,
+        payload: Dict[str, Any] | bytes,
+        session_token: str | None = None,
+        endpoint: Endpoint | None = None,
+        source: Dict[str, Any] | None = None,
+    ) -> Dict[str, Any]:
         """Execute JSONRPC request with retry logic.
         
         Args:
-            payload: JSONRPC request payload.
+            payload: JSONRPC request payload, or a body already encoded with self.codec.
             session_token: Optional session token for authenticated requests.
+            endpoint: Endpoint the session token belongs to. Defaults to the primary.
+            source: Request an encoded payload was built from, so per-method
+                and per-table rate limits apply to it.
             
         Returns:
             API response result.
             
         Raises:
+            SessionExpiredError: If the server rejects the session token.
             APIError: On 4xx errors or API-level errors.
             RetryExhaustedError: When all retry attempts fail.
+            CircuitOpenError: If the circuit breaker rejected the request.
+        """
+        data = self._post(payload, session_token, endpoint or self.endpoints.primary, source)
+        if "error" in data:
+            raise _api_error(data["error"], self.settings)
+        
+        return data["result"]
+    
+    def request_batch(
+        self,
+        payloads: List[Dict[str, Any]],
+        session_token: str | None = None,
+        endpoint: Endpoint | None = None,
+    ) -> List[Any]:
+        """Execute several JSONRPC requests as a single JSON-RPC 2.0 batch array.
+        
+        Request ids are rewritten to their position in the batch so responses
+        can be matched back reliably, whatever ids the caller used.
+        
+        Args:
+            payloads: JSONRPC request payloads.
+            session_token: Optional session token for authenticated requests.
+            endpoint: Endpoint the session token belongs to. Defaults to the primary.
+            
+        Returns:
+            Per-item results in input order. Items the API rejected are
+            returned as APIError instances instead of being raised.
+            
+        Raises:
+            SessionExpiredError: If the server rejects the session token.
+            APIError: On 4xx errors or if the API rejects the batch as a whole.
+            RetryExhaustedError: When all retry attempts fail.
         """
-        url = f"https://{self.settings.domain}/api"
-        headers = {}
+        if not payloads:
+            return []
+        
+        batch = [{**payload, "id": index} for index, payload in enumerate(payloads)]
+        data = self._post(batch, session_token, endpoint or self.endpoints.primary)
+        return _unpack_batch(data, len(batch), self.settings)
+    
+    def _post(
+        self,
+        body: Any,
+        session_token: str | None,
+        endpoint: Endpoint,
+        source: Dict[str, Any] | None = None,
+    ) -> Any:
+        """POST a JSONRPC body with retry logic and return the decoded response.
+        
+        Rate limits of the endpoint are looked up from source when body is
+        already encoded.
+        The RetryExhaustedError raised when attempts run out records whether
+        any attempt got past connecting, so callers know if resending is safe.
+        """
+        content = body if isinstance(body, bytes) else self.codec.encode(body)
+        headers = {"Content-Type": "application/json"}
         if session_token:
             headers["Cookie"] = f"sid={session_token}"
+        scope = body if source is None else source
+        limiter = endpoint.rate_limiter
+        buckets = limiter.buckets(scope) if limiter else []
+        read = is_read(scope)
+        sent = False
         
-        last_exception = None
-        for attempt in range(self.settings.max_retries):
+        retry = self.retry_policy.start()
+        while True:
+            if buckets:
+                time.sleep(RateLimiter.reserve(buckets))
             try:
-                response = self.client.post(
-                    url,
-                    json=payload,
-                    headers=headers,
-                    timeout=self.settings.timeout,
-                )
-                
-                # Don't retry on 4xx errors
-                if 400 <= response.status_code < 500:
+                with (
+                    self._attempt(endpoint),
+                    self.endpoints.track(endpoint),
+                    self.pool.track() as extensions,
+                ):
+                    response = self.client.post(
+                        endpoint.url,
+                        content=content,
+                        headers=headers,
+                        timeout=self.timeout,
+                        extensions=extensions,
+                    )
                     response.raise_for_status()
-                
-                response.raise_for_status()
-                data = response.json()
-                
-                if "error" in data:
-                    raise APIError(f"API error: {data['error']}")
-                
-                return data["result"]
+                return self.codec.decode(response.content)
                 
             except (httpx.HTTPStatusError, httpx.RequestError) as e:
-                last_exception = e
+                # Don't retry on 4xx errors other than 429
+                if isinstance(e, httpx.HTTPStatusError) and not self.retry_policy.is_retryable(e):
+                    raise _status_error(e)
                 
-                # Don't retry on 4xx errors
-                if isinstance(e, httpx.HTTPStatusError) and 400 <= e.response.status_code < 500:
-                    raise APIError(str(e), e.response.status_code)
-                
-                # Calculate backoff
-                if attempt < self.settings.max_retries - 1:
-                    backoff = self.settings.retry_backoff_factor * (2 ** attempt)
-                    time.sleep(backoff)
+                sent = sent or not isinstance(e, UNSENT_ERRORS)
+                delay = retry.next_delay(e)
+                # Give up on a failing endpoint at once when the caller can fail over:
+                # reads always can, writes only while they never reached the server
+                if delay is None or (
+                    is_outage(e) and (read or not sent) and self.endpoints.can_fail_over(endpoint)
+                ):
+                    raise RetryExhaustedError(
+                        f"Failed after {retry.attempts} attempts: {e}", sent
+                    ) from e
+                time.sleep(delay)
+    
+    def _attempt(self, endpoint: Endpoint) -> ContextManager[None]:
+        """Guard an HTTP attempt with the endpoint's circuit breaker, if enabled."""
+        return endpoint.breaker.attempt() if endpoint.breaker else nullcontext()
+    
+    def warm(self, endpoint: Endpoint | None = None) -> None:
+        """Open a pooled connection to an endpoint, ignoring failures.
+        
+        A HEAD request pays for the TCP and TLS handshakes without calling
+        the API; the connection then stays in the pool for real requests.
         
-        raise RetryExhaustedError(f"Failed after {self.settings.max_retries} attempts: {last_exception}")
+        Args:
+            endpoint: Endpoint to connect to. Defaults to the primary one.
+        """
+        try:
+            self.client.head((endpoint or self.endpoints.primary).url, timeout=self.timeout)
+        except httpx.HTTPError:
+            pass
+    
+    def pool_stats(self) -> PoolStats:
+        """Return connection pool occupancy and wait times."""
+        return self.pool.stats()
     
     def close(self):
         """Close HTTP client."""
@@ -89,76 +244,247 @@ class HTTPTransport:
 
 
 class AsyncHTTPTransport:
-    """Async HTTP transport with retry and exponential backoff.
+    """Async HTTP transport with retry and jittered exponential backoff.
     
     Provides asynchronous HTTP communication with automatic retry logic,
-    exponential backoff, and intelligent error handling.
+    exponential backoff, and intelligent error handling. Bodies are encoded
+    and decoded with the codec selected by ``settings.json_codec``. Requests
+    wait for the rate limits configured in settings before being sent, and
+    fail fast with CircuitOpenError while the circuit breaker is open. With
+    ``settings.hedge_reads``, slow get and select requests are hedged.
+    Requests go to the endpoint whose session token they carry; the
+    EndpointPool in ``self.endpoints`` tracks the health of each endpoint.
     
     Args:
         settings: Client configuration settings.
+        retry_policy: Retry policy. Defaults to the one configured in settings.
     """
     
-    def __init__(self, settings: IPTVPortalSettings):
+    def __init__(self, settings: IPTVPortalSettings, retry_policy: RetryPolicy | None = None):
         self.settings = settings
+        self.timeout = http_timeout(settings)
         self.client = httpx.AsyncClient(
-            timeout=settings.timeout,
+            timeout=self.timeout,
             verify=settings.verify_ssl,
             http2=settings.http2,
-            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            limits=pool_limits(settings),
+        )
+        self.pool = PoolMonitor()
+        self.codec = get_codec(settings.json_codec)
+        self.retry_policy = retry_policy or RetryPolicy.from_settings(settings)
+        self.endpoints = EndpointPool.from_settings(settings)
+        self.hedger = Hedger.from_settings(settings)
+        # One multiplexed HTTP/2 connection would carry a hedge alongside the
+        # request it backs up, so hedges get HTTP/1.1 connections of their own
+        self.hedge_client = (
+            httpx.AsyncClient(
+                timeout=self.timeout,
+                verify=settings.verify_ssl,
+                limits=pool_limits(settings),
+            )
+            if self.hedger is not None and settings.http2
+            else None
         )
     
-    async def request(self, payload: Dict[str, Any], session_token: str | None = None) -> Dict[str, Any]:
+    async def request(
+        self,
+        payload: Dict[str, Any] | bytes,
+        session_token: str | None = None,
+        endpoint: Endpoint | None = None,
+        source: Dict[str, Any] | None = None,
+    ) -> Dict[str, Any]:
         """Execute JSONRPC request with retry logic.
         
         Args:
-            payload: JSONRPC request payload.
+            payload: JSONRPC request payload, or a body already encoded with self.codec.
             session_token: Optional session token for authenticated requests.
+            endpoint: Endpoint the session token belongs to. Defaults to the primary.
+            source: Request an encoded payload was built from, so per-method
+                and per-table rate limits apply to it.
             
         Returns:
             API response result.
             
         Raises:
+            SessionExpiredError: If the server rejects the session token.
             APIError: On 4xx errors or API-level errors.
             RetryExhaustedError: When all retry attempts fail.
+            CircuitOpenError: If the circuit breaker rejected the request.
+        """
+        if (
+            self.hedger is not None
+            and isinstance(payload, dict)
+            and payload.get("method") in READ_METHODS
+        ):
+            data = await self._hedged_post(
+                payload, session_token, endpoint or self.endpoints.primary
+            )
+        else:
+            data = await self._post(
+                payload, session_token, endpoint or self.endpoints.primary, source
+            )
+        if "error" in data:
+            raise _api_error(data["error"], self.settings)
+        
+        return data["result"]
+    
+    async def request_batch(
+        self,
+        payloads: List[Dict[str, Any]],
+        session_token: str | None = None,
+        endpoint: Endpoint | None = None,
+    ) -> List[Any]:
+        """Execute several JSONRPC requests as a single JSON-RPC 2.0 batch array.
+        
+        Args:
+            payloads: JSONRPC request payloads.
+            session_token: Optional session token for authenticated requests.
+            endpoint: Endpoint the session token belongs to. Defaults to the primary.
+            
+        Returns:
+            Per-item results in input order, with rejected items as APIError instances.
+            
+        Raises:
+            SessionExpiredError: If the server rejects the session token.
+            APIError: On 4xx errors or if the API rejects the batch as a whole.
+            RetryExhaustedError: When all retry attempts fail.
+        """
+        if not payloads:
+            return []
+        
+        batch = [{**payload, "id": index} for index, payload in enumerate(payloads)]
+        data = await self._post(batch, session_token, endpoint or self.endpoints.primary)
+        return _unpack_batch(data, len(batch), self.settings)
+    
+    async def _post(
+        self,
+        body: Any,
+        session_token: str | None,
+        endpoint: Endpoint,
+        source: Dict[str, Any] | None = None,
+        client: httpx.AsyncClient | None = None,
+    ) -> Any:
+        """POST a JSONRPC body with retry logic and return the decoded response.
+        
+        Rate limits of the endpoint are looked up from source when body is
+        already encoded. The body is sent with client, defaulting to self.client.
+        The RetryExhaustedError raised when attempts run out records whether
+        any attempt got past connecting, so callers know if resending is safe.
         """
-        url = f"https://{self.settings.domain}/api"
-        headers = {}
+        content = body if isinstance(body, bytes) else self.codec.encode(body)
+        headers = {"Content-Type": "application/json"}
         if session_token:
             headers["Cookie"] = f"sid={session_token}"
+        scope = body if source is None else source
+        limiter = endpoint.rate_limiter
+        buckets = limiter.buckets(scope) if limiter else []
+        read = is_read(scope)
+        sent = False
         
-        last_exception = None
-        for attempt in range(self.settings.max_retries):
+        retry = self.retry_policy.start()
+        while True:
+            if buckets:
+                await asyncio.sleep(RateLimiter.reserve(buckets))
             try:
-                response = await self.client.post(
-                    url,
-                    json=payload,
-                    headers=headers,
-                    timeout=self.settings.timeout,
-                )
-                
-                if 400 <= response.status_code < 500:
+                with (
+                    self._attempt(endpoint),
+                    self.endpoints.track(endpoint),
+                    self.pool.track(asynchronous=True) as extensions,
+                ):
+                    response = await (client or self.client).post(
+                        endpoint.url,
+                        content=content,
+                        headers=headers,
+                        timeout=self.timeout,
+                        extensions=extensions,
+                    )
                     response.raise_for_status()
-                
-                response.raise_for_status()
-                data = response.json()
-                
-                if "error" in data:
-                    raise APIError(f"API error: {data['error']}")
-                
-                return data["result"]
+                return self.codec.decode(response.content)
                 
             except (httpx.HTTPStatusError, httpx.RequestError) as e:
-                last_exception = e
+                # Don't retry on 4xx errors other than 429
+                if isinstance(e, httpx.HTTPStatusError) and not self.retry_policy.is_retryable(e):
+                    raise _status_error(e)
                 
-                if isinstance(e, httpx.HTTPStatusError) and 400 <= e.response.status_code < 500:
-                    raise APIError(str(e), e.response.status_code)
-                
-                if attempt < self.settings.max_retries - 1:
-                    backoff = self.settings.retry_backoff_factor * (2 ** attempt)
-                    await asyncio.sleep(backoff)
+                sent = sent or not isinstance(e, UNSENT_ERRORS)
+                delay = retry.next_delay(e)
+                # Give up on a failing endpoint at once when the caller can fail over:
+                # reads always can, writes only while they never reached the server
+                if delay is None or (
+                    is_outage(e) and (read or not sent) and self.endpoints.can_fail_over(endpoint)
+                ):
+                    raise RetryExhaustedError(
+                        f"Failed after {retry.attempts} attempts: {e}", sent
+                    ) from e
+                await asyncio.sleep(delay)
+    
+    async def _hedged_post(
+        self, body: Dict[str, Any], session_token: str | None, endpoint: Endpoint
+    ) -> Any:
+        """POST an idempotent read, duplicating it if it is slower than usual.
+        
+        Once the read has been outstanding for the hedger's latency
+        percentile, an identical request is sent. The first successful
+        answer wins and the other request is cancelled.
+        
+        The duplicate is sent over another connection, so it also gets
+        around a stalled one: with ``settings.http2`` it goes through the
+        HTTP/1.1 ``self.hedge_client``, otherwise through another pooled
+        connection of ``self.client``, as the first one is busy.
+        """
+        hedger = self.hedger
+        assert hedger is not None
+        started = time.monotonic()
+        delay = hedger.delay()
+        pending = {asyncio.ensure_future(self._post(body, session_token, endpoint))}
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done and hedger.try_hedge():
+                    hedge = self._post(
+                        body, session_token, endpoint, client=self.hedge_client
+                    )
+                    pending.add(asyncio.ensure_future(hedge))
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None:
+                    hedger.record(time.monotonic() - started)
+                    return winner.result()
+                if not pending:
+                    return done.pop().result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    
+    def _attempt(self, endpoint: Endpoint) -> ContextManager[None]:
+        """Guard an HTTP attempt with the endpoint's circuit breaker, if enabled."""
+        return endpoint.breaker.attempt() if endpoint.breaker else nullcontext()
+    
+    async def warm(self, endpoint: Endpoint | None = None) -> None:
+        """Open a pooled connection to an endpoint, ignoring failures.
+        
+        A HEAD request pays for the TCP and TLS handshakes without calling
+        the API; the connection then stays in the pool for real requests.
         
-        raise RetryExhaustedError(f"Failed after {self.settings.max_retries} attempts: {last_exception}")
+        Args:
+            endpoint: Endpoint to connect to. Defaults to the primary one.
+        """
+        try:
+            await self.client.head(
+                (endpoint or self.endpoints.primary).url, timeout=self.timeout
+            )
+        except httpx.HTTPError:
+            pass
+    
+    def pool_stats(self) -> PoolStats:
+        """Return connection pool occupancy and wait times."""
+        return self.pool.stats()
     
     async def close(self):
-        """Close HTTP client."""
+        """Close HTTP clients."""
         await self.client.aclose()
+        if self.hedge_client is not None:
+            await self.hedge_client.aclose()
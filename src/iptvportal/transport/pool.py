@@ -0,0 +1,151 @@
+"""Connection pool configuration and occupancy statistics."""
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import httpx
+
+from ..config import IPTVPortalSettings
+from .endpoints import Endpoint, EndpointPool
+
+# httpcore trace events marking that a request got hold of a connection
+ACQUIRED_EVENTS = (
+    "connection.connect_tcp.started",
+    "http11.send_request_headers.started",
+    "http2.send_request_headers.started",
+)
+
+
+def pool_limits(settings: IPTVPortalSettings) -> httpx.Limits:
+    """Build the connection pool limits configured in settings."""
+    return httpx.Limits(
+        max_connections=settings.pool_max_connections,
+        max_keepalive_connections=settings.pool_max_keepalive,
+        keepalive_expiry=settings.pool_keepalive_expiry,
+    )
+
+
+def http_timeout(settings: IPTVPortalSettings) -> httpx.Timeout:
+    """Build the timeouts configured in settings, defaulting each to ``settings.timeout``."""
+    
+    def pick(value: Optional[float]) -> float:
+        return settings.timeout if value is None else value
+    
+    return httpx.Timeout(
+        settings.timeout,
+        connect=pick(settings.connect_timeout),
+        read=pick(settings.read_timeout),
+        write=pick(settings.write_timeout),
+        pool=pick(settings.pool_timeout),
+    )
+
+
+def prewarm_targets(settings: IPTVPortalSettings, endpoints: EndpointPool) -> List[Endpoint]:
+    """Return the endpoint of every connection to open besides the authorize one.
+    
+    Without HTTP/2 each endpoint gets ``settings.prewarm_connections``
+    connections, the primary one less for the authorize request. With
+    HTTP/2 concurrent requests to a host share a single connection, so
+    each endpoint gets one. The total stays within the connections the
+    pool keeps alive.
+    """
+    per_endpoint = 1 if settings.http2 else settings.prewarm_connections
+    targets = [endpoints.primary] * (per_endpoint - 1)
+    for endpoint in endpoints.endpoints[1:]:
+        targets.extend([endpoint] * per_endpoint)
+    return targets[: max(0, settings.pool_max_keepalive - 1)]
+
+
+@dataclass
+class PoolStats:
+    """Connection pool occupancy and wait times."""
+    
+    requests: int
+    in_flight: int
+    peak_in_flight: int
+    connections_opened: int
+    pool_timeouts: int
+    total_wait: float
+    max_wait: float
+    
+    @property
+    def mean_wait(self) -> float:
+        """Mean seconds a request waited for a pooled connection."""
+        return self.total_wait / self.requests if self.requests else 0.0
+
+
+class PoolMonitor:
+    """Measures how long requests wait for a connection from the pool.
+    
+    Each request gets an httpx ``trace`` extension callback. The wait is
+    the time from sending the request until httpcore opens a connection
+    for it or starts writing it to a reused one. Long waits, a peak
+    in-flight count near ``pool_max_connections`` or any pool timeouts
+    mean the pool is too small for the concurrency used.
+    """
+    
+    def __init__(self):
+        self._requests = 0
+        self._in_flight = 0
+        self._peak = 0
+        self._opened = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def track(self, asynchronous: bool = False) -> Iterator[Dict[str, Any]]:
+        """Track one request, yielding the extensions to send it with.
+        
+        Args:
+            asynchronous: Yield a coroutine trace callback for httpx.AsyncClient.
+        """
+        started = time.monotonic()
+        acquired = False
+        
+        def trace(event: str, info: Dict[str, Any]) -> None:
+            nonlocal acquired
+            if event not in ACQUIRED_EVENTS:
+                return
+            with self._lock:
+                if event == ACQUIRED_EVENTS[0]:
+                    self._opened += 1
+                if not acquired:
+                    acquired = True
+                    wait = time.monotonic() - started
+                    self._total_wait += wait
+                    self._max_wait = max(self._max_wait, wait)
+        
+        async def atrace(event: str, info: Dict[str, Any]) -> None:
+            trace(event, info)
+        
+        callback: Callable[..., Any] = atrace if asynchronous else trace
+        with self._lock:
+            self._requests += 1
+            self._in_flight += 1
+            self._peak = max(self._peak, self._in_flight)
+        try:
+            yield {"trace": callback}
+        except httpx.PoolTimeout:
+            with self._lock:
+                self._timeouts += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+    
+    def stats(self) -> PoolStats:
+        """Return pool statistics since the transport was created."""
+        with self._lock:
+            return PoolStats(
+                requests=self._requests,
+                in_flight=self._in_flight,
+                peak_in_flight=self._peak,
+                connections_opened=self._opened,
+                pool_timeouts=self._timeouts,
+                total_wait=self._total_wait,
+                max_wait=self._max_wait,
+            )
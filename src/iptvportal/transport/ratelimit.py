@@ -0,0 +1,148 @@
+"""Client-side token-bucket rate limiting."""
+import math
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..cache import request_tables, write_tables
+from ..config import IPTVPortalSettings
+
+# Limiters by domain and configuration, shared by every client in the process
+_SHARED: "weakref.WeakValueDictionary[Tuple[Any, ...], RateLimiter]" = (
+    weakref.WeakValueDictionary()
+)
+_SHARED_LOCK = threading.Lock()
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second up to ``burst``.
+    
+    Callers reserve a token and are told how long to wait for it, rather
+    than polling, so waiting costs a single sleep. The balance may go
+    negative: later callers queue up behind earlier reservations and the
+    sustained rate never exceeds ``rate``.
+    
+    Args:
+        rate: Tokens added per second.
+        burst: Bucket capacity, the number of requests allowed back to back.
+    """
+    
+    def __init__(self, rate: float, burst: float):
+        if rate <= 0 or burst < 1:
+            raise ValueError("Rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens and return the seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+
+class RateLimiter:
+    """Global, per-method and per-table token buckets for one portal domain.
+    
+    Every HTTP request, including retries, takes a token from the global
+    bucket and from the bucket of each method and table it touches; the
+    caller then waits for the slowest of them. Pre-encoded bodies only
+    count against the global bucket, so transports look up the buckets of
+    the request an encoded body was built from.
+    
+    Args:
+        rate: Global requests per second, or None for no global limit.
+        burst: Global bucket capacity. Defaults to one second of requests.
+        methods: Requests per second per JSON-RPC method.
+        tables: Requests per second per table.
+    """
+    
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        methods: Optional[Dict[str, float]] = None,
+        tables: Optional[Dict[str, float]] = None,
+    ):
+        self.bucket = TokenBucket(rate, burst or _default_burst(rate)) if rate else None
+        self.methods = {
+            method: TokenBucket(limit, _default_burst(limit))
+            for method, limit in (methods or {}).items()
+        }
+        self.tables = {
+            table: TokenBucket(limit, _default_burst(limit))
+            for table, limit in (tables or {}).items()
+        }
+    
+    @classmethod
+    def from_settings(
+        cls, settings: IPTVPortalSettings, domain: Optional[str] = None
+    ) -> Optional["RateLimiter"]:
+        """Return the limiter shared by all clients of a domain.
+        
+        Args:
+            settings: Client configuration settings.
+            domain: Portal domain. Defaults to ``settings.domain``.
+            
+        Returns:
+            Limiter, or None if no rate limit is configured.
+        """
+        if not (settings.rate_limit or settings.rate_limit_methods or settings.rate_limit_tables):
+            return None
+        key = (
+            domain or settings.domain,
+            settings.rate_limit,
+            settings.rate_limit_burst,
+            tuple(sorted(settings.rate_limit_methods.items())),
+            tuple(sorted(settings.rate_limit_tables.items())),
+        )
+        with _SHARED_LOCK:
+            limiter = _SHARED.get(key)
+            if limiter is None:
+                limiter = cls(
+                    settings.rate_limit,
+                    settings.rate_limit_burst,
+                    settings.rate_limit_methods,
+                    settings.rate_limit_tables,
+                )
+                _SHARED[key] = limiter
+            return limiter
+    
+    def buckets(self, body: Any) -> List[TokenBucket]:
+        """Return the buckets a request body or batch array draws from."""
+        buckets = [self.bucket] if self.bucket else []
+        if isinstance(body, bytes) or not (self.methods or self.tables):
+            return buckets
+        methods, tables = _scope(body)
+        buckets.extend(self.methods[method] for method in methods if method in self.methods)
+        buckets.extend(self.tables[table] for table in tables if table in self.tables)
+        return buckets
+    
+    @staticmethod
+    def reserve(buckets: List[TokenBucket]) -> float:
+        """Take a token from each bucket and return the seconds to wait."""
+        return max((bucket.reserve() for bucket in buckets), default=0.0)
+
+
+def _default_burst(rate: Optional[float]) -> int:
+    return max(1, math.ceil(rate or 1))
+
+
+def _scope(body: Any) -> Tuple[Set[str], Set[str]]:
+    """Collect the methods and tables of a request or batch array."""
+    methods: Set[str] = set()
+    tables: Set[str] = set()
+    for request in body if isinstance(body, list) else [body]:
+        if not isinstance(request, dict):
+            continue
+        methods.add(request.get("method"))
+        params = request.get("params")
+        if isinstance(params, dict):
+            tables |= request_tables(params.get("from")) | write_tables(request)
+    return methods, tables
@@ -0,0 +1,145 @@
+"""Retry policies for the HTTP transports."""
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Literal, Optional
+
+import httpx
+
+from ..config import IPTVPortalSettings
+
+Jitter = Literal["none", "full", "decorrelated"]
+
+# Statuses whose Retry-After header says when the server will accept requests again
+RETRY_AFTER_STATUSES = (429, 503)
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request is retried.
+    
+    Connection errors, 5xx and 429 responses are retried; other 4xx
+    responses are not. Backoff grows exponentially from ``backoff_factor``
+    up to ``max_backoff`` and is randomized so that clients failing
+    together do not retry in lockstep:
+    
+    - ``none``: ``backoff_factor * 2 ** attempt``.
+    - ``full``: uniform between 0 and the exponential backoff.
+    - ``decorrelated``: uniform between ``backoff_factor`` and three times
+      the previous sleep.
+    
+    A Retry-After header on 429 and 503 responses replaces the computed
+    backoff; a request asked to wait longer than ``max_backoff`` is not
+    retried. No retry is started past ``deadline`` seconds after the first
+    attempt.
+    
+    Args:
+        max_attempts: Maximum number of attempts, including the first.
+        backoff_factor: Base backoff in seconds.
+        max_backoff: Upper bound for any sleep between attempts.
+        jitter: Jitter strategy.
+        deadline: Total time budget in seconds, or None for no deadline.
+    """
+    
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_factor: float = 1.0,
+        max_backoff: float = 30.0,
+        jitter: Jitter = "full",
+        deadline: Optional[float] = None,
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.deadline = deadline
+    
+    @classmethod
+    def from_settings(cls, settings: IPTVPortalSettings) -> "RetryPolicy":
+        """Build the policy configured in settings."""
+        return cls(
+            settings.max_retries,
+            settings.retry_backoff_factor,
+            settings.retry_max_backoff,
+            settings.retry_jitter,
+            settings.retry_deadline,
+        )
+    
+    def start(self) -> "RetryState":
+        """Begin tracking the attempts of one request."""
+        return RetryState(self)
+    
+    def is_retryable(self, error: Exception) -> bool:
+        """Whether a request that failed with error may be retried."""
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            return status == 429 or status >= 500
+        return isinstance(error, httpx.RequestError)
+    
+    def backoff(self, attempt: int, previous: float) -> float:
+        """Return the sleep before retry number attempt (0-based)."""
+        if self.jitter == "decorrelated":
+            upper = max(self.backoff_factor, previous * 3)
+            return min(self.max_backoff, random.uniform(self.backoff_factor, upper))
+        ceiling = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+        if self.jitter == "full":
+            return random.uniform(0, ceiling)
+        return ceiling
+
+
+class RetryState:
+    """Attempt counter and elapsed time of one request under a RetryPolicy."""
+    
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+        self.attempts = 0
+        self.started = time.monotonic()
+        self._previous = policy.backoff_factor
+    
+    def next_delay(self, error: Exception) -> Optional[float]:
+        """Record a failed attempt and return the sleep before the next one.
+        
+        Returns:
+            Seconds to sleep, or None if the request must not be retried
+            because the error is permanent, attempts or the deadline are
+            exhausted, or Retry-After asks for more than ``max_backoff``.
+        """
+        self.attempts += 1
+        if self.attempts >= self.policy.max_attempts or not self.policy.is_retryable(error):
+            return None
+        
+        delay = None
+        if (
+            isinstance(error, httpx.HTTPStatusError)
+            and error.response.status_code in RETRY_AFTER_STATUSES
+        ):
+            delay = retry_after(error.response)
+            if delay is not None and delay > self.policy.max_backoff:
+                return None
+        if delay is None:
+            delay = self.policy.backoff(self.attempts - 1, self._previous)
+            self._previous = delay
+        
+        deadline = self.policy.deadline
+        if deadline is not None and time.monotonic() + delay - self.started > deadline:
+            return None
+        return delay
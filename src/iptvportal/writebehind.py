@@ -0,0 +1,189 @@
+"""Write-behind buffering of updates for the async client."""
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .exceptions import ValidationError
+from .query import Q
+
+if TYPE_CHECKING:
+    from .asyncclient import AsyncIPTVPortalClient
+
+
+class WriteBehindBuffer:
+    """Buffers row updates and sends them in batches from a background task.
+    
+    update() returns as soon as the change is queued. Repeated updates of
+    the same row are merged column by column, the last write winning, so a
+    row updated a hundred times between flushes costs a single request.
+    Pending rows are flushed as one execute_batch() call once
+    ``flush_size`` rows are queued or every ``flush_interval`` seconds,
+    and on close. Flushes run one at a time, so updates to a row reach the
+    server in the order they were made.
+    
+    When ``max_pending`` distinct rows are queued, update() of a new row
+    waits for the next flush instead of growing the queue without bound.
+    
+    Failed updates are not retried beyond the transport's own retries. The
+    first failure is raised from the next update(), flush() or close() call.
+    
+    Example:
+        >>> async with AsyncIPTVPortalClient() as client:
+        ...     async with WriteBehindBuffer(client) as buffer:
+        ...         await buffer.update("terminal", terminal_id, last_seen=now)
+        
+    Args:
+        client: Connected async client used to send updates.
+        key: Primary key column identifying rows.
+        flush_size: Pending rows that trigger a flush.
+        flush_interval: Maximum seconds an update waits before being sent.
+        max_pending: Maximum pending rows before update() blocks.
+    """
+    
+    def __init__(
+        self,
+        client: "AsyncIPTVPortalClient",
+        key: str = "id",
+        flush_size: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 10_000,
+    ):
+        if max_pending < flush_size:
+            raise ValueError("max_pending must be at least flush_size")
+        self.client = client
+        self.key = key
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Condition()
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional["asyncio.Task[None]"] = None
+        self._closing = False
+        self._error: Optional[Exception] = None
+    
+    async def __aenter__(self) -> "WriteBehindBuffer":
+        """Start the background flusher."""
+        self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Flush pending updates and stop the flusher."""
+        await self.close()
+    
+    @property
+    def pending(self) -> int:
+        """Number of rows waiting to be flushed."""
+        return len(self._pending)
+    
+    def start(self) -> None:
+        """Start the background flusher. Must be called from a running event loop."""
+        if self._flusher is None or self._flusher.done():
+            self._closing = False
+            self._flusher = asyncio.create_task(self._flush_loop())
+    
+    async def update(
+        self, table: str, key: Any, values: Optional[Dict[str, Any]] = None, **columns: Any
+    ) -> None:
+        """Queue an update of one row.
+        
+        Args:
+            table: Table containing the row.
+            key: Primary key value of the row.
+            values: Column values to set.
+            **columns: Column values to set, taking precedence over values.
+            
+        Raises:
+            ValidationError: If no column values are given.
+            Exception: The first failure of a previous flush.
+        """
+        if not values and not columns:
+            raise ValidationError("update requires values to set")
+        self._raise_error()
+        row = (table, key)
+        if row not in self._pending and len(self._pending) >= self.max_pending:
+            if self._flusher is not None and self._flusher.done():
+                # A dead flusher would never make room: restart it and surface why it died
+                error = None if self._flusher.cancelled() else self._flusher.exception()
+                self.start()
+                if error is not None:
+                    raise error
+            if self._flusher is None:
+                await self._flush()
+            async with self._space:
+                self._wakeup.set()
+                await self._space.wait_for(
+                    lambda: row in self._pending or len(self._pending) < self.max_pending
+                )
+        self._pending.setdefault(row, {}).update(values or {}, **columns)
+        if len(self._pending) >= self.flush_size:
+            self._wakeup.set()
+    
+    async def flush(self) -> None:
+        """Send all pending updates now.
+        
+        Raises:
+            Exception: The first failure of this or a previous flush.
+        """
+        await self._flush()
+        self._raise_error()
+    
+    async def close(self) -> None:
+        """Stop the flusher and send all pending updates.
+        
+        The buffer can be restarted with start() afterwards.
+        
+        Raises:
+            Exception: The first failure of this or a previous flush.
+        """
+        if self._flusher:
+            # Let a flush in progress finish rather than cancelling it mid-batch
+            self._closing = True
+            self._wakeup.set()
+            await self._flusher
+            self._flusher = None
+        await self.flush()
+    
+    async def _flush_loop(self) -> None:
+        """Flush on the size trigger or the interval until closed."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._closing:
+                return
+            await self._flush()
+    
+    async def _flush(self) -> None:
+        """Send the pending updates as one batch, recording the first failure."""
+        async with self._flush_lock:
+            self._wakeup.clear()
+            pending, self._pending = self._pending, {}
+            async with self._space:
+                self._space.notify_all()
+            if not pending:
+                return
+            
+            requests: List[Dict[str, Any]] = []
+            for (table, key), values in pending.items():
+                try:
+                    requests.append(self.client.query.update(table, values, Q(**{self.key: key})))
+                except Exception as e:
+                    # Still send the other rows when one cannot be built
+                    self._error = self._error or e
+            if not requests:
+                return
+            try:
+                results = await self.client.execute_batch(requests)
+            except Exception as e:
+                self._error = self._error or e
+                return
+            failure = next((result for result in results if isinstance(result, Exception)), None)
+            if failure is not None:
+                self._error = self._error or failure
+    
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
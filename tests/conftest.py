@@ -0,0 +1,58 @@
+"""
+Shared fixtures for the client unit tests.
+
+Clients are connected as usual and their HTTP traffic is then routed to
+httpx.MockTransport handlers, so no network access is needed.
+"""
+
+import httpx
+import pytest
+
+from iptvportal import AsyncIPTVPortalClient, IPTVPortalClient
+from iptvportal.config import IPTVPortalSettings
+
+
+# ============================================================================
+# Shared Fixtures
+# ============================================================================
+
+@pytest.fixture
+def settings():
+    """Provide settings pointing at a fake portal"""
+    return IPTVPortalSettings(
+        domain="test.iptvportal.ru",
+        username="testuser",
+        password="testpass",
+        max_retries=1,
+        retry_backoff_factor=0,
+    )
+
+
+@pytest.fixture
+def connect_sync(settings):
+    """Provide a function connecting a sync client whose HTTP traffic goes to handler"""
+
+    def connect(handler):
+        client = IPTVPortalClient(settings)
+        client.connect()
+        mock = httpx.Client(transport=httpx.MockTransport(handler))
+        client._transport.client = mock
+        client._auth.client = mock
+        return client
+
+    return connect
+
+
+@pytest.fixture
+def connect_async(settings):
+    """Provide a coroutine connecting an async client whose HTTP traffic goes to handler"""
+
+    async def connect(handler):
+        client = AsyncIPTVPortalClient(settings)
+        await client.connect()
+        mock = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client._transport.client = mock
+        client._auth.client = mock
+        return client
+
+    return connect
@@ -382,3 +382,170 @@ class TestAuthManagerRetryLogic:
 
         # Should have tried max_retries + 1 times
         assert mock_http_client.post.call_count == 4  # 1 initial + 3 retries
+
+
+# ============================================================================
+# Singleflight Refresh Tests
+# ============================================================================
+
+def authorize_response(sid):
+    """Build a successful authorize response"""
+    return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": {"sid": sid}})
+
+
+class TestSingleflightRefresh:
+    """Test that concurrent refreshes share one authorize request"""
+
+    @pytest.mark.asyncio
+    async def test_async_concurrent_get_token_authorizes_once(self, mock_settings):
+        """Concurrent async callers share one in-flight authorize call"""
+        import asyncio
+
+        calls = 0
+
+        async def handler(request):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return authorize_response(f"sid-{calls}")
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        auth = AsyncAuthManager(mock_settings, client)
+
+        tokens = await asyncio.gather(*(auth.get_token() for _ in range(20)))
+
+        assert calls == 1
+        assert set(tokens) == {"sid-1"}
+
+    @pytest.mark.asyncio
+    async def test_async_refresh_failure_reaches_all_waiters(self, mock_settings):
+        """A failed shared refresh fails every waiter, and the next call retries"""
+        import asyncio
+
+        calls = 0
+
+        async def handler(request):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            if calls == 1:
+                return httpx.Response(200, json={"error": {"message": "denied"}})
+            return authorize_response("sid-ok")
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        auth = AsyncAuthManager(mock_settings, client)
+
+        results = await asyncio.gather(
+            *(auth.get_token() for _ in range(5)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, AuthenticationError) for r in results)
+        assert await auth.get_token() == "sid-ok"
+        assert calls == 2
+
+    def test_sync_threads_authorize_once(self, mock_settings):
+        """Concurrent threads share one authorize call"""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        calls = 0
+        lock = threading.Lock()
+
+        def handler(request):
+            nonlocal calls
+            with lock:
+                calls += 1
+            time.sleep(0.05)
+            return authorize_response("sid-threaded")
+
+        auth = AuthManager(mock_settings, httpx.Client(transport=httpx.MockTransport(handler)))
+
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            tokens = list(pool.map(lambda _: auth.get_token(), range(10)))
+
+        assert calls == 1
+        assert set(tokens) == {"sid-threaded"}
+
+
+# ============================================================================
+# Background Refresh Tests
+# ============================================================================
+
+class TestBackgroundRefresh:
+    """Test proactive session renewal before TTL expiry"""
+
+    @pytest.mark.asyncio
+    async def test_async_refresher_renews_before_expiry(self, mock_settings):
+        """The refresher task authorizes again once the refresh point passes"""
+        import asyncio
+
+        calls = 0
+
+        async def handler(request):
+            nonlocal calls
+            calls += 1
+            return authorize_response(f"sid-{calls}")
+
+        mock_settings.session_refresh_fraction = 0.5
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        auth = AsyncAuthManager(mock_settings, client)
+        auth._ttl = 0.2
+
+        auth.start_refresher()
+        await asyncio.sleep(0.05)
+        assert await auth.get_token() == "sid-1"
+        await asyncio.sleep(0.1)
+        assert await auth.get_token() == "sid-2"
+        await auth.stop_refresher()
+
+        assert calls == 2
+
+    def test_sync_refresher_thread_renews_before_expiry(self, mock_settings):
+        """The daemon thread renews the session and stops cleanly"""
+        import time
+
+        calls = 0
+
+        def handler(request):
+            nonlocal calls
+            calls += 1
+            return authorize_response(f"sid-{calls}")
+
+        mock_settings.session_refresh_fraction = 0.5
+        auth = AuthManager(mock_settings, httpx.Client(transport=httpx.MockTransport(handler)))
+        auth._ttl = 0.2
+
+        auth.start_refresher()
+        time.sleep(0.15)
+        auth.stop_refresher()
+
+        assert calls == 2
+        assert auth.get_token() == "sid-2"
+
+    def test_sync_refresher_survives_network_errors(self, mock_settings, monkeypatch):
+        """A failed refresh is retried instead of ending the thread"""
+        import time
+
+        calls = 0
+
+        def handler(request):
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise httpx.ConnectError("portal unreachable", request=request)
+            return authorize_response(f"sid-{calls}")
+
+        monkeypatch.setattr("iptvportal.auth.REFRESH_RETRY_DELAY", 0.01)
+        mock_settings.session_refresh_fraction = 0.5
+        auth = AuthManager(mock_settings, httpx.Client(transport=httpx.MockTransport(handler)))
+        auth._ttl = 0.2
+
+        auth.start_refresher()
+        time.sleep(0.15)
+        alive = auth._refresher.is_alive()
+        auth.stop_refresher()
+
+        assert alive
+        assert calls >= 3
+        assert auth.get_token() == f"sid-{calls}"
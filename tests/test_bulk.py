@@ -0,0 +1,175 @@
+"""
+Unit tests for bulk inserts and upserts.
+
+Covers adaptive chunk sizing, chunking of the input and ordering of the
+returned ids across concurrent chunks.
+"""
+
+import asyncio
+import json
+import random
+import time
+
+import httpx
+import pytest
+
+from iptvportal.bulk import ChunkSizer, iter_chunks
+from iptvportal.exceptions import APIError, ValidationError
+from iptvportal.limiter import AdaptiveLimiter
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def settings(settings):
+    """Use small bulk chunks"""
+    settings.bulk_chunk_size = 7
+    settings.bulk_concurrency = 3
+    return settings
+
+
+def answer(body, chunks):
+    """Answer authorize, and inserts with an id derived from each row"""
+    if body["method"] == "authorize":
+        return {"jsonrpc": "2.0", "id": 1, "result": {"sid": "sid-1"}}
+    params = body["params"]
+    chunks.append(params)
+    if any(row[0] == "bad" for row in params["values"]):
+        return {"jsonrpc": "2.0", "id": body["id"], "error": {"message": "bad row"}}
+    return {"jsonrpc": "2.0", "id": body["id"],
+            "result": [[row[0] * 10] for row in params["values"]]}
+
+
+def sync_handler(chunks):
+    """Build a handler answering inserts after a random delay"""
+
+    def handler(request):
+        body = json.loads(request.content)
+        if body["method"] != "authorize":
+            time.sleep(random.random() / 200)
+        return httpx.Response(200, json=answer(body, chunks))
+
+    return handler
+
+
+def async_handler(chunks):
+    """Build an async handler answering inserts after a random delay"""
+
+    async def handler(request):
+        body = json.loads(request.content)
+        if body["method"] != "authorize":
+            await asyncio.sleep(random.random() / 200)
+        return httpx.Response(200, json=answer(body, chunks))
+
+    return handler
+
+
+# ============================================================================
+# Chunking Tests
+# ============================================================================
+
+class TestChunking:
+    """Test chunk sizing and input splitting"""
+
+    def test_sizer_shrinks_on_slow_chunks_and_grows_gradually(self):
+        """Slow chunks shrink the size at once, fast ones at most double it"""
+        sizer = ChunkSizer(100, target_latency=1.0, max_bytes=1_000_000)
+
+        sizer.observe(100, 4.0, 1000)
+        assert sizer.size == 25
+        sizer.observe(25, 0.01, 250)
+        assert sizer.size == 50
+
+    def test_sizer_respects_byte_budget(self):
+        """Chunk size is capped so requests stay under max_bytes"""
+        sizer = ChunkSizer(100, target_latency=1.0, max_bytes=1000)
+
+        sizer.observe(100, 0.1, 2000)
+        assert sizer.size == 50
+
+    def test_chunks_follow_current_size(self):
+        """Each chunk is cut at the size current when it is built"""
+        sizer = ChunkSizer(2, target_latency=1.0, max_bytes=1000)
+        chunks = iter_chunks(({"id": i} for i in range(10)), sizer)
+
+        assert next(chunks) == (["id"], [{"id": 0}, {"id": 1}])
+        sizer._size = 5
+        assert [len(rows) for _, rows in chunks] == [5, 3]
+
+    def test_sequence_rows_require_columns(self):
+        """Columns cannot be inferred from sequence rows"""
+        with pytest.raises(ValidationError):
+            list(iter_chunks([[1, 2]], ChunkSizer(2, 1.0, 1000)))
+
+    def test_mismatched_dict_rows_rejected_before_sending(self):
+        """A dict row with other keys fails before its chunk is cut"""
+        rows = [{"id": 1, "title": "a"}, {"id": 2, "name": "b"}]
+
+        chunks = iter_chunks(rows, ChunkSizer(10, 1.0, 100_000))
+        with pytest.raises(ValidationError):
+            next(chunks)
+
+
+# ============================================================================
+# Bulk Insert Tests
+# ============================================================================
+
+class TestBulkInsert:
+    """Test bulk inserts through the clients"""
+
+    def test_sync_ids_in_input_order(self, connect_sync):
+        """Ids come back in input order although chunks finish out of order"""
+        chunks = []
+        client = connect_sync(sync_handler(chunks))
+
+        ids = client.bulk_insert("epg", ([i, f"title {i}"] for i in range(100)),
+                                 columns=["id", "title"])
+
+        assert ids == [i * 10 for i in range(100)]
+        assert len(chunks) > 1
+        assert all(chunk["columns"] == ["id", "title"] for chunk in chunks)
+
+    def test_sync_with_adaptive_limiter(self, connect_sync):
+        """An AdaptiveLimiter can drive the chunk window"""
+        chunks = []
+        client = connect_sync(sync_handler(chunks))
+        limiter = AdaptiveLimiter(initial=1, maximum=4)
+
+        ids = client.bulk_insert("epg", ({"id": i} for i in range(100)), concurrency=limiter)
+
+        assert ids == [i * 10 for i in range(100)]
+        assert limiter.stats().increases > 0
+        assert limiter.in_flight == 0
+
+    def test_sync_concurrency_defaults_and_bounds(self, connect_sync):
+        """Zero concurrency falls back to the setting and negative is rejected"""
+        client = connect_sync(sync_handler([]))
+
+        ids = client.bulk_insert("epg", ({"id": i} for i in range(20)), concurrency=0)
+
+        assert ids == [i * 10 for i in range(20)]
+        with pytest.raises(ValueError):
+            client.bulk_insert("epg", [{"id": 1}], concurrency=-1)
+
+    @pytest.mark.asyncio
+    async def test_async_upsert(self, connect_async):
+        """Upserts carry the conflict clause and return ids in order"""
+        chunks = []
+        client = await connect_async(async_handler(chunks))
+
+        rows = ({"id": i, "title": f"title {i}"} for i in range(50))
+        ids = await client.bulk_upsert("epg", rows, conflict=["id"])
+
+        assert ids == [i * 10 for i in range(50)]
+        assert chunks[0]["on_conflict"] == {"columns": ["id"], "update": ["title"]}
+
+    @pytest.mark.asyncio
+    async def test_async_failure_propagates(self, connect_async):
+        """A rejected chunk raises"""
+        client = await connect_async(async_handler([]))
+
+        rows = [[i] for i in range(20)] + [["bad"]]
+        with pytest.raises(APIError):
+            await client.bulk_insert("epg", rows, columns=["id"])
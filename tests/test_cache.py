@@ -0,0 +1,147 @@
+"""
+Unit tests for the query result cache.
+
+Covers key canonicalization, TTL expiry, the byte budget and invalidation
+by writes issued through the client.
+"""
+
+import json
+
+import httpx
+import pytest
+
+from iptvportal.cache import MISS, ResultCache
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def settings(settings):
+    """Enable the result cache"""
+    settings.result_cache = True
+    settings.result_cache_ttls = {"subscriber": 0}
+    return settings
+
+
+def select(table, **params):
+    """Build a select request"""
+    return {"jsonrpc": "2.0", "id": 1, "method": "select",
+            "params": {"data": ["id"], "from": table, **params}}
+
+
+def counting_handler(calls):
+    """Build a handler answering every query with the number of queries so far"""
+
+    def handler(request):
+        body = json.loads(request.content)
+        if isinstance(body, list):
+            calls.extend(item["method"] for item in body)
+            return httpx.Response(200, json=[
+                {"jsonrpc": "2.0", "id": item["id"], "result": len(calls)} for item in body
+            ])
+        if body["method"] == "authorize":
+            return httpx.Response(200, json={"result": {"sid": "sid-1"}})
+        calls.append(body["method"])
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": len(calls)})
+
+    return handler
+
+
+# ============================================================================
+# Result Cache Tests
+# ============================================================================
+
+class TestResultCache:
+    """Test the cache on its own"""
+
+    def test_key_ignores_id_and_key_order(self):
+        """Equivalent requests share one entry"""
+        cache = ResultCache(1024, 60)
+        first = cache.read_key({"jsonrpc": "2.0", "id": 1, "method": "select",
+                                "params": {"data": ["id"], "from": "media", "limit": 5}})
+        second = cache.read_key({"method": "select", "id": 9, "jsonrpc": "2.0",
+                                 "params": {"limit": 5, "from": "media", "data": ["id"]}})
+
+        assert first == second
+
+    def test_writes_and_unknown_tables_are_not_cached(self):
+        """Only reads of known tables have a key"""
+        cache = ResultCache(1024, 60, {"subscriber": 0})
+
+        assert cache.read_key({"method": "delete", "params": {"from": "media"}}) is None
+        assert cache.read_key({"method": "select", "params": {"data": ["1"]}}) is None
+        assert cache.read_key(select("subscriber")) is None
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Entries expire after the table TTL"""
+        now = [1000.0]
+        monkeypatch.setattr("iptvportal.cache.time.monotonic", lambda: now[0])
+        cache = ResultCache(1024, 60, {"media": 5})
+        key = cache.read_key(select("media"))
+        cache.put(key, [1])
+
+        now[0] += 4
+        assert cache.get(key) == [1]
+        now[0] += 2
+        assert cache.get(key) is MISS
+
+    def test_lru_eviction_by_size(self):
+        """Least recently used entries are evicted to stay within budget"""
+        cache = ResultCache(30, 60)
+        keys = [cache.read_key(select("media", limit=i)) for i in range(3)]
+        cache.put(keys[0], "x" * 8)
+        cache.put(keys[1], "y" * 8)
+        cache.get(keys[0])
+        cache.put(keys[2], "z" * 8)
+
+        assert cache.get(keys[1]) is MISS
+        assert cache.get(keys[0]) != MISS
+        stats = cache.stats()
+        assert stats.evictions == 1
+        assert stats.size <= 30
+
+    def test_write_during_read_is_not_stored(self):
+        """A result fetched before a write to its table is discarded"""
+        cache = ResultCache(1024, 60)
+        key = cache.read_key(select("media"))
+        cache.invalidate(frozenset({"media"}))
+        cache.put(key, [1])
+
+        assert cache.stats().entries == 0
+
+
+class TestClientCache:
+    """Test caching through the clients"""
+
+    def test_sync_hits_and_write_invalidation(self, connect_sync):
+        """Repeated reads hit the cache until the table is written"""
+        calls = []
+        client = connect_sync(counting_handler(calls))
+
+        assert client.execute(select("media")) == 1
+        assert client.execute(select("media")) == 1
+        assert client.execute(select("subscriber")) == 2
+        assert client.execute(select("subscriber")) == 3
+
+        client.execute({"jsonrpc": "2.0", "id": 1, "method": "update",
+                         "params": {"table": "media", "set": {"title": "x"}}})
+        assert client.execute(select("media")) == 5
+
+        stats = client.cache.stats()
+        assert (stats.hits, stats.misses, stats.invalidations) == (1, 2, 1)
+
+    @pytest.mark.asyncio
+    async def test_async_batch_write_invalidates(self, connect_async):
+        """Writes sent in a batch drop cached reads of their tables"""
+        calls = []
+        client = await connect_async(counting_handler(calls))
+
+        await client.execute(select("media"))
+        assert client.cache.stats().entries == 1
+
+        await client.execute_batch(
+            [{"jsonrpc": "2.0", "id": 1, "method": "delete", "params": {"from": "media"}}]
+        )
+        assert client.cache.stats().entries == 0
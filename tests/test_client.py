@@ -0,0 +1,754 @@
+"""
+Unit tests for the sync and async IPTVPortal clients.
+
+HTTP traffic is served by httpx.MockTransport handlers, so no network
+access is needed.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from iptvportal import AsyncIPTVPortalClient, IPTVPortalClient
+from iptvportal.exceptions import APIError, RetryExhaustedError, SessionExpiredError
+from iptvportal.limiter import AdaptiveLimiter
+from iptvportal.query import Param
+from iptvportal.transport.http import HTTPTransport
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+def portal_handler(calls):
+    """Build a handler answering authorize and echoing select ids back"""
+
+    def answer(item):
+        if item["params"].get("fail"):
+            return {"jsonrpc": "2.0", "id": item["id"], "error": {"message": "boom"}}
+        return {"jsonrpc": "2.0", "id": item["id"], "result": item["params"]["value"]}
+
+    def handler(request):
+        body = json.loads(request.content)
+        calls.append(body)
+        if isinstance(body, list):
+            # Answer out of order to exercise id matching
+            return httpx.Response(200, json=[answer(item) for item in reversed(body)])
+        if body["method"] == "authorize":
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": {"sid": "sid-1"}})
+        return httpx.Response(200, json=answer(body))
+
+    return handler
+
+
+def make_requests(count, fail=()):
+    """Build select-like requests carrying their index as value"""
+    return [
+        {"jsonrpc": "2.0", "id": 1, "method": "select",
+         "params": {"value": i, "fail": i in fail}}
+        for i in range(count)
+    ]
+
+
+# ============================================================================
+# Batch Tests
+# ============================================================================
+
+class TestExecuteBatch:
+    """Test JSON-RPC batch array execution"""
+
+    def test_sync_batch_preserves_order(self, connect_sync):
+        """Results come back in input order across several batches"""
+        calls = []
+        client = connect_sync(portal_handler(calls))
+
+        results = client.execute_batch(make_requests(25), batch_size=10)
+
+        assert results == list(range(25))
+        batches = [call for call in calls if isinstance(call, list)]
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+
+    def test_sync_batch_returns_item_errors(self, connect_sync):
+        """Failed items are returned as APIError without losing the others"""
+        client = connect_sync(portal_handler([]))
+
+        results = client.execute_batch(make_requests(4, fail={2}))
+
+        assert results[:2] == [0, 1]
+        assert isinstance(results[2], APIError)
+        assert results[3] == 3
+
+    def test_batch_respects_byte_budget(self, settings, connect_sync):
+        """Batches are split once the encoded body exceeds batch_max_bytes"""
+        settings.batch_max_bytes = 200
+        calls = []
+        client = connect_sync(portal_handler(calls))
+
+        assert client.execute_batch(make_requests(6)) == list(range(6))
+        assert len([call for call in calls if isinstance(call, list)]) > 1
+
+    def test_sync_concurrent_batches_keep_order(self, connect_sync):
+        """Batches sent under a shared limiter come back in input order"""
+        client = connect_sync(portal_handler([]))
+        limiter = AdaptiveLimiter(initial=3, maximum=3)
+
+        results = client.execute_batch(make_requests(40), batch_size=5, concurrency=limiter)
+
+        assert results == list(range(40))
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_async_batch_preserves_order(self, connect_async):
+        """Async batches are matched back by id in input order"""
+        calls = []
+        client = await connect_async(portal_handler(calls))
+
+        results = await client.execute_batch(make_requests(25), batch_size=7)
+
+        assert results == list(range(25))
+        await client.close()
+
+
+# ============================================================================
+# Bounded Concurrency Tests
+# ============================================================================
+
+class TestExecuteMany:
+    """Test bounded-concurrency fan-out in execute_many"""
+
+    @pytest.mark.asyncio
+    async def test_unconnected_client_raises(self, settings):
+        """return_exceptions does not turn a missing connect() into per-request errors"""
+        client = AsyncIPTVPortalClient(settings)
+
+        with pytest.raises(RuntimeError):
+            await client.execute_many(make_requests(3), return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_in_flight_requests_are_bounded(self, connect_async):
+        """Never more than `concurrency` requests are pending at once"""
+        client = await connect_async(portal_handler([]))
+        in_flight = 0
+        peak = 0
+
+        async def execute(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return request["params"]["value"]
+
+        client.execute = execute
+        results = await client.execute_many(make_requests(50), concurrency=5)
+
+        assert results == list(range(50))
+        assert peak == 5
+
+    @pytest.mark.asyncio
+    async def test_input_consumed_lazily(self, connect_async):
+        """Async iterables are pulled only as slots free up"""
+        client = await connect_async(portal_handler([]))
+        pulled = 0
+        finished = 0
+        ahead = []
+
+        async def source():
+            nonlocal pulled
+            for request in make_requests(20):
+                pulled += 1
+                yield request
+
+        async def execute(request):
+            nonlocal finished
+            ahead.append(pulled - finished)
+            await asyncio.sleep(0)
+            finished += 1
+            return request["params"]["value"]
+
+        client.execute = execute
+        results = await client.execute_many(source(), concurrency=3)
+
+        assert results == list(range(20))
+        assert max(ahead) <= 3
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_outstanding_requests(self, connect_async):
+        """The first error propagates and sibling requests are cancelled"""
+        client = await connect_async(portal_handler([]))
+        cancelled = 0
+
+        async def execute(request):
+            nonlocal cancelled
+            if request["params"]["fail"]:
+                raise APIError("boom")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled += 1
+                raise
+
+        client.execute = execute
+        with pytest.raises(APIError):
+            await client.execute_many(make_requests(10, fail={3}), concurrency=4)
+
+        assert cancelled == 3
+
+
+# ============================================================================
+# Streaming Tests
+# ============================================================================
+
+class TestExecuteStream:
+    """Test as-completed streaming of results"""
+
+    @pytest.mark.asyncio
+    async def test_results_yielded_in_completion_order(self, connect_async):
+        """Fast requests are yielded before slow ones, errors in place"""
+        client = await connect_async(portal_handler([]))
+
+        async def execute(request):
+            value = request["params"]["value"]
+            await asyncio.sleep(0.01 * (3 - value))
+            if request["params"]["fail"]:
+                raise APIError("boom")
+            return value
+
+        client.execute = execute
+        items = [item async for item in client.execute_stream(make_requests(3, fail={1}))]
+
+        assert [index for index, _ in items] == [2, 1, 0]
+        assert isinstance(items[1][1], APIError)
+        assert items[2] == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_closing_stream_cancels_outstanding(self, connect_async):
+        """Stopping iteration cancels requests still in flight"""
+        from contextlib import aclosing
+
+        client = await connect_async(portal_handler([]))
+        cancelled = 0
+
+        async def execute(request):
+            nonlocal cancelled
+            if request["params"]["value"] == 0:
+                return 0
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled += 1
+                raise
+
+        client.execute = execute
+        async with aclosing(client.execute_stream(make_requests(10), concurrency=4)) as stream:
+            async for index, _ in stream:
+                assert index == 0
+                break
+
+        assert cancelled == 3
+
+
+# ============================================================================
+# Partial Failure Tests
+# ============================================================================
+
+class TestPartialFailures:
+    """Test per-item outcome collection in execute_many"""
+
+    @pytest.mark.asyncio
+    async def test_return_exceptions_keeps_successes(self, connect_async):
+        """Successful results survive sibling failures"""
+        from iptvportal.exceptions import RetryExhaustedError
+
+        client = await connect_async(portal_handler([]))
+
+        async def execute(request):
+            value = request["params"]["value"]
+            if value == 1:
+                raise APIError("boom")
+            if value == 3:
+                raise RetryExhaustedError("down")
+            return value
+
+        client.execute = execute
+        batch = await client.execute_many(make_requests(5), return_exceptions=True)
+
+        assert batch.results == [0, None, 2, None, 4]
+        assert (batch.total, batch.succeeded, batch.failed) == (5, 3, 2)
+        assert [outcome.index for outcome in batch.failures] == [1, 3]
+        assert batch.error_counts == {"APIError": 1, "RetryExhaustedError": 1}
+
+
+# ============================================================================
+# Session Expiry Tests
+# ============================================================================
+
+def expiring_handler(calls, expired_status=200):
+    """Build a handler that rejects the first sid as expired"""
+    sids = iter(["sid-1", "sid-2"])
+
+    def answer(item, sid):
+        if sid == "sid-1":
+            return {"jsonrpc": "2.0", "id": item["id"],
+                    "error": {"code": 401, "message": "Session expired"}}
+        return {"jsonrpc": "2.0", "id": item["id"], "result": item["params"]["value"]}
+
+    def handler(request):
+        body = json.loads(request.content)
+        sid = request.headers.get("cookie", "").removeprefix("sid=")
+        calls.append((sid, body))
+        if isinstance(body, list):
+            return httpx.Response(200, json=[answer(item, sid) for item in body])
+        if body["method"] == "authorize":
+            return httpx.Response(200, json={"result": {"sid": next(sids)}})
+        if sid == "sid-1" and expired_status != 200:
+            return httpx.Response(expired_status)
+        return httpx.Response(200, json=answer(body, sid))
+
+    return handler
+
+
+class TestSessionExpiry:
+    """Test transparent re-authentication on server-side session expiry"""
+
+    def test_sync_execute_reauthenticates_and_replays(self, connect_sync):
+        """A JSON-RPC session error triggers one re-auth and replay"""
+        calls = []
+        client = connect_sync(expiring_handler(calls))
+
+        assert client.execute(make_requests(1)[0]) == 0
+        assert [sid for sid, body in calls if body["method"] != "authorize"] == ["sid-1", "sid-2"]
+
+    @pytest.mark.asyncio
+    async def test_async_execute_replays_on_http_401(self, connect_async):
+        """An HTTP 401 triggers one re-auth and replay"""
+        calls = []
+        client = await connect_async(expiring_handler(calls, expired_status=401))
+
+        assert await client.execute(make_requests(1)[0]) == 0
+        assert len([body for _, body in calls if body["method"] == "authorize"]) == 2
+
+    def test_sync_batch_replays_expired_items(self, connect_sync):
+        """Batched items rejected with an expired session are resent"""
+        client = connect_sync(expiring_handler([]))
+
+        assert client.execute_batch(make_requests(5)) == list(range(5))
+
+    def test_permission_errors_are_not_session_errors(self, connect_sync):
+        """A JSON-RPC 403 about table access is raised without re-authorizing"""
+        calls = []
+
+        def handler(request):
+            body = json.loads(request.content)
+            calls.append(body["method"])
+            if body["method"] == "authorize":
+                return httpx.Response(200, json={"result": {"sid": "sid-1"}})
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "error": {
+                "code": 403, "message": "Not authorized to update subscriber"}})
+
+        client = connect_sync(handler)
+
+        with pytest.raises(APIError) as info:
+            client.execute(make_requests(1)[0])
+        assert not isinstance(info.value, SessionExpiredError)
+        assert calls == ["authorize", "select"]
+
+    def test_sync_execute_prepared_replays(self, connect_sync):
+        """Prepared queries share the re-auth and replay path"""
+        calls = []
+        client = connect_sync(expiring_handler(calls))
+        prepared = client.prepare(
+            {"jsonrpc": "2.0", "id": 1, "method": "select", "params": {"value": Param("value")}}
+        )
+
+        assert client.execute_prepared(prepared, value=7) == 7
+        assert [sid for sid, body in calls if body["method"] != "authorize"] == ["sid-1", "sid-2"]
+
+
+
+# ============================================================================
+# Failover Tests
+# ============================================================================
+
+def replicated_handler(calls, down=(), refused=()):
+    """Build a handler giving each domain its own sid and failing the down ones
+
+    Refused domains fail to connect, so no request reaches them.
+    """
+
+    def handler(request):
+        host = request.url.host
+        body = json.loads(request.content)
+        if host in refused and body["method"] != "authorize":
+            raise httpx.ConnectError("connection refused", request=request)
+        sid = request.headers.get("cookie", "").removeprefix("sid=")
+        if isinstance(body, list):
+            calls.extend((host, item["method"], sid) for item in body)
+            return httpx.Response(200, json=[
+                {"jsonrpc": "2.0", "id": item["id"], "result": host} for item in body
+            ])
+        calls.append((host, body["method"], sid))
+        if body["method"] == "authorize":
+            return httpx.Response(200, json={"result": {"sid": f"sid-{host}"}})
+        if host in down:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": host})
+
+    return handler
+
+
+class TestFailover:
+    """Test failover across portal endpoints"""
+
+    def test_sync_fails_over_with_endpoint_session(self, settings, connect_sync):
+        """A failing primary hands the request to a replica, with its own sid"""
+        settings.endpoints = ["replica.iptvportal.ru"]
+        calls = []
+        client = connect_sync(replicated_handler(calls, down={"test.iptvportal.ru"}))
+
+        assert client.execute(make_requests(1)[0]) == "replica.iptvportal.ru"
+        assert ("replica.iptvportal.ru", "select", "sid-replica.iptvportal.ru") in calls
+
+        # The primary stays out of rotation while it cools down
+        calls.clear()
+        assert client.execute(make_requests(1)[0]) == "replica.iptvportal.ru"
+        assert {host for host, _, _ in calls} == {"replica.iptvportal.ru"}
+
+    @pytest.mark.asyncio
+    async def test_async_raises_when_every_endpoint_fails(self, settings, connect_async):
+        """The error of the last endpoint is raised once none is healthy"""
+        settings.endpoints = ["replica.iptvportal.ru"]
+        calls = []
+        down = {"test.iptvportal.ru", "replica.iptvportal.ru"}
+        client = await connect_async(replicated_handler(calls, down=down))
+
+        with pytest.raises(RetryExhaustedError):
+            await client.execute(make_requests(1)[0])
+        assert [host for host, method, _ in calls if method == "select"] == [
+            "test.iptvportal.ru",
+            "replica.iptvportal.ru",
+        ]
+
+    def test_sync_writes_go_to_primary(self, settings, connect_sync):
+        """Writes and batches containing one are not balanced onto replicas"""
+        settings.endpoints = ["replica.iptvportal.ru"]
+        calls = []
+        client = connect_sync(replicated_handler(calls))
+        write = {"jsonrpc": "2.0", "id": 1, "method": "delete", "params": {"from": "media"}}
+
+        for _ in range(4):
+            client.execute(write)
+        client.execute_batch([make_requests(1)[0], write])
+
+        assert {host for host, method, _ in calls if method != "authorize"} == {
+            "test.iptvportal.ru"
+        }
+
+    def test_sync_sent_write_does_not_fail_over(self, settings, connect_sync):
+        """A write the primary may have applied is not resent to a replica"""
+        settings.endpoints = ["replica.iptvportal.ru"]
+        calls = []
+        client = connect_sync(replicated_handler(calls, down={"test.iptvportal.ru"}))
+        write = {"jsonrpc": "2.0", "id": 1, "method": "delete", "params": {"from": "media"}}
+
+        with pytest.raises(RetryExhaustedError) as exc_info:
+            client.execute(write)
+        assert exc_info.value.sent
+        assert {host for host, method, _ in calls if method == "delete"} == {
+            "test.iptvportal.ru"
+        }
+
+    @pytest.mark.asyncio
+    async def test_async_unsent_write_fails_over(self, settings, connect_async):
+        """A write that never reached the primary is sent to a replica"""
+        settings.endpoints = ["replica.iptvportal.ru"]
+        calls = []
+        client = await connect_async(replicated_handler(calls, refused={"test.iptvportal.ru"}))
+        write = {"jsonrpc": "2.0", "id": 1, "method": "delete", "params": {"from": "media"}}
+
+        assert await client.execute(write) == "replica.iptvportal.ru"
+
+
+# ============================================================================
+# Keyset Pagination Tests
+# ============================================================================
+
+def table_handler(rows, calls):
+    """Build a handler serving keyset select pages over rows"""
+
+    def handler(request):
+        body = json.loads(request.content)
+        if body["method"] == "authorize":
+            return httpx.Response(200, json={"result": {"sid": "sid-1"}})
+        params = body["params"]
+        calls.append(params)
+        after = params.get("where", {}).get("gt", [None, -1])[1]
+        page = [row for row in rows if row[0] > after][: params["limit"]]
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": page})
+
+    return handler
+
+
+class TestSelectIterators:
+    """Test auto-paginating select iterators"""
+
+    ROWS = [[i, f"user{i}"] for i in range(1, 24)]
+
+    @pytest.mark.parametrize("prefetch", [True, False])
+    def test_sync_iter_select_pages_by_key(self, prefetch, connect_sync):
+        """All rows are yielded, each page continuing after the last key"""
+        calls = []
+        client = connect_sync(table_handler(self.ROWS, calls))
+
+        rows = list(client.iter_select(
+            "subscriber", ["id", "username"], page_size=10, prefetch=prefetch
+        ))
+
+        assert rows == self.ROWS
+        assert [call.get("where") for call in calls] == [
+            None, {"gt": ["id", 10]}, {"gt": ["id", 20]}
+        ]
+        assert all(call["order_by"] == "id" for call in calls)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("prefetch", [True, False])
+    async def test_async_aiter_select_pages_by_key(self, prefetch, connect_async):
+        """Async iteration yields every row across pages"""
+        calls = []
+        client = await connect_async(table_handler(self.ROWS, calls))
+
+        rows = [row async for row in client.aiter_select(
+            "subscriber", ["id", "username"], page_size=5, prefetch=prefetch
+        )]
+
+        assert rows == self.ROWS
+        assert len(calls) == 5
+
+    def test_key_must_be_selected(self, connect_sync):
+        """Paginating on a column that is not selected is rejected"""
+        from iptvportal.exceptions import ValidationError
+
+        client = connect_sync(table_handler(self.ROWS, []))
+
+        with pytest.raises(ValidationError):
+            next(client.iter_select("subscriber", ["username"]))
+
+
+# ============================================================================
+# Sharded Scan Tests
+# ============================================================================
+
+def sharded_handler(rows, calls, dict_bounds=False):
+    """Build a handler answering min/max and range-restricted keyset pages"""
+
+    def matches(row, where):
+        if not where:
+            return True
+        if "and" in where:
+            return all(matches(row, part) for part in where["and"])
+        (op, (_, value)), = where.items()
+        return {"gt": row[0] > value, "gte": row[0] >= value, "lt": row[0] < value}[op]
+
+    async def handler(request):
+        body = json.loads(request.content)
+        if body["method"] == "authorize":
+            return httpx.Response(200, json={"result": {"sid": "sid-1"}})
+        params = body["params"]
+        calls.append(params)
+        if params["data"][0] == {"min": "id"}:
+            result = [[rows[0][0], rows[-1][0]]] if rows else [[None, None]]
+            if dict_bounds:
+                result = [{"max": result[0][1], "min": result[0][0]}]
+        else:
+            await asyncio.sleep(0)
+            selected = [row for row in rows if matches(row, params.get("where"))]
+            result = selected[: params["limit"]]
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": result})
+
+    return handler
+
+
+class TestShardedScan:
+    """Test parallel range-sharded table scans"""
+
+    ROWS = [[i, f"mac{i}"] for i in range(1, 101) if i % 7]
+
+    @pytest.mark.asyncio
+    async def test_unordered_scan_returns_every_row(self, connect_async):
+        """Every row is yielded exactly once across shards"""
+        calls = []
+        client = await connect_async(sharded_handler(self.ROWS, calls))
+
+        rows = [row async for row in client.scan("terminal", ["id", "mac"], shards=4, page_size=8)]
+
+        assert sorted(rows) == self.ROWS
+        assert calls[0]["data"] == [{"min": "id"}, {"max": "id"}]
+
+    @pytest.mark.asyncio
+    async def test_ordered_scan_preserves_key_order(self, connect_async):
+        """Ordered scans merge shards in key order"""
+        client = await connect_async(sharded_handler(self.ROWS, []))
+
+        rows = [row async for row in client.scan(
+            "terminal", ["id", "mac"], shards=5, page_size=4, ordered=True
+        )]
+
+        assert rows == self.ROWS
+
+    @pytest.mark.asyncio
+    async def test_dict_bounds_read_by_name(self, connect_async):
+        """Bounds returned as a dict are read by key, whatever their order"""
+        client = await connect_async(sharded_handler(self.ROWS, [], dict_bounds=True))
+
+        rows = [row async for row in client.scan("terminal", ["id", "mac"], shards=4)]
+
+        assert sorted(rows) == self.ROWS
+
+    @pytest.mark.asyncio
+    async def test_empty_table_yields_nothing(self, connect_async):
+        """An empty key range ends the scan after the bounds query"""
+        client = await connect_async(sharded_handler([], []))
+
+        assert [row async for row in client.scan("terminal", ["id", "mac"])] == []
+
+
+# ============================================================================
+# Read Coalescing Tests
+# ============================================================================
+
+def slow_handler(calls, release):
+    """Build an async handler holding every select until release is set"""
+
+    async def handler(request):
+        body = json.loads(request.content)
+        if body["method"] == "authorize":
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": {"sid": "sid-1"}})
+        calls.append(body)
+        await release.wait()
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": len(calls)})
+
+    return handler
+
+
+class TestReadCoalescing:
+    """Test singleflight deduplication of identical reads"""
+
+    @pytest.mark.asyncio
+    async def test_identical_reads_share_one_call(self, settings, connect_async):
+        """Concurrent identical selects issue a single POST"""
+        settings.coalesce_reads = True
+        calls, release = [], asyncio.Event()
+        client = await connect_async(slow_handler(calls, release))
+        await client._auth.get_token()
+
+        select = {"jsonrpc": "2.0", "id": 1, "method": "select",
+                  "params": {"data": ["id"], "from": "tv_channel"}}
+        tasks = [asyncio.create_task(client.execute({**select, "id": i})) for i in range(200)]
+        other = asyncio.create_task(client.execute(
+            {**select, "params": {"data": ["id"], "from": "media"}}
+        ))
+        await asyncio.sleep(0.01)
+        tasks[0].cancel()
+        release.set()
+
+        results = await asyncio.gather(*tasks[1:], other)
+        assert sorted(body["params"]["from"] for body in calls) == ["media", "tv_channel"]
+        assert len(set(results[:-1])) == 1
+        assert client._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_write_splits_in_flight_read(self, settings, connect_async):
+        """Reads issued after a write do not join a read started before it"""
+        settings.coalesce_reads = True
+        calls, release = [], asyncio.Event()
+        client = await connect_async(slow_handler(calls, release))
+        await client._auth.get_token()
+
+        select = {"jsonrpc": "2.0", "id": 1, "method": "select",
+                  "params": {"data": ["id"], "from": "media"}}
+        before = asyncio.create_task(client.execute(select))
+        await asyncio.sleep(0.01)
+        client._invalidate_writes({"method": "delete", "params": {"from": "media"}})
+        after = asyncio.create_task(client.execute(select))
+        await asyncio.sleep(0.01)
+        release.set()
+
+        await asyncio.gather(before, after)
+        assert len(calls) == 2
+
+
+# ============================================================================
+# Prewarm Tests
+# ============================================================================
+
+def warmup_handler(calls):
+    """Build a handler recording methods, answering HEAD and authorize"""
+
+    def handler(request):
+        if request.method == "HEAD":
+            calls.append(f"HEAD {request.url.host}")
+            return httpx.Response(405)
+        body = json.loads(request.content)
+        calls.append(body["method"])
+        if body["method"] == "authorize":
+            return httpx.Response(200, json={"result": {"sid": "sid-1"}})
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": []})
+
+    return handler
+
+
+class TestPrewarm:
+    """Test opening connections and authorizing on connect"""
+
+    def test_sync_connect_prewarms(self, settings, monkeypatch):
+        """connect() authorizes and opens the remaining connections"""
+        settings.http2 = False
+        settings.prewarm_connections = 4
+        calls = []
+
+        class MockedTransport(HTTPTransport):
+            def __init__(self, settings):
+                super().__init__(settings)
+                self.client = httpx.Client(transport=httpx.MockTransport(warmup_handler(calls)))
+
+        monkeypatch.setattr("iptvportal.client.HTTPTransport", MockedTransport)
+        client = IPTVPortalClient(settings)
+        client.connect()
+
+        assert sorted(calls) == ["HEAD test.iptvportal.ru"] * 3 + ["authorize"]
+        client.execute(make_requests(1)[0])
+        assert calls.count("authorize") == 1
+
+    def test_sync_http2_prewarms_one_connection_per_endpoint(self, settings, monkeypatch):
+        """With HTTP/2 only replicas get a warm-up, as authorize opens the primary"""
+        settings.prewarm_connections = 4
+        settings.endpoints = ["replica.iptvportal.ru"]
+        calls = []
+
+        class MockedTransport(HTTPTransport):
+            def __init__(self, settings):
+                super().__init__(settings)
+                self.client = httpx.Client(transport=httpx.MockTransport(warmup_handler(calls)))
+
+        monkeypatch.setattr("iptvportal.client.HTTPTransport", MockedTransport)
+        IPTVPortalClient(settings).connect()
+
+        assert sorted(calls) == ["HEAD replica.iptvportal.ru", "authorize"]
+
+    @pytest.mark.asyncio
+    async def test_async_prewarm_ignores_failures(self, settings, connect_async):
+        """Warm-up failures do not fail the client"""
+        settings.http2 = False
+        settings.prewarm_connections = 3
+        calls = []
+
+        def handler(request):
+            calls.append(request.method)
+            raise httpx.ConnectError("refused")
+
+        client = await connect_async(handler)
+        await client._prewarm()
+
+        assert sorted(calls) == ["HEAD", "HEAD", "POST"]
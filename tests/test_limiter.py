@@ -0,0 +1,204 @@
+"""
+Unit tests for the adaptive concurrency limiter.
+
+Covers additive increase, multiplicative decrease on overload and latency
+growth, shared permits, and driving bounded_map with a limiter.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from iptvportal.exceptions import APIError, RetryExhaustedError
+from iptvportal.limiter import AdaptiveLimiter
+from iptvportal.scheduler import bounded_map
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the limiter clock with a manually advanced one"""
+    now = [100.0]
+    monkeypatch.setattr("iptvportal.limiter.time.monotonic", lambda: now[0])
+    return now
+
+
+def finish(limiter, clock, latency, error=None):
+    """Record a request that took latency seconds"""
+    started = clock[0]
+    clock[0] += latency
+    limiter.record(started, error)
+
+
+# ============================================================================
+# Limiter Tests
+# ============================================================================
+
+class TestAdaptiveLimiter:
+    """Test AIMD limit adjustment"""
+
+    def test_grows_additively_with_stable_latency(self, clock):
+        """Each full window of successes adds one permit"""
+        limiter = AdaptiveLimiter(initial=4, maximum=10)
+
+        for _ in range(4):
+            finish(limiter, clock, 0.1)
+        assert limiter.limit == 4
+        for _ in range(4):
+            finish(limiter, clock, 0.1)
+        assert limiter.limit == 5
+
+    def test_overload_halves_once_per_burst(self, clock):
+        """Overload errors from requests started before a cut do not cut again"""
+        limiter = AdaptiveLimiter(initial=40, maximum=40)
+        started = clock[0]
+        clock[0] += 1
+
+        limiter.record(started, RetryExhaustedError("5xx"))
+        limiter.record(started, APIError("boom", status_code=503))
+        assert limiter.limit == 20
+
+        finish(limiter, clock, 0.1, APIError("boom", status_code=502))
+        assert limiter.limit == 10
+        assert limiter.stats().decreases == 2
+
+    def test_client_errors_do_not_cut(self, clock):
+        """Errors unrelated to load leave the limit alone"""
+        limiter = AdaptiveLimiter(initial=8)
+
+        finish(limiter, clock, 0.1, APIError("bad request", status_code=400))
+        assert limiter.limit == 8
+
+    def test_latency_growth_cuts(self, clock):
+        """Latency well above the baseline counts as congestion"""
+        limiter = AdaptiveLimiter(initial=16, maximum=16, smoothing=1.0)
+
+        finish(limiter, clock, 0.1)
+        finish(limiter, clock, 0.5)
+        assert limiter.limit == 8
+
+    def test_bounds_are_respected(self, clock):
+        """The limit stays within minimum and maximum"""
+        limiter = AdaptiveLimiter(initial=2, minimum=2, maximum=3)
+
+        for _ in range(50):
+            finish(limiter, clock, 0.1)
+        assert limiter.limit == 3
+        for _ in range(5):
+            finish(limiter, clock, 0.1, RetryExhaustedError("down"))
+        assert limiter.limit == 2
+
+
+class TestPermits:
+    """Test the shared in-flight permit count"""
+
+    def test_permits_stop_at_limit(self):
+        """Permits run out at the limit and come back on release"""
+        limiter = AdaptiveLimiter(initial=2, maximum=2)
+
+        assert limiter.try_acquire()
+        assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+        limiter.release()
+        assert limiter.try_acquire()
+        assert limiter.stats().in_flight == 2
+
+    def test_threads_share_permits(self):
+        """Blocking acquire never lets more threads in than the limit"""
+        limiter = AdaptiveLimiter(initial=3, maximum=3)
+        lock = threading.Lock()
+        in_flight = peak = 0
+
+        def work():
+            nonlocal in_flight, peak
+            limiter.acquire()
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.005)
+            with lock:
+                in_flight -= 1
+            limiter.release()
+
+        threads = [threading.Thread(target=work) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak == 3
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_async_waiter_wakes_on_release(self):
+        """acquire_async waits for a permit released by another thread"""
+        limiter = AdaptiveLimiter(initial=1, maximum=1)
+        limiter.acquire()
+
+        waiter = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        threading.Timer(0.01, limiter.release).start()
+        await asyncio.wait_for(waiter, 1)
+        assert limiter.in_flight == 1
+
+
+class TestBoundedMapWithLimiter:
+    """Test adaptive concurrency in bounded_map"""
+
+    @pytest.mark.asyncio
+    async def test_in_flight_follows_limit(self):
+        """Calls in flight never exceed the limit and the limit adapts"""
+        limiter = AdaptiveLimiter(initial=2, maximum=8)
+        in_flight = peak = 0
+
+        async def work(item):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            if item % 25 == 24:
+                raise RetryExhaustedError("overloaded")
+            return item
+
+        results = [
+            result async for _, result in bounded_map(
+                work, range(100), limiter, return_exceptions=True
+            )
+        ]
+
+        assert len(results) == 100
+        assert peak <= 8
+        stats = limiter.stats()
+        assert stats.increases > 0
+        assert stats.decreases > 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_maps_share_limit(self):
+        """Two fan-outs using one limiter stay under its limit together"""
+        limiter = AdaptiveLimiter(initial=4, maximum=4)
+        in_flight = peak = 0
+
+        async def work(item):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return item
+
+        async def fan_out():
+            return sorted([result async for _, result in bounded_map(work, range(40), limiter)])
+
+        first, second = await asyncio.gather(fan_out(), fan_out())
+
+        assert first == second == list(range(40))
+        assert peak == 4
+        assert limiter.in_flight == 0
@@ -0,0 +1,234 @@
+"""
+Unit tests for the JSONSQL query builder.
+
+Covers Q object composition, lookup compilation, the statement
+builders and prepared queries.
+"""
+
+import json
+
+import pytest
+
+from iptvportal.exceptions import ValidationError
+from iptvportal.query import (
+    DeleteQuery,
+    InsertQuery,
+    Param,
+    PreparedQuery,
+    Q,
+    QueryBuilder,
+    QueryFactory,
+    UpdateQuery,
+    compile_where,
+)
+from iptvportal.query.builder import Statement
+from iptvportal.transport.codec import StdlibCodec
+
+
+# ============================================================================
+# Q Object Tests
+# ============================================================================
+
+class TestQCompilation:
+    """Test compilation of Q objects to JSONSQL conditions"""
+
+    def test_exact_is_default_lookup(self):
+        """A bare keyword compiles to equality"""
+        assert compile_where(Q(id=5)) == {"eq": ["id", 5]}
+
+    def test_multiple_lookups_are_anded(self):
+        """Several keywords in one Q are combined with AND"""
+        assert compile_where(Q(id__gt=5, disabled=False)) == {
+            "and": [{"eq": ["disabled", False]}, {"gt": ["id", 5]}]
+        }
+
+    def test_or_and_not(self):
+        """Operators compose into nested JSONSQL"""
+        condition = Q(username__like="test%") | ~Q(id__in=[1, 2])
+        assert compile_where(condition) == {
+            "or": [{"like": ["username", "test%"]}, {"not": {"in": ["id", [1, 2]]}}]
+        }
+
+    @pytest.mark.parametrize("lookup, value, expected", [
+        ("contains", "abc", {"like": ["name", "%abc%"]}),
+        ("istartswith", "abc", {"ilike": ["name", "abc%"]}),
+        ("endswith", "abc", {"like": ["name", "%abc"]}),
+        ("isnull", True, {"is": ["name", None]}),
+        ("isnull", False, {"is_not": ["name", None]}),
+        ("between", (1, 9), {"and": [{"gte": ["name", 1]}, {"lte": ["name", 9]}]}),
+        ("ne", 3, {"neq": ["name", 3]}),
+    ])
+    def test_lookups(self, lookup, value, expected):
+        """Django-style lookups map to JSONSQL operators"""
+        assert compile_where(Q(**{f"name__{lookup}": value})) == expected
+
+    def test_unknown_lookup_rejected(self):
+        """Unsupported lookups raise ValidationError"""
+        with pytest.raises(ValidationError, match="regex"):
+            compile_where(Q(name__regex=".*"))
+
+    def test_raw_dict_passes_through(self):
+        """Hand-written JSONSQL conditions are used as is"""
+        assert compile_where({"eq": ["id", 1]}) == {"eq": ["id", 1]}
+
+    def test_pattern_lookups_escape_wildcards(self):
+        """% and _ in a contains value match literally"""
+        assert compile_where(Q(name__contains="50%_off\\")) == {
+            "like": ["name", "%50\\%\\_off\\\\%"]
+        }
+
+    @pytest.mark.parametrize("value", [Param("range"), None, 5, (1, 2, 3)])
+    def test_between_requires_pair(self, value):
+        """between rejects anything but a (low, high) pair"""
+        with pytest.raises(ValidationError, match="between"):
+            compile_where(Q(id__between=value))
+
+
+# ============================================================================
+# Statement Builder Tests
+# ============================================================================
+
+class TestStatements:
+    """Test the fluent statement builders"""
+
+    def test_select(self):
+        """Select compiles columns, where, ordering and paging"""
+        params = (
+            QueryBuilder("subscriber")
+            .select("id", "username")
+            .where(Q(disabled=False), id__gt=100)
+            .order_by("-id")
+            .limit(50)
+            .offset(10)
+            .build()
+        )
+        assert params == {
+            "data": ["id", "username"],
+            "from": "subscriber",
+            "where": {"and": [{"eq": ["disabled", False]}, {"gt": ["id", 100]}]},
+            "order_by": {"desc": "id"},
+            "limit": 50,
+            "offset": 10,
+        }
+
+    def test_insert_from_dicts(self):
+        """Insert takes columns from the first dict row"""
+        params = InsertQuery("subscriber").values(
+            {"username": "u1", "password": "p1"},
+            {"password": "p2", "username": "u2"},
+        ).returning("id").build()
+        assert params == {
+            "into": "subscriber",
+            "columns": ["username", "password"],
+            "values": [["u1", "p1"], ["u2", "p2"]],
+            "returning": "id",
+        }
+
+    def test_insert_rejects_mismatched_dict_rows(self):
+        """Dict rows with missing or extra keys are rejected, not NULL-filled"""
+        with pytest.raises(ValidationError):
+            InsertQuery("subscriber").values({"a": 1, "b": 2}, {"a": 3, "c": 9})
+
+    def test_insert_on_conflict(self):
+        """Upserts update the non-conflicting columns by default"""
+        query = InsertQuery("subscriber").values({"id": 1, "username": "u1"})
+
+        assert query.on_conflict("id").build()["on_conflict"] == {
+            "columns": ["id"], "update": ["username"],
+        }
+        assert query.on_conflict("id", update=[]).build()["on_conflict"]["update"] == []
+
+    def test_update_and_delete(self):
+        """Update and delete compile their where clauses"""
+        assert UpdateQuery("subscriber").set(disabled=True).where(id=42).build() == {
+            "table": "subscriber", "set": {"disabled": True}, "where": {"eq": ["id", 42]},
+        }
+        assert DeleteQuery("terminal").where(Q(id__in=[1, 2])).build() == {
+            "from": "terminal", "where": {"in": ["id", [1, 2]]},
+        }
+
+    def test_empty_conditions_add_no_where(self):
+        """Only empty Q objects leave the where clause out"""
+        params = QueryBuilder("media").select("id").where(Q(), Q()).build()
+
+        assert "where" not in params
+
+    def test_select_requires_columns(self):
+        """A select without columns is rejected"""
+        with pytest.raises(ValidationError):
+            QueryBuilder("media").select().build()
+
+    def test_statement_base_is_abstract(self):
+        """Statement subclasses must implement build()"""
+        with pytest.raises(TypeError):
+            Statement("media")
+
+    def test_factory_builds_requests_with_fresh_ids(self):
+        """client.query builds complete JSONRPC requests"""
+        factory = QueryFactory()
+        first = factory.select(data=["id", "title"], from_="media", limit=10)
+        second = factory.delete(from_="media", where=Q(id=1))
+
+        assert first == {
+            "jsonrpc": "2.0", "id": 1, "method": "select",
+            "params": {"data": ["id", "title"], "from": "media", "limit": 10},
+        }
+        assert second["id"] == 2
+        assert second["method"] == "delete"
+
+
+# ============================================================================
+# Prepared Query Tests
+# ============================================================================
+
+class TestPreparedQuery:
+    """Test pre-serialized requests with bound parameters"""
+
+    def test_bind_matches_plain_encoding(self):
+        """A bound query decodes to the request with values substituted"""
+        request = QueryFactory().select(
+            data=["id", "username"],
+            from_="subscriber",
+            where=Q(id__in=Param("ids")) & Q(username=Param("name")),
+            limit=Param("limit"),
+        )
+        prepared = PreparedQuery(request, StdlibCodec())
+
+        body = json.loads(prepared.bind(ids=[1, 2], name='a "quoted" name', limit=5))
+
+        assert prepared.params == {"ids", "name", "limit"}
+        assert body["params"] == {
+            "data": ["id", "username"],
+            "from": "subscriber",
+            "where": {"and": [
+                {"in": ["id", [1, 2]]}, {"eq": ["username", 'a "quoted" name']},
+            ]},
+            "limit": 5,
+        }
+
+    def test_each_bind_gets_fresh_id(self):
+        """Request ids increase with every execution"""
+        prepared = PreparedQuery(
+            QueryFactory().select(data=["id"], from_="media", where=Q(id=Param("id"))),
+            StdlibCodec(),
+        )
+
+        ids = [json.loads(prepared.bind(id=i))["id"] for i in range(3)]
+        assert ids == [1, 2, 3]
+
+    def test_parameter_mismatch_rejected(self):
+        """Missing or unknown parameters raise ValidationError"""
+        prepared = PreparedQuery(
+            QueryFactory().delete(from_="media", where=Q(id=Param("id"))), StdlibCodec()
+        )
+
+        with pytest.raises(ValidationError):
+            prepared.bind()
+        with pytest.raises(ValidationError):
+            prepared.bind(id=1, title="x")
+
+    def test_param_in_pattern_lookup_rejected(self):
+        """Patterns are rewritten at compile time and cannot be deferred"""
+        with pytest.raises(ValidationError):
+            compile_where(Q(username__contains=Param("name")))
+
@@ -0,0 +1,112 @@
+"""
+Unit tests for the cross-process session cache.
+
+Covers the on-disk store itself and the guarantee that processes starting
+at the same time share a single authorize call.
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import httpx
+
+from iptvportal.auth import AuthManager
+from iptvportal.config import IPTVPortalSettings
+from iptvportal.session_cache import SessionCache
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+def make_settings(cache_dir):
+    """Build settings with the session cache enabled in cache_dir"""
+    return IPTVPortalSettings(
+        domain="test.iptvportal.ru",
+        username="testuser",
+        password="testpass",
+        session_cache=True,
+        session_cache_dir=cache_dir,
+    )
+
+
+def authorize_in_process(cache_dir, counter_path):
+    """Authenticate from a fresh process, recording each authorize call"""
+
+    def handler(request):
+        with open(counter_path, "a") as f:
+            f.write("authorize\n")
+        time.sleep(0.2)
+        return httpx.Response(200, json={"result": {"sid": f"sid-{time.time_ns()}"}})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    return AuthManager(make_settings(cache_dir), client).get_token()
+
+
+# ============================================================================
+# Session Cache Tests
+# ============================================================================
+
+class TestSessionCache:
+    """Test the on-disk session store"""
+
+    def test_store_and_load_round_trip(self, tmp_path):
+        """A stored session is loaded back until it expires"""
+        cache = SessionCache(tmp_path, "test.iptvportal.ru", "testuser")
+        cache.store("sid-1", time.time() + 60)
+
+        assert cache.load()[0] == "sid-1"
+        assert cache.path.stat().st_mode & 0o777 == 0o600
+
+        cache.store("sid-2", time.time() - 1)
+        assert cache.load() is None
+
+    def test_corrupted_file_is_ignored(self, tmp_path):
+        """An unreadable cache file behaves like an empty cache"""
+        cache = SessionCache(tmp_path, "test.iptvportal.ru", "testuser")
+        cache.path.write_text("invalid json content {{{")
+
+        assert cache.load() is None
+
+    def test_clear_keeps_newer_session(self, tmp_path):
+        """Clearing a stale token leaves a session renewed elsewhere intact"""
+        cache = SessionCache(tmp_path, "test.iptvportal.ru", "testuser")
+        cache.store("sid-new", time.time() + 60)
+
+        cache.clear("sid-old")
+        assert cache.load()[0] == "sid-new"
+
+        cache.clear("sid-new")
+        assert cache.load() is None
+
+    def test_auth_manager_reuses_cached_session(self, tmp_path):
+        """A second manager picks up the session without authorizing"""
+        calls = 0
+
+        def handler(request):
+            nonlocal calls
+            calls += 1
+            return httpx.Response(200, json={"result": {"sid": "sid-shared"}})
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        first = AuthManager(make_settings(tmp_path), client).get_token()
+        second = AuthManager(make_settings(tmp_path), client).get_token()
+
+        assert first == second == "sid-shared"
+        assert calls == 1
+
+    def test_processes_share_one_authorize(self, tmp_path):
+        """Concurrently starting processes issue a single authorize call"""
+        counter = tmp_path / "authorize.log"
+        context = multiprocessing.get_context("spawn")
+
+        with ProcessPoolExecutor(max_workers=4, mp_context=context) as pool:
+            futures = [
+                pool.submit(authorize_in_process, tmp_path, counter) for _ in range(4)
+            ]
+            tokens = {future.result() for future in futures}
+
+        assert len(tokens) == 1
+        assert Path(counter).read_text().count("authorize") == 1
@@ -0,0 +1,648 @@
+"""
+Unit tests for the HTTP transport layer.
+
+Requests are served by httpx.MockTransport handlers, so no network access
+is needed.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from iptvportal.config import IPTVPortalSettings
+from iptvportal.exceptions import APIError, CircuitOpenError, RetryExhaustedError
+from iptvportal.transport.circuit import CircuitBreaker, circuit_states
+from iptvportal.transport.codec import StdlibCodec, get_codec
+from iptvportal.transport.endpoints import Endpoint, EndpointPool
+from iptvportal.transport.hedge import MIN_SAMPLES, Hedger
+from iptvportal.transport.http import AsyncHTTPTransport, HTTPTransport
+from iptvportal.transport.pool import PoolMonitor, http_timeout, pool_limits
+from iptvportal.transport.ratelimit import RateLimiter, TokenBucket
+from iptvportal.transport.retry import RetryPolicy, retry_after
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+@pytest.fixture
+def settings():
+    """Provide settings pointing at a fake portal"""
+    return IPTVPortalSettings(
+        domain="test.iptvportal.ru",
+        username="testuser",
+        password="testpass",
+        max_retries=3,
+        retry_backoff_factor=0,
+    )
+
+
+def make_transport(settings, handler):
+    """Build a sync transport routed to handler"""
+    transport = HTTPTransport(settings)
+    transport.client = httpx.Client(transport=httpx.MockTransport(handler))
+    return transport
+
+
+def select_request():
+    """Build a minimal select request"""
+    return {"jsonrpc": "2.0", "id": 1, "method": "select", "params": {"from": "media"}}
+
+
+# ============================================================================
+# Codec Tests
+# ============================================================================
+
+class TestCodecs:
+    """Test pluggable JSON codecs"""
+
+    @pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+    def test_round_trip(self, name):
+        """Every installed codec round-trips a JSON-RPC payload"""
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            pytest.skip(f"{name} not installed")
+
+        payload = {"jsonrpc": "2.0", "id": 1, "result": [[1, "Название", None, 1.5, True]]}
+        assert codec.decode(codec.encode(payload)) == payload
+
+    def test_unknown_codec_rejected(self):
+        """Unknown codec names fail loudly"""
+        with pytest.raises(ValueError, match="Unknown JSON codec"):
+            get_codec("yaml")
+
+    def test_transport_sends_pre_encoded_body(self, settings):
+        """The body is encoded once by the codec and decoded from raw bytes"""
+        settings.json_codec = "json"
+        seen = []
+
+        def handler(request):
+            seen.append((request.headers["content-type"], request.content))
+            return httpx.Response(200, content=b'{"jsonrpc":"2.0","id":1,"result":[1,2]}')
+
+        transport = make_transport(settings, handler)
+
+        assert transport.request(select_request()) == [1, 2]
+        assert isinstance(transport.codec, StdlibCodec)
+        assert seen == [("application/json", StdlibCodec().encode(select_request()))]
+
+
+# ============================================================================
+# Rate Limit Tests
+# ============================================================================
+
+def ok_handler(request):
+    """Answer every request successfully"""
+    return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": []})
+
+
+class TestRateLimit:
+    """Test client-side token-bucket rate limiting"""
+
+    def test_bucket_reservations_queue_up(self, monkeypatch):
+        """After the burst, each reservation waits one more token interval"""
+        monkeypatch.setattr("iptvportal.transport.ratelimit.time.monotonic", lambda: 10.0)
+        bucket = TokenBucket(rate=10, burst=2)
+
+        waits = [bucket.reserve() for _ in range(4)]
+        assert waits == pytest.approx([0, 0, 0.1, 0.2])
+
+    def test_method_and_table_buckets(self):
+        """Requests draw from the buckets of their method and tables"""
+        limiter = RateLimiter(methods={"update": 1}, tables={"terminal": 2})
+
+        update = {"method": "update", "params": {"table": "terminal", "set": {}}}
+        select = {"method": "select", "params": {"from": "media"}}
+        assert len(limiter.buckets(update)) == 2
+        assert limiter.buckets(select) == []
+        assert limiter.buckets([select, update]) == limiter.buckets(update)
+
+    def test_clients_of_a_domain_share_buckets(self, settings):
+        """Limiters are shared per domain and configuration"""
+        settings.rate_limit = 5
+
+        assert RateLimiter.from_settings(settings) is RateLimiter.from_settings(settings)
+        settings.rate_limit = None
+        assert RateLimiter.from_settings(settings) is None
+
+    def test_endpoints_have_their_own_buckets(self, settings):
+        """Replicas are limited separately from the primary"""
+        settings.rate_limit = 5
+        settings.endpoints = ["replica.iptvportal.ru"]
+        primary, replica = EndpointPool.from_settings(settings).endpoints
+
+        assert primary.rate_limiter is RateLimiter.from_settings(settings)
+        assert replica.rate_limiter is RateLimiter.from_settings(settings, replica.domain)
+        assert replica.rate_limiter is not primary.rate_limiter
+
+    def test_sync_transport_paces_requests(self, settings):
+        """Sustained throughput stays at the configured rate"""
+        settings.rate_limit = 50
+        settings.rate_limit_burst = 1
+        transport = make_transport(settings, ok_handler)
+
+        started = time.monotonic()
+        for _ in range(6):
+            transport.request(select_request())
+        assert time.monotonic() - started >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_async_transport_paces_concurrent_requests(self, settings):
+        """Concurrent requests are spread out by the bucket"""
+        settings.rate_limit = 100
+        settings.rate_limit_burst = 2
+        transport = AsyncHTTPTransport(settings)
+        transport.client = httpx.AsyncClient(transport=httpx.MockTransport(ok_handler))
+
+        started = time.monotonic()
+        await asyncio.gather(*(transport.request(select_request()) for _ in range(12)))
+        assert time.monotonic() - started >= 0.09
+
+    def test_encoded_bodies_use_source_request_buckets(self, settings):
+        """Table limits apply to pre-encoded bodies sent with their source"""
+        settings.domain = "encoded.iptvportal.ru"
+        settings.rate_limit_tables = {"media": 20}
+        transport = make_transport(settings, ok_handler)
+        request = select_request()
+        body = transport.codec.encode(request)
+
+        started = time.monotonic()
+        for _ in range(25):
+            transport.request(body)
+        assert time.monotonic() - started < 0.1
+
+        started = time.monotonic()
+        for _ in range(23):
+            transport.request(body, source=request)
+        assert time.monotonic() - started >= 0.1
+
+
+# ============================================================================
+# Retry Policy Tests
+# ============================================================================
+
+def failing_handler(statuses, headers=None):
+    """Build a handler answering with the given statuses, then success"""
+    statuses = iter(statuses)
+
+    def handler(request):
+        status = next(statuses, 200)
+        if status != 200:
+            return httpx.Response(status, headers=headers or {})
+        return ok_handler(request)
+
+    return handler
+
+
+class TestRetryPolicy:
+    """Test jittered backoff, Retry-After and retry budgets"""
+
+    def test_backoff_strategies(self):
+        """Jittered backoff stays within its bounds and the cap"""
+        plain = RetryPolicy(backoff_factor=1, max_backoff=5, jitter="none")
+        full = RetryPolicy(backoff_factor=1, max_backoff=5, jitter="full")
+        decorrelated = RetryPolicy(backoff_factor=1, max_backoff=5, jitter="decorrelated")
+
+        assert [plain.backoff(attempt, 0) for attempt in range(4)] == [1, 2, 4, 5]
+        assert all(0 <= full.backoff(3, 0) <= 5 for _ in range(100))
+        assert all(1 <= decorrelated.backoff(0, 1.5) <= 4.5 for _ in range(100))
+
+    def test_retry_after_formats(self):
+        """Retry-After is accepted in seconds and as an HTTP date"""
+        assert retry_after(httpx.Response(429, headers={"Retry-After": "7"})) == 7
+        past = httpx.Response(503, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        assert retry_after(past) == 0
+        assert retry_after(httpx.Response(503)) is None
+
+    def test_429_is_retried_honouring_retry_after(self, settings, monkeypatch):
+        """Throttled requests wait for Retry-After and then succeed"""
+        sleeps = []
+        monkeypatch.setattr("iptvportal.transport.http.time.sleep", sleeps.append)
+        transport = make_transport(
+            settings, failing_handler([429, 503], headers={"Retry-After": "2"})
+        )
+
+        assert transport.request(select_request()) == []
+        assert sleeps == [2, 2]
+
+    def test_retry_after_beyond_max_backoff_gives_up(self, settings, monkeypatch):
+        """A Retry-After longer than max_backoff is not waited for"""
+        sleeps = []
+        monkeypatch.setattr("iptvportal.transport.http.time.sleep", sleeps.append)
+        settings.retry_max_backoff = 10
+        transport = make_transport(
+            settings, failing_handler([503] * 3, headers={"Retry-After": "60"})
+        )
+
+        with pytest.raises(RetryExhaustedError, match="after 1 attempts"):
+            transport.request(select_request())
+        assert sleeps == []
+
+    def test_other_4xx_fail_immediately(self, settings):
+        """Client errors are not retried"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(400)
+
+        with pytest.raises(APIError):
+            make_transport(settings, handler).request(select_request())
+        assert len(calls) == 1
+
+    def test_deadline_stops_retries(self, settings, monkeypatch):
+        """No retry starts once it would overrun the deadline"""
+        monkeypatch.setattr("iptvportal.transport.http.time.sleep", lambda delay: None)
+        settings.retry_deadline = 1
+        transport = make_transport(
+            settings, failing_handler([503] * 3, headers={"Retry-After": "5"})
+        )
+
+        with pytest.raises(RetryExhaustedError, match="after 1 attempts"):
+            transport.request(select_request())
+
+
+# ============================================================================
+# Circuit Breaker Tests
+# ============================================================================
+
+def fail(breaker, error=None):
+    """Run one guarded attempt raising error, or succeeding without one"""
+    try:
+        with breaker.attempt():
+            if error is not None:
+                raise error
+    except type(error) if error is not None else ():
+        pass
+
+
+def server_error():
+    """Build the exception raised for a 503 response"""
+    request = httpx.Request("POST", "https://test.iptvportal.ru/api")
+    return httpx.HTTPStatusError("503", request=request, response=httpx.Response(503))
+
+
+class TestCircuitBreaker:
+    """Test tripping, fast failure and half-open probing"""
+
+    def test_opens_on_consecutive_failures_and_probes(self, monkeypatch):
+        """The breaker opens, fails fast, then lets one trial through"""
+        now = [0.0]
+        monkeypatch.setattr("iptvportal.transport.circuit.time.monotonic", lambda: now[0])
+        breaker = CircuitBreaker("portal", failure_threshold=3, reset_timeout=10)
+
+        for _ in range(3):
+            fail(breaker, httpx.ConnectError("down"))
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError) as info:
+            fail(breaker)
+        assert info.value.retry_after == 10
+
+        now[0] = 10
+        with breaker.attempt():
+            assert breaker.state == "half_open"
+            with pytest.raises(CircuitOpenError):
+                fail(breaker)
+        assert breaker.state == "closed"
+
+    def test_failed_trial_reopens(self, monkeypatch):
+        """A failing trial request opens the breaker again"""
+        now = [0.0]
+        monkeypatch.setattr("iptvportal.transport.circuit.time.monotonic", lambda: now[0])
+        breaker = CircuitBreaker("portal", failure_threshold=1, reset_timeout=5)
+
+        fail(breaker, server_error())
+        now[0] = 5
+        fail(breaker, server_error())
+        assert breaker.snapshot().state == "open"
+        assert breaker.snapshot().opened == 2
+
+    def test_opens_on_error_rate(self):
+        """Interleaved failures trip the breaker through the error rate"""
+        breaker = CircuitBreaker("portal", failure_threshold=100, error_rate=0.5, window=10)
+
+        for attempt in range(10):
+            fail(breaker, server_error() if attempt % 2 else None)
+        assert breaker.state == "open"
+
+    def test_client_errors_keep_circuit_closed(self):
+        """4xx responses show the portal is up"""
+        breaker = CircuitBreaker("portal", failure_threshold=1)
+        request = httpx.Request("POST", "https://test.iptvportal.ru/api")
+
+        fail(breaker, httpx.HTTPStatusError("400", request=request, response=httpx.Response(400)))
+        assert breaker.state == "closed"
+
+    def test_transport_fails_fast(self, settings, monkeypatch):
+        """Once open, requests are rejected without reaching the portal"""
+        monkeypatch.setattr("iptvportal.transport.http.time.sleep", lambda delay: None)
+        settings.domain = "outage.iptvportal.ru"
+        settings.circuit_breaker = True
+        settings.circuit_failure_threshold = 3
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        transport = make_transport(settings, handler)
+        with pytest.raises(RetryExhaustedError):
+            transport.request(select_request())
+        with pytest.raises(CircuitOpenError):
+            transport.request(select_request())
+
+        assert len(calls) == 3
+        assert circuit_states()["outage.iptvportal.ru"].state == "open"
+
+
+# ============================================================================
+# Hedged Read Tests
+# ============================================================================
+
+def primed_hedger(latency=0.01, **options):
+    """Build a hedger with enough samples and budget to hedge"""
+    hedger = Hedger(**options)
+    for _ in range(MIN_SAMPLES):
+        hedger.record(latency)
+    hedger._tokens = 1
+    return hedger
+
+
+class TestHedging:
+    """Test hedged reads in the async transport"""
+
+    def test_no_hedge_without_samples(self):
+        """Reads are not hedged until enough latencies are known"""
+        hedger = Hedger()
+        assert hedger.delay() is None
+
+    def test_delay_is_latency_percentile(self):
+        """The hedge delay is the configured percentile of recent latencies"""
+        hedger = Hedger(percentile=0.9, min_delay=0.05)
+        for latency in range(1, 101):
+            hedger.record(latency / 1000)
+        assert hedger.delay() == 0.09
+
+        hedger = Hedger(percentile=0.5, min_delay=0.05)
+        for _ in range(MIN_SAMPLES):
+            hedger.record(0.001)
+        assert hedger.delay() == 0.05
+
+    def test_budget_caps_hedges(self):
+        """Every read earns only a fraction of a hedge"""
+        hedger = Hedger(budget=0.25)
+        hedged = 0
+        for _ in range(100):
+            hedger.delay()
+            hedged += hedger.try_hedge()
+        assert hedged == 25
+
+    @pytest.mark.asyncio
+    async def test_slow_read_is_hedged_and_loser_cancelled(self, settings):
+        """The hedge answers first and the stuck request is cancelled"""
+        settings.hedge_reads = True
+        calls = []
+        cancelled = []
+
+        async def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(request)
+                    raise
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": len(calls)})
+
+        transport = AsyncHTTPTransport(settings)
+        transport.client = transport.hedge_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+        transport.hedger = primed_hedger()
+
+        started = time.monotonic()
+        assert await transport.request(select_request()) == 2
+        assert time.monotonic() - started < 1
+        assert len(cancelled) == 1
+        assert transport.hedger.hedged == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_hedge_waits_for_primary(self, settings):
+        """A hedge that fails does not fail the read"""
+        settings.hedge_reads = True
+        settings.max_retries = 1
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                await asyncio.sleep(0.1)
+                return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": "primary"})
+            return httpx.Response(500)
+
+        transport = AsyncHTTPTransport(settings)
+        transport.client = transport.hedge_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+        transport.hedger = primed_hedger()
+
+        assert await transport.request(select_request()) == "primary"
+
+    @pytest.mark.asyncio
+    async def test_writes_are_not_hedged(self, settings):
+        """Only idempotent reads are duplicated"""
+        settings.hedge_reads = True
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": []})
+
+        transport = AsyncHTTPTransport(settings)
+        transport.client = transport.hedge_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+        transport.hedger = primed_hedger()
+
+        await transport.request({"jsonrpc": "2.0", "id": 1, "method": "update",
+                                 "params": {"table": "media", "set": {"name": "x"}}})
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_http2_hedges_use_their_own_client(self, settings):
+        """Over HTTP/2 hedges are not multiplexed with the stuck request"""
+        settings.hedge_reads = True
+        settings.http2 = True
+        calls = []
+
+        async def handler(request):
+            calls.append("main")
+            await asyncio.sleep(10)
+
+        async def hedge_handler(request):
+            calls.append("hedge")
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": "hedge"})
+
+        transport = AsyncHTTPTransport(settings)
+        assert transport.hedge_client is not None
+        transport.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        transport.hedge_client = httpx.AsyncClient(transport=httpx.MockTransport(hedge_handler))
+        transport.hedger = primed_hedger()
+
+        assert await transport.request(select_request()) == "hedge"
+        assert calls == ["main", "hedge"]
+        await transport.close()
+
+        settings.http2 = False
+        assert AsyncHTTPTransport(settings).hedge_client is None
+
+
+# ============================================================================
+# Endpoint Pool Tests
+# ============================================================================
+
+def endpoint_pool(balancing="least_outstanding"):
+    """Build a pool of a primary and two replicas"""
+    return EndpointPool([Endpoint("primary"), Endpoint("replica-1"), Endpoint("replica-2")],
+                        balancing, cooldown=10)
+
+
+class TestEndpointPool:
+    """Test endpoint balancing and health tracking"""
+
+    def test_idle_pool_prefers_primary(self):
+        """Ties go to the endpoint listed first"""
+        assert endpoint_pool().select().domain == "primary"
+
+    def test_least_outstanding(self):
+        """Requests go to the endpoint with the fewest in flight"""
+        pool = endpoint_pool()
+        with pool.track(pool.get("primary")):
+            with pool.track(pool.get("replica-1")):
+                assert pool.select().domain == "replica-2"
+            assert pool.select().domain != "primary"
+
+    def test_ewma_prefers_fast_endpoint(self):
+        """EWMA balancing weighs latency by requests in flight"""
+        pool = endpoint_pool("ewma")
+        pool.get("primary").latency = 0.5
+        pool.get("replica-1").latency = 0.1
+        pool.get("replica-2").latency = 0.3
+        assert pool.select().domain == "replica-1"
+
+        pool.get("replica-1").outstanding = 3
+        assert pool.select().domain == "replica-2"
+
+    def test_outage_takes_endpoint_out_of_rotation(self, monkeypatch):
+        """A failed endpoint is skipped until its cooldown has passed"""
+        now = [0.0]
+        monkeypatch.setattr("iptvportal.transport.endpoints.time.monotonic", lambda: now[0])
+        pool = endpoint_pool()
+        primary = pool.get("primary")
+
+        with pytest.raises(httpx.ConnectError):
+            with pool.track(primary):
+                raise httpx.ConnectError("refused")
+        assert pool.select().domain == "replica-1"
+        assert pool.can_fail_over(primary)
+        assert pool.failover([pool.get("replica-1"), pool.get("replica-2")]) is None
+
+        now[0] = 10
+        assert pool.select().domain == "primary"
+
+    def test_stats(self):
+        """Stats report load and health per endpoint"""
+        pool = endpoint_pool()
+        with pool.track(pool.get("replica-1")):
+            stats = {entry.domain: entry for entry in pool.stats()}
+        assert stats["replica-1"].outstanding == 1
+        assert all(entry.healthy for entry in stats.values())
+
+
+# ============================================================================
+# Connection Pool Tests
+# ============================================================================
+
+class TestConnectionPool:
+    """Test pool configuration and occupancy statistics"""
+
+    def test_limits_and_timeouts_from_settings(self, settings):
+        """Pool sizing and each timeout come from settings"""
+        settings.pool_max_connections = 500
+        settings.pool_max_keepalive = 200
+        settings.pool_keepalive_expiry = 30
+        settings.connect_timeout = 2
+        settings.pool_timeout = 10
+
+        limits = pool_limits(settings)
+        timeout = http_timeout(settings)
+
+        assert (limits.max_connections, limits.max_keepalive_connections) == (500, 200)
+        assert limits.keepalive_expiry == 30
+        assert (timeout.connect, timeout.read, timeout.write, timeout.pool) == (2, 30, 30, 10)
+
+    def test_settings_from_environment(self, monkeypatch):
+        """Pool settings can be given as environment variables"""
+        monkeypatch.setenv("IPTVPORTAL_CLIENT__POOL_MAX_CONNECTIONS", "500")
+        monkeypatch.setenv("IPTVPORTAL_CLIENT__READ_TIMEOUT", "60")
+        settings = IPTVPortalSettings(domain="test.iptvportal.ru", username="u", password="p")
+
+        assert settings.pool_max_connections == 500
+        assert http_timeout(settings).read == 60
+
+    def test_wait_is_measured_until_connection_acquired(self, monkeypatch):
+        """Trace events give the wait for a connection and new connections"""
+        now = [0.0]
+        monkeypatch.setattr("iptvportal.transport.pool.time.monotonic", lambda: now[0])
+        monitor = PoolMonitor()
+
+        with monitor.track() as extensions:
+            now[0] = 0.25
+            extensions["trace"]("connection.connect_tcp.started", {})
+            now[0] = 0.5
+            extensions["trace"]("http11.send_request_headers.started", {})
+            assert monitor.stats().in_flight == 1
+        with monitor.track() as extensions:
+            extensions["trace"]("http2.send_request_headers.started", {})
+
+        stats = monitor.stats()
+        assert (stats.requests, stats.in_flight, stats.peak_in_flight) == (2, 0, 1)
+        assert stats.connections_opened == 1
+        assert stats.max_wait == 0.25
+        assert stats.mean_wait == 0.125
+
+    def test_transport_counts_pool_timeouts(self, settings):
+        """Requests failing to get a connection in time are counted"""
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            if len(attempts) == 1:
+                raise httpx.PoolTimeout("pool exhausted")
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": []})
+
+        transport = make_transport(settings, handler)
+        transport.request(select_request())
+
+        stats = transport.pool_stats()
+        assert (stats.requests, stats.pool_timeouts, stats.in_flight) == (2, 1, 0)
+
+    @pytest.mark.asyncio
+    async def test_async_trace_callback(self, settings):
+        """The async transport sends a coroutine trace callback"""
+        seen = []
+
+        async def handler(request):
+            seen.append(request.extensions["trace"])
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": []})
+
+        transport = AsyncHTTPTransport(settings)
+        transport.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        await transport.request(select_request())
+
+        assert asyncio.iscoroutinefunction(seen[0])
+        assert transport.pool_stats().requests == 1
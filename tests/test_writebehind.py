@@ -0,0 +1,143 @@
+"""
+Unit tests for the write-behind update buffer.
+
+Covers per-row coalescing, size and time triggered flushes, flush on
+close, backpressure and deferred error reporting.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from iptvportal import WriteBehindBuffer
+from iptvportal.exceptions import APIError, ValidationError
+
+
+# ============================================================================
+# Test Fixtures
+# ============================================================================
+
+def update_handler(batches, fail=False):
+    """Build a handler recording the update batches it receives"""
+
+    def handler(request):
+        body = json.loads(request.content)
+        if not isinstance(body, list):
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": 1, "result": {"sid": "sid-1"}})
+        batches.append([item["params"] for item in body])
+        if fail:
+            return httpx.Response(200, json=[
+                {"jsonrpc": "2.0", "id": item["id"], "error": {"message": "boom"}} for item in body
+            ])
+        return httpx.Response(200, json=[
+            {"jsonrpc": "2.0", "id": item["id"], "result": 1} for item in body
+        ])
+
+    return handler
+
+
+# ============================================================================
+# Write-Behind Buffer Tests
+# ============================================================================
+
+class TestWriteBehindBuffer:
+    """Test buffering, coalescing and flushing of updates"""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_and_flushes_on_close(self, connect_async):
+        """Repeated updates of a row merge per column, last write wins"""
+        batches = []
+        client = await connect_async(update_handler(batches))
+
+        async with WriteBehindBuffer(client, flush_interval=60) as buffer:
+            for beat in range(100):
+                await buffer.update("terminal", 1, last_seen=beat)
+            await buffer.update("terminal", 1, {"ip": "10.0.0.1"})
+            await buffer.update("terminal", 2, last_seen=5)
+            assert batches == []
+
+        assert batches == [[
+            {"table": "terminal", "set": {"last_seen": 99, "ip": "10.0.0.1"},
+             "where": {"eq": ["id", 1]}},
+            {"table": "terminal", "set": {"last_seen": 5}, "where": {"eq": ["id", 2]}},
+        ]]
+
+    @pytest.mark.asyncio
+    async def test_size_and_time_triggers(self, connect_async):
+        """Reaching flush_size or flush_interval sends pending rows"""
+        batches = []
+        client = await connect_async(update_handler(batches))
+
+        async with WriteBehindBuffer(client, flush_size=3, flush_interval=0.05) as buffer:
+            for key in range(3):
+                await buffer.update("terminal", key, online=True)
+            await asyncio.sleep(0.01)
+            assert [len(batch) for batch in batches] == [3]
+
+            await buffer.update("terminal", 9, online=False)
+            await asyncio.sleep(0.1)
+            assert [len(batch) for batch in batches] == [3, 1]
+
+    @pytest.mark.asyncio
+    async def test_backpressure_bounds_pending_rows(self, connect_async):
+        """New rows wait for a flush once max_pending rows are queued"""
+        batches = []
+        client = await connect_async(update_handler(batches))
+
+        async with WriteBehindBuffer(
+            client, flush_size=2, flush_interval=60, max_pending=2
+        ) as buffer:
+            for key in range(10):
+                await buffer.update("terminal", key, online=True)
+                assert buffer.pending <= 2
+
+        assert sum(len(batch) for batch in batches) == 10
+
+    @pytest.mark.asyncio
+    async def test_failures_are_raised_later(self, connect_async):
+        """A failed flush surfaces from the next call"""
+        client = await connect_async(update_handler([], fail=True))
+        buffer = WriteBehindBuffer(client)
+
+        await buffer.update("terminal", 1, online=True)
+        with pytest.raises(APIError):
+            await buffer.flush()
+        await buffer.flush()
+
+    @pytest.mark.asyncio
+    async def test_empty_update_is_rejected(self, connect_async):
+        """An update without values fails at once instead of in the flusher"""
+        batches = []
+        client = await connect_async(update_handler(batches))
+
+        async with WriteBehindBuffer(client, flush_interval=60) as buffer:
+            await buffer.update("terminal", 1, last_seen=1)
+            with pytest.raises(ValidationError):
+                await buffer.update("terminal", 2)
+
+        assert batches == [[
+            {"table": "terminal", "set": {"last_seen": 1}, "where": {"eq": ["id", 1]}},
+        ]]
+
+    @pytest.mark.asyncio
+    async def test_dead_flusher_is_surfaced_and_restarted(self, connect_async):
+        """Backpressure does not wait forever on a flusher that died"""
+        batches = []
+        client = await connect_async(update_handler(batches))
+        buffer = WriteBehindBuffer(client, flush_size=1, flush_interval=60, max_pending=1)
+
+        async def crash():
+            raise RuntimeError("flusher died")
+
+        buffer._flusher = asyncio.ensure_future(crash())
+        await asyncio.sleep(0)
+        buffer._pending[("terminal", 1)] = {"online": True}
+
+        with pytest.raises(RuntimeError, match="flusher died"):
+            await buffer.update("terminal", 2, online=True)
+        await buffer.update("terminal", 2, online=True)
+        await buffer.close()
+
+        assert sum(len(batch) for batch in batches) == 2